@@ -0,0 +1,57 @@
+"""
+Compare the native HTML-to-text extraction used by ScrapeWebsite with the
+previous crewai ScrapeWebsiteTool parsing (whole-page get_text) on the saved
+HTML fixtures. Network time is not measured: the old path also downloaded
+every page a second time, which this benchmark leaves out.
+
+Usage: python benchmarks/bench_extraction.py [iterations]
+"""
+import glob
+import os
+import re
+import sys
+import time
+from bs4 import BeautifulSoup
+from my_journalistic_crew.utils.html_extractor import extract_main_text
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def legacy_extract(content: bytes) -> str:
+    """The parsing crewai_tools.ScrapeWebsiteTool ran on every page."""
+    parsed = BeautifulSoup(content, "html.parser")
+    text = parsed.get_text(" ")
+    text = re.sub("[ \t]+", " ", text)
+    text = re.sub("\\s+\n\\s+", "\n", text)
+    return text
+
+
+def bench(extract, pages, iterations):
+    """Return (pages per second, total output characters) for one extraction function."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        outputs = [extract(content) for content in pages.values()]
+    elapsed = time.perf_counter() - start
+    return (len(pages) * iterations) / elapsed, sum(len(text) for text in outputs)
+
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+pages = {}
+for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+    with open(path, "rb") as f:
+        pages[os.path.basename(path)] = f.read()
+
+print(f"\nEXTRACTION BENCHMARK ({len(pages)} fixtures, {iterations} iterations)")
+print("-" * 80)
+for name, content in pages.items():
+    legacy_chars = len(legacy_extract(content))
+    native_chars = len(extract_main_text(content))
+    print(f"{name:40} html={len(content):6}B legacy={legacy_chars:6} chars native={native_chars:6} chars")
+print("-" * 80)
+
+legacy_rate, legacy_total = bench(legacy_extract, pages, iterations)
+native_rate, native_total = bench(extract_main_text, pages, iterations)
+print(f"Legacy get_text:   {legacy_rate:8.1f} pages/s, {legacy_total} chars (~{legacy_total // 4} tokens)")
+print(f"Native extraction: {native_rate:8.1f} pages/s, {native_total} chars (~{native_total // 4} tokens)")
+print(f"Output reduction:  {100 * (1 - native_total / legacy_total):.1f}%")
+print("-" * 80)
@@ -0,0 +1,108 @@
+"""
+Compare the vision payload ImageAnalysisTool used to send (a 600x600 centre-cropped JPEG
+at quality 70) with the adaptive encoder, which keeps the aspect ratio and searches size,
+quality and format for the best image within a base64 byte budget. Reports the base64 bytes
+sent per image, the bytes saved and the encoder's cost.
+
+Images come from a directory when one is given; otherwise a synthetic set (photo-like noise,
+flat graphics, a screenshot-like page and a panorama) is generated.
+
+Usage: python benchmarks/bench_payload_encoder.py [image_dir] [budget ...]
+"""
+import base64
+import os
+import random
+import sys
+import time
+from io import BytesIO
+from PIL import Image, ImageDraw, ImageFilter
+from my_journalistic_crew.utils.payload_encoder import VISION_PAYLOAD_BUDGET, encode_payload
+from my_journalistic_crew.utils.renditions import ANALYSIS, _contain, _cover, load_for_size
+
+
+def synthetic_images():
+    """A few images with very different compressibility"""
+    rng = random.Random(0)
+    photo = Image.effect_noise((1600, 1200), 60).convert("RGB").filter(ImageFilter.GaussianBlur(1))
+    photo = Image.blend(photo, Image.linear_gradient("L").resize((1600, 1200)).convert("RGB"), 0.5)
+
+    graphic = Image.new("RGB", (1200, 800), (240, 240, 240))
+    draw = ImageDraw.Draw(graphic)
+    for _ in range(12):
+        x, y = rng.randrange(1000), rng.randrange(600)
+        draw.rectangle((x, y, x + rng.randrange(50, 200), y + rng.randrange(50, 200)),
+                       fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+
+    page = Image.new("RGB", (1080, 1920), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    for line in range(80):
+        draw.text((40, 20 + line * 23), " ".join("lorem ipsum dolor sit amet" for _ in range(3)), fill=(20, 20, 20))
+
+    panorama = Image.effect_noise((3000, 700), 40).convert("RGB").filter(ImageFilter.GaussianBlur(2))
+
+    images = {}
+    for name, img in (("photo", photo), ("graphic", graphic), ("page", page), ("panorama", panorama)):
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=92)
+        images[f"{name}.jpg"] = buffer.getvalue()
+    return images
+
+
+def load_images(directory):
+    images = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            content = f.read()
+        try:
+            Image.open(BytesIO(content)).verify()
+        except Exception:
+            continue
+        images[name] = content
+    return images
+
+
+def legacy_payload(content):
+    """What ImageAnalysisTool sent before: 600x600 cover crop, JPEG quality 70"""
+    img = _cover(load_for_size(content, (600, 600)).convert("RGB"), (600, 600))
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=70)
+    return buffer.getvalue()
+
+
+def analysis_master(content):
+    """The ANALYSIS rendition the encoder starts from"""
+    img = _contain(load_for_size(content, ANALYSIS.size).convert("RGB"), ANALYSIS.size)
+    buffer = BytesIO()
+    img.save(buffer, format=ANALYSIS.format, quality=ANALYSIS.quality)
+    return buffer.getvalue()
+
+
+def b64_len(data):
+    return len(base64.b64encode(data))
+
+
+args = sys.argv[1:]
+directory = args.pop(0) if args and os.path.isdir(args[0]) else None
+budgets = [int(arg) for arg in args] or [VISION_PAYLOAD_BUDGET]
+images = load_images(directory) if directory else synthetic_images()
+
+for budget in budgets:
+    print(f"\nBudget {budget} base64 bytes")
+    print(f"{'image':<24} {'legacy':>8} {'adaptive':>9} {'saved':>7}  {'format':<5} {'size':>9} {'q':>3} {'encodes':>7} {'ms':>6}")
+    legacy_total = adaptive_total = 0
+    for name, content in images.items():
+        legacy = b64_len(legacy_payload(content))
+        master = analysis_master(content)
+        start = time.perf_counter()
+        payload, data = encode_payload(master, budget)
+        elapsed = (time.perf_counter() - start) * 1000
+        adaptive = b64_len(data)
+        legacy_total += legacy
+        adaptive_total += adaptive
+        size = f"{payload.width}x{payload.height}{'*' if payload.letterboxed else ''}"
+        print(f"{name[:24]:<24} {legacy:>8} {adaptive:>9} {legacy - adaptive:>7}  {payload.format:<5} {size:>9} "
+              f"{payload.quality:>3} {payload.encodes:>7} {elapsed:>6.0f}")
+    saved = legacy_total - adaptive_total
+    print(f"{'total':<24} {legacy_total:>8} {adaptive_total:>9} {saved:>7}  "
+          f"({100 * saved / legacy_total:.0f}% saved, {saved // len(images)} bytes per image)")
+print("\n* letterboxed")
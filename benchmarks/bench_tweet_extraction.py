@@ -0,0 +1,77 @@
+"""
+Count WebDriver round-trips per tweet for the previous per-field extraction
+(find_elements + extract_tweet_data on every tweet element) and for the
+single execute_script extraction used by TwitterSearchTool, on a saved
+search timeline. Every WebDriver command is one HTTP round-trip to
+chromedriver, so the count is what dominates extraction time on a real page.
+
+Requires Chrome and a chromedriver (see utils/driver_resolver.py).
+
+Usage: python benchmarks/bench_tweet_extraction.py [iterations]
+"""
+import os
+import sys
+import time
+from selenium.webdriver.common.by import By
+from my_journalistic_crew.utils.webdriver import WebDriverClient
+from my_journalistic_crew.utils.tweet_extractor import extract_tweet_data, extract_visible_tweets
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "x", "search_timeline.html")
+
+
+def legacy_extract(driver):
+    """The per-element path TwitterSearchTool ran on every scroll."""
+    tweets = []
+    for tweet_element in driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]'):
+        tweet_id = tweet_element.get_attribute("data-tweet-id")
+        if not tweet_id:
+            for link in tweet_element.find_elements(By.CSS_SELECTOR, 'a[href*="/status/"]'):
+                href = link.get_attribute('href')
+                if href and '/status/' in href:
+                    tweet_id = href.split('/status/')[-1].split('?')[0]
+                    break
+        tweets.append(extract_tweet_data(tweet_element, tweet_id, driver))
+    return tweets
+
+
+def bench(driver, extract, iterations):
+    """Return (WebDriver commands, seconds, tweets) for one extraction pass, averaged over iterations."""
+    commands = []
+    original_execute = driver.execute
+
+    def counting_execute(command, params=None):
+        commands.append(command)
+        return original_execute(command, params)
+
+    driver.execute = counting_execute
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            tweets = extract(driver)
+        elapsed = time.perf_counter() - start
+    finally:
+        driver.execute = original_execute
+    return len(commands) / iterations, elapsed / iterations, tweets
+
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+client = WebDriverClient(headless=True, debugging_port=0)
+try:
+    driver = client.get_driver()
+    driver.get(f"file://{os.path.abspath(FIXTURE)}")
+
+    legacy_commands, legacy_seconds, legacy_tweets = bench(driver, legacy_extract, iterations)
+    single_commands, single_seconds, single_tweets = bench(driver, extract_visible_tweets, iterations)
+
+    print(f"\nTWEET EXTRACTION BENCHMARK ({len(single_tweets)} tweets, {iterations} iterations)")
+    print("-" * 80)
+    print(f"Per-field extraction: {legacy_commands:6.0f} round-trips "
+          f"({legacy_commands / max(len(legacy_tweets), 1):5.1f}/tweet) {legacy_seconds * 1000:8.1f} ms")
+    print(f"Single execute_script: {single_commands:5.0f} round-trips "
+          f"({single_commands / max(len(single_tweets), 1):5.1f}/tweet) {single_seconds * 1000:8.1f} ms")
+    print("-" * 80)
+    for old, new in zip(legacy_tweets, single_tweets):
+        print(f"{new.structure.id:22} likes legacy={old.metrics.likes:8} single={new.metrics.likes:8}")
+    print("-" * 80)
+finally:
+    client.close()
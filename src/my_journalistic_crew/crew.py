@@ -1,4 +1,4 @@
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
 from crewai import Agent, Crew, Process, Task, LLM
 import os
 from dotenv import load_dotenv
@@ -10,6 +10,10 @@ from src.my_journalistic_crew.tools.download_image import DownloadImageTool
 from src.my_journalistic_crew.tools.download_thumbnail import DownloadThumbnailTool
 from my_journalistic_crew.tools.blob_storage_tool import BlobStorageTool
 from my_journalistic_crew.tools.push_article_DB import Neo4jArticleTool
+from my_journalistic_crew.tools.twitter_batch_search_tool import TwitterBatchSearchTool
+from my_journalistic_crew.tools.serper_batch_search_tool import SerperBatchSearchTool
+from my_journalistic_crew.tools.google_news_rss.aggregate_feeds import AggregateGoogleNewsTool
+from my_journalistic_crew.utils.url_index import reset_url_index
 from src.my_journalistic_crew.models.outputs import DraftArticle, FinalArticle, CombinedBatchSearchResults, CombinedScrapingResults, ImageProcessingResults
 
 load_dotenv()
@@ -20,6 +24,12 @@ class MyJournalisticCrew():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    @before_kickoff
+    def start_run(self, inputs):
+        """Scrape every page afresh in each run"""
+        reset_url_index()
+        return inputs
+
     @agent
     def researcher(self) -> Agent:
         return Agent(
@@ -37,7 +47,7 @@ class MyJournalisticCrew():
             code_execution_mode="safe",
             respect_context_window=True,
             use_system_prompt=True,
-            tools=[SerperDevTool(),TwitterSearchTool()],
+            tools=[SerperDevTool(),SerperBatchSearchTool(),AggregateGoogleNewsTool(),TwitterSearchTool(),TwitterBatchSearchTool()],
             knowledge_sources=None,
             embedder=None,
             system_template=None,
@@ -78,7 +88,7 @@ class MyJournalisticCrew():
             config=self.tasks_config['research_task'],
             output_pydantic=DraftArticle,
             output_file="z_output/11_research_task.json",
-            tools=[SerperDevTool(), TwitterSearchTool()]
+            tools=[SerperDevTool(), SerperBatchSearchTool(), TwitterSearchTool(), TwitterBatchSearchTool()]
         )
     
     @task
@@ -170,6 +170,18 @@ class GoogleImageResults(BaseModel):
     searchParameters: SearchParameters = Field(..., description="Parameters used for the search query")
     images: List[ImageItem] = Field(default_factory=list, description="List of images found in the search results")
 
+class BatchSerperSearchResults(BaseModel):
+    """Model representing the results of a batch of mixed Serper searches, grouped by result type."""
+    class FailedQuery(BaseModel):
+        query: str = Field(..., description="The search query that failed")
+        search_type: str = Field(..., description="The type of search")
+        error: str = Field(..., description="Why the search failed")
+
+    web_results: BatchSerperWebSearchResults = Field(..., description="Web (and other non-news, non-image) search results, one for each such query")
+    news_results: BatchSerperGoogleNewsResults = Field(..., description="News search results, one for each news query")
+    image_results: List[GoogleImageResults] = Field(default_factory=list, description="Image search results, one for each image query")
+    failed: List[FailedQuery] = Field(default_factory=list, description="Queries that could not be searched")
+
 class DownloadedImage(BaseModel):
     """Model representing a single downloaded and processed image."""
     local_path: str = Field(..., description="The local path where the image was saved")
@@ -1,8 +1,7 @@
 from crewai.tools import BaseTool
 from typing import Type, List
 from pydantic import BaseModel, Field
-import os
-import vercel_blob
+from my_journalistic_crew.utils.blob_uploader import get_blob_uploader
 
 # Load environment variables
 try:
@@ -26,54 +25,17 @@ class BlobStorageTool(BaseTool):
     )
     args_schema: Type[BaseModel] = BlobStorageToolInput
 
-    def _run(self, file_paths: List[str]) -> List[str]:
+    def _run(self, file_paths: List[str]) -> str:
         """
-        Upload multiple files from local disk to Vercel Blob using vercel_blob library
+        Upload multiple files from local disk to Vercel Blob concurrently
         
         Args:
-            file_paths: List of paths to the local files
+            file_paths: List of paths to the local files, relative to BLOB_UPLOAD_ROOT
             
         Returns:
-            List of URLs of the uploaded files or error messages if upload failed
+            JSON string of BlobStorageResults with each file's URL or the reason its upload failed
         """
-        results = []
-        for file_path in file_paths:
-            # Construct the full path
-            full_path = os.path.join("E:\\journalist", file_path)
-            
-            # Verify the file exists
-            if not os.path.exists(full_path):
-                results.append(f"Error: File {full_path} does not exist")
-                continue
-            
-            try:
-                # Get the token from environment
-                blob_token = os.environ.get("VERCEL_BLOB_TOKEN", "")
-                if not blob_token:
-                    results.append("Error: VERCEL_BLOB_TOKEN environment variable is not set")
-                    continue
-                
-                # Set the token for vercel_blob library
-                os.environ["BLOB_READ_WRITE_TOKEN"] = blob_token
-                
-                # Get the filename
-                filename = os.path.basename(full_path)
-                
-                # Read the file content
-                with open(full_path, 'rb') as f:
-                    file_content = f.read()
-                
-                # Upload to Vercel Blob
-                response = vercel_blob.put(filename, file_content)
-                
-                # Extract and return the URL
-                blob_url = response.get("url")
-                if blob_url:
-                    results.append(f"File uploaded successfully to: {blob_url}")
-                else:
-                    results.append("Error: Upload succeeded but no URL was returned")
-                
-            except Exception as e:
-                results.append(f"Error during upload: {str(e)}")
-        
-        return results 
\ No newline at end of file
+        uploader = get_blob_uploader()
+        results = uploader.upload_files(file_paths)
+        print(f"Blob upload stats: {uploader.stats}")
+        return results.model_dump_json()
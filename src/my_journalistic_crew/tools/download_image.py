@@ -1,9 +1,8 @@
 from crewai.tools import BaseTool
 from typing import Type, List
 from pydantic import BaseModel, Field
-import requests
-from PIL import Image
-from io import BytesIO
+from my_journalistic_crew.utils.image_pipeline import export_rendition, get_image_pipeline
+from my_journalistic_crew.utils.renditions import ARTICLE
 import os
 
 
@@ -19,43 +18,31 @@ class DownloadImageTool(BaseTool):
     args_schema: Type[BaseModel] = DownloadImageInput
 
     def _run(self, urls: List[str]) -> List[str]:
+        # Download concurrently and render in worker processes, keeping the input order
+        new_size = ARTICLE.size
+        images = get_image_pipeline().render(urls, [ARTICLE])
+
         results = []
-        for url in urls:
-            try:
-                # Download the image from URL
-                response = requests.get(url, stream=True)
-                response.raise_for_status()
-                
-                # Open the image with PIL
-                img = Image.open(BytesIO(response.content))
-                
-                # Resize the image to 800x600
-                new_size = (800, 600)
-                resized_img = img.resize(new_size, Image.LANCZOS)
-                
-                # Generate filename from URL
-                filename = url.split('/')[-1].split('?')[0]  # Handle query params
-                base_name = os.path.splitext(filename)[0]
-                
-                # Create output directory if it doesn't exist
-                os.makedirs('downloads', exist_ok=True)
-                
-                # Save the resized image in WebP format
-                output_path = os.path.join('downloads', f"{base_name}.webp")
-                resized_img.save(output_path, format="WebP", quality=90)
-                
+        for image in images:
+            url = image.url
+            if ARTICLE.name in image.renditions:
+                output_path = export_rendition(image.renditions[ARTICLE.name], self._output_path(url, image.digest))
                 results.append(f"Image downloaded and resized to {new_size[0]}x{new_size[1]}. Saved to {output_path} in WebP format")
-                
-            except requests.HTTPError as e:
-                if e.response.status_code == 403:
-                    results.append(f"Skipped URL due to 403 Forbidden error: {url}")
-                elif e.response.status_code == 404:
-                    results.append(f"Image not found at URL: {url}")
-                elif e.response.status_code == 500:
-                    results.append(f"Server error (500) encountered for URL: {url}")
-                else:
-                    results.append(f"Failed to download image from {url}: {str(e)}")
-            except Exception as e:
-                results.append(f"Error processing image from {url}: {str(e)}")
+            elif image.status_code == 403:
+                results.append(f"Skipped URL due to 403 Forbidden error: {url}")
+            elif image.status_code == 404:
+                results.append(f"Image not found at URL: {url}")
+            elif image.status_code == 500:
+                results.append(f"Server error (500) encountered for URL: {url}")
+            elif image.status_code and image.status_code >= 400:
+                results.append(f"Failed to download image from {url}: {image.error}")
+            else:
+                results.append(f"Error processing image from {url}: {image.error}")
         
         return results
+
+    def _output_path(self, url: str, digest: str) -> str:
+        # Generate filename from URL; the content digest keeps different images with the same basename apart
+        filename = url.split('/')[-1].split('?')[0]  # Handle query params
+        base_name = os.path.splitext(filename)[0]
+        return os.path.join('downloads', f"{base_name}-{digest[:8]}.webp")
@@ -1,9 +1,8 @@
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-import requests
-from PIL import Image
-from io import BytesIO
+from my_journalistic_crew.utils.image_pipeline import export_rendition, get_image_pipeline
+from my_journalistic_crew.utils.renditions import THUMBNAIL
 import os
 
 class DownloadThumbnailInput(BaseModel):
@@ -18,35 +17,21 @@ class DownloadThumbnailTool(BaseTool):
     args_schema: Type[BaseModel] = DownloadThumbnailInput
 
     def _run(self, url: str) -> str:
-        try:
-            # Download the image from URL
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Open the image with PIL
-            img = Image.open(BytesIO(response.content))
-            
-            # Resize the image to 300x168
-            new_size = (300, 168)
-            resized_img = img.resize(new_size, Image.LANCZOS)
-            
-            # Generate filename from URL
+        # The thumbnail is usually already rendered from the decode DownloadImageTool did
+        new_size = THUMBNAIL.size
+        image = get_image_pipeline().render([url], [THUMBNAIL])[0]
+        if THUMBNAIL.name in image.renditions:
+            # Generate filename from URL; the content digest keeps different images with the same basename apart
             filename = url.split('/')[-1].split('?')[0]  # Handle query params
             base_name = os.path.splitext(filename)[0]
             
-            # Create output directory if it doesn't exist
-            os.makedirs('downloads', exist_ok=True)
-            
             # Save the resized image in WebP format with 'thumbnail_' prefix
-            output_path = os.path.join('downloads', f"thumbnail_{base_name}.webp")
-            resized_img.save(output_path, format="WebP", quality=90)
+            output_path = export_rendition(image.renditions[THUMBNAIL.name],
+                                           os.path.join('downloads', f"thumbnail_{base_name}-{image.digest[:8]}.webp"))
             
             return f"Thumbnail downloaded and resized to {new_size[0]}x{new_size[1]}. Saved to {output_path} in WebP format"
-            
-        except requests.HTTPError as e:
-            if e.response.status_code == 403:
-                return f"Skipped URL due to 403 Forbidden error: {url}"
-            else:
-                return f"Failed to download thumbnail from {url}: {str(e)}"
-        except Exception as e:
-            return f"Error processing thumbnail from {url}: {str(e)}" 
\ No newline at end of file
+        if image.status_code == 403:
+            return f"Skipped URL due to 403 Forbidden error: {url}"
+        elif image.status_code and image.status_code >= 400:
+            return f"Failed to download thumbnail from {url}: {image.error}"
+        return f"Error processing thumbnail from {url}: {image.error}"
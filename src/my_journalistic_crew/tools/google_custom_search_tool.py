@@ -1,6 +1,7 @@
 from crewai.tools import BaseTool
 from typing import Type, List, Dict, Optional
 from pydantic import BaseModel, Field
+from my_journalistic_crew.utils.search_cache import get_search_cache, search_cache_key
 import requests
 from enum import Enum
 
@@ -33,16 +34,28 @@ class GoogleCustomSearchTool(BaseTool):
         }
         if search_type == SearchType.IMAGE:
             params["searchType"] = search_type.value
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            results = response.json()
-            formatted_results = []
-            for item in results.get('items', []):
-                formatted_results.append({
-                    'title': item.get('title', 'N/A'),
-                    'link': item.get('link', 'N/A'),
-                    'snippet': item.get('snippet', 'N/A')
-                })
-            return formatted_results
+        errors = []
+
+        def fetch():
+            response = requests.get(url, params=params)
+            if response.status_code == 200:
+                results = response.json()
+                formatted_results = []
+                for item in results.get('items', []):
+                    formatted_results.append({
+                        'title': item.get('title', 'N/A'),
+                        'link': item.get('link', 'N/A'),
+                        'snippet': item.get('snippet', 'N/A')
+                    })
+                return formatted_results
+            errors.append({'error': f"Error: {response.status_code} - {response.text}"})
+            return None
+
+        cache = get_search_cache()
+        if cache is None:
+            results = fetch()
         else:
-            return [{'error': f"Error: {response.status_code} - {response.text}"}] 
\ No newline at end of file
+            # Every Custom Search query is billed, so repeats are served from the shared search cache
+            key = search_cache_key("google_cse", query, {"cx": cx, "num": num, "searchType": params.get("searchType", "")})
+            results = cache.get_or_fetch(key, "images" if search_type == SearchType.IMAGE else "search", fetch)
+        return results if results is not None else errors 
\ No newline at end of file
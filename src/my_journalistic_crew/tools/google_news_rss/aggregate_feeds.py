@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from crewai.tools import BaseTool
+from typing import List, Type
+from pydantic import BaseModel, Field
+from my_journalistic_crew.utils.news_feeds import NewsFeed, get_news_aggregator, valid_when
+from my_journalistic_crew.utils.news_links import get_news_link_resolver
+
+class AggregateGoogleNewsInput(BaseModel):
+    """Input schema for tool."""
+    topic_ids: List[str] = Field(default_factory=list, description="Topic IDs, or section names such as 'BUSINESS' or 'TECHNOLOGY', to fetch headlines for.")
+    queries: List[str] = Field(default_factory=list, description="Search queries; the same special terms as SearchGoogleNewsByQuery are supported.")
+    countries: List[str] = Field(default_factory=lambda: ["KE"], description="Country codes to fetch every topic and query for (e.g., ['KE', 'US']).")
+    language: str = Field(default="en", description="The language code for the news articles (e.g., 'en' for English).")
+    when: str = Field(default=None, description="Only keep articles published within this time frame (e.g., '2h', '3d', '1m', '2w').")
+    limit: int = Field(default=100, description="Maximum number of articles to return, newest first.")
+    resolve_links: bool = Field(default=True, description="Replace news.google.com redirect links with the publishers' own URLs. Defaults to True.")
+
+class AggregateGoogleNewsTool(BaseTool):
+    name: str = "AggregateGoogleNews"
+    description: str = "A tool to poll many Google News RSS feeds at once - several topic IDs and queries across several countries - and get back one list of articles, newest first, with duplicates across feeds removed. Use it instead of calling SearchGoogleNewsByTopic or SearchGoogleNewsByQuery repeatedly."
+    args_schema: Type[BaseModel] = AggregateGoogleNewsInput
+
+    def _run(self, topic_ids: List[str] = None, queries: List[str] = None, countries: List[str] = None,
+             language: str = "en", when: str = None, limit: int = 100, resolve_links: bool = True) -> dict:
+        # A time frame that cannot be parsed is ignored, as SearchGoogleNewsByQuery does
+        when = valid_when(when)
+        feeds = [
+            NewsFeed(kind=kind, value=value, language=language, country=country, when=when if kind == "query" else None)
+            for country in (countries or ["KE"])
+            for kind, values in (("topic", topic_ids or []), ("query", queries or []))
+            for value in values
+        ]
+        entries, errors = get_news_aggregator().collect(feeds, when=when, limit=limit)
+
+        now = datetime.now(timezone.utc)
+        articles = []
+        for entry in entries:
+            article = entry.formatted(now)
+            article["source"] = entry.source
+            article["feeds"] = entry.feeds
+            articles.append(article)
+        if resolve_links:
+            articles = get_news_link_resolver().resolve_articles(articles)
+        return {"articles": articles, "failed_feeds": errors}
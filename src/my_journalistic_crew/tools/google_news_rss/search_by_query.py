@@ -1,52 +1,29 @@
-from datetime import datetime
-from dateutil import parser
+from datetime import datetime, timezone
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-from pygooglenews import GoogleNews
+from my_journalistic_crew.utils.news_feeds import NewsFeed, get_news_aggregator, valid_when
+from my_journalistic_crew.utils.news_links import get_news_link_resolver
 
 class SearchGoogleNewsByQueryInput(BaseModel):
     """Input schema for tool."""
     query: str = Field(..., description="The search query to find relevant news articles. Supports special query terms like Boolean OR (e.g., 'boeing OR airbus'), Exclude Query Term (e.g., 'boeing -airbus'), Include Query Term (e.g., 'boeing +airbus'), Phrase Search (e.g., '\"New York metro opening\"'), allintext, intitle, allintitle, inurl, allinurl.")
     when: str = Field(None, description="Time range for the published datetime. Valid formats include:\n""- 'h' for hours (e.g., '12h' for articles published in the last 12 hours, works up to 101h).\n""- 'd' for days (e.g., '7d' for articles published in the last 7 days).\n""- 'm' for months (e.g., '6m' for articles published in the last 6 months, works up to 48m).\n""Note: Incorrect inputs will not result in an error; the 'when' parameter will be ignored by Google.")
     helper: bool = Field(True, description="Whether to use URL-escaping for the query. Defaults to True.")
+    resolve_links: bool = Field(default=True, description="Replace news.google.com redirect links with the publishers' own URLs. Defaults to True.")
 
 class SearchGoogleNewsByQueryTool(BaseTool):
     name: str = "SearchGoogleNewsByQuery"
     description: str = "A tool to search for news articles using the Google News RSS feed based on a query. Supports special query terms like Boolean OR, Exclude Query Term, Include Query Term, Phrase Search, allintext, intitle, allintitle, inurl, allinurl. Useful for finding time sensitive and broad-based news search results from Google News RSS feed. Should NOT be entangled WITH SerperDevTool News Search API."
     args_schema: Type[BaseModel] = SearchGoogleNewsByQueryInput
 
-    def _run(self, query: str, when: str = None, helper: bool = True) -> list:
-        gn = GoogleNews()
-        search_results = gn.search(query, when=when, helper=helper)
-        articles = search_results['entries']
-        
-        # Format the results as a list of dictionaries, converting published to "ago" format
-        formatted_results = []
-        for article in articles:
-            published_date = parser.parse(article['published'])
-            time_difference = datetime.now(published_date.tzinfo) - published_date
-            ago_format = self._format_time_difference(time_difference)
-            
-            formatted_results.append({
-                "title": article['title'],
-                "link": article['link'],
-                "published": ago_format
-            })
-        
-        return formatted_results
+    def _run(self, query: str, when: str = None, helper: bool = True, resolve_links: bool = True) -> list:
+        feed = NewsFeed(kind="query", value=query, when=when, helper=helper)
+        entries, errors = get_news_aggregator().collect([feed], when=valid_when(when))
+        if errors:
+            raise RuntimeError(errors[feed.label])
 
-    def _format_time_difference(self, time_difference):
-        """Convert a timedelta to a human-readable 'ago' format."""
-        seconds = int(time_difference.total_seconds())
-        if seconds < 60:
-            return f"{seconds} seconds ago"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-        elif seconds < 86400:
-            hours = seconds // 3600
-            return f"{hours} hour{'s' if hours > 1 else ''} ago"
-        else:
-            days = seconds // 86400
-            return f"{days} day{'s' if days > 1 else ''} ago"
\ No newline at end of file
+        # Format the results as a list of dictionaries, converting published to "ago" format
+        now = datetime.now(timezone.utc)
+        results = [entry.formatted(now) for entry in entries]
+        return get_news_link_resolver().resolve_articles(results) if resolve_links else results
@@ -2,8 +2,8 @@ from crewai.tools import BaseTool
 from typing import Type, List, Optional
 from pydantic import BaseModel, Field
 from my_journalistic_crew.models.outputs import FinalArticle
-from neo4j import GraphDatabase
-from openai import OpenAI
+from my_journalistic_crew.utils.embeddings import get_embedding_service
+from my_journalistic_crew.utils.neo4j_client import article_row, get_article_store
 import os
 from dotenv import load_dotenv
 
@@ -25,81 +25,30 @@ class Neo4jArticleTool(BaseTool):
         """
         Use NVIDIA Llama model to create embedding for article content.
         """
-        client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url="https://integrate.api.nvidia.com/v1"
-        )
-
-        response = client.embeddings.create(
-            input=[content],
-            model="nvidia/llama-3.2-nv-embedqa-1b-v2",
-            encoding_format="float",
-            extra_body={"input_type": "query", "truncate": "NONE"}
-        )
+        return get_embedding_service().embed([content], input_type="query")[0]
 
-        return response.data[0].embedding
-
-    def _run(self, article: FinalArticle) -> str:
-        """Store a single article in Neo4j database with all its properties."""
-        # Neo4j connection details (should be moved to environment variables)
-        uri = os.getenv("NEO4J_URI", "neo4j+s://f3a8bf56.databases.neo4j.io")
-        username = os.getenv("NEO4J_USER", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "h316Qd4uC5CsfdLSDj7dsVsMmC9HbwFwgsnWjPtFacA")
+    def store_articles(self, articles: List[FinalArticle]) -> List[dict]:
+        """
+        Store many articles at once, e.g. for a backfill or re-publish.
 
-        # Cypher query
-        query = """
-        // Merge the article node with properties (using slug as unique identifier)
-        MERGE (art:Article {slug: $slug})
-        ON CREATE SET
-            art.title = $title,
-            art.content = $content,
-            art.category = $category,
-            art.subcategory = $subcategory,
-            art.story = $story,
-            art.breaking_news = $breaking_news,
-            art.trending = $trending,
-            art.author = $author,
-            art.summary = $summary,
-            art.keywords = $keywords,
-            art.thumbnailUrl = $thumbnailUrl,
-            art.entities = $entities,
-            art.publisher = $publisher,
-            art.embedding = $embedding,
-            art.publishedAt = datetime({timezone: '+03:00'})
+        Content, title, summary and overlapping content chunks are embedded in shared batches, with
+        unchanged text served from the embedding cache, and articles are upserted by slug in batched
+        transactions over the shared pooled driver, each with its linked Chunk nodes.
 
-        RETURN art.title, art.slug, art.publishedAt
+        Returns:
+            list: title, slug, publishedAt and number of chunks of every stored article
         """
+        embeddings = get_embedding_service().embed_articles(articles)
+        return get_article_store().upsert_articles(
+            [article_row(article, article_embeddings) for article, article_embeddings in zip(articles, embeddings)]
+        )
 
-        # Connect to Neo4j and execute query
-        with GraphDatabase.driver(uri, auth=(username, password)) as driver:
-            with driver.session() as session:
-                # Generate embedding for the article content using Llama model
-                embedding = self.create_embedding(article.content)
-
-                # Execute the query
-                result = session.run(query, {
-                    "title": article.title,
-                    "slug": article.slug,
-                    "content": article.content,
-                    "category": article.category,
-                    "subcategory": article.subcategory,
-                    "story": article.story,
-                    "breaking_news": article.breaking_news,
-                    "trending": article.trending,
-                    "author": article.author,
-                    "summary": article.summary,
-                    "keywords": article.keywords,
-                    "thumbnailUrl": article.thumbnailUrl,
-                    "entities": article.entities,
-                    "publisher": article.publisher,
-                    "embedding": embedding
-                })
-                
-                # Log the created node
-                created_node = [record for record in result]
-                print(f"Successfully stored article with title: '{created_node[0]['art.title']}', slug: '{created_node[0]['art.slug']}', published at: {created_node[0]['art.publishedAt']}")
+    def _run(self, article: FinalArticle) -> str:
+        """Store a single article in Neo4j database with all its properties."""
+        stored = self.store_articles([article])
+        print(f"Successfully stored article with title: '{stored[0]['title']}', slug: '{stored[0]['slug']}', published at: {stored[0]['publishedAt']}")
 
-        return f"Successfully stored article in Neo4j with slug: '{article.slug}' at {created_node[0]['art.publishedAt']}"
+        return f"Successfully stored article in Neo4j with slug: '{article.slug}' at {stored[0]['publishedAt']}"
 
     def _arun(self, title: str, slug: str, content: str, category: str, subcategory: str, 
             story: str = "", breaking_news: bool = False, trending: bool = False, 
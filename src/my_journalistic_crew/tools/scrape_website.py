@@ -1,11 +1,19 @@
 from crewai.tools import BaseTool
-from typing import Type, List, Dict, Any
+from typing import Type, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
-from crewai_tools import ScrapeWebsiteTool
-import gzip
-import zlib
+from my_journalistic_crew.utils.content_sniffer import sniff_binary
+from my_journalistic_crew.utils.fetcher import SNIFF_BYTES, FetchResult, get_fetcher
+from my_journalistic_crew.utils.html_extractor import decode_body, extract_main_text
+from my_journalistic_crew.utils.render_pool import get_render_pool
+from my_journalistic_crew.utils.url_index import find_canonical_url, get_url_index
+import os
 import requests
 
+SCRAPE_RENDER_JS = os.getenv('SCRAPE_RENDER_JS', 'true').lower() not in ('0', 'false', 'no')
+
+# Static pages with less text than this are candidates for browser rendering
+MIN_STATIC_TEXT = 500
+
 class ScrapeWebsiteInput(BaseModel):
     """Input schema for URLScraper tool."""
     website_urls: List[str] = Field(..., description="List of URLs of the websites to scrape content from.")
@@ -19,89 +27,134 @@ class ScrapeWebsite(BaseTool):
 
     def _run(self, website_urls: List[str]) -> List[Dict[str, Any]]:
         """Scrape content from the specified website URLs."""
+        # Step 1: Collapse tracking, AMP and mobile variants of the same page, and pages already scraped this run
+        index = get_url_index()
+        planned = index.plan(website_urls)
+        to_fetch = [position for position, (_, _, first) in enumerate(planned) if first is None]
+        repeats = {position: index.content(key) for position, (_, key, first) in enumerate(planned)
+                   if first is not None and index.content(key) is not None}
+
+        # Step 2: Download every remaining website once, concurrently, over pooled connections
+        print(f"Loading {len(to_fetch)} websites ({len(website_urls) - len(to_fetch)} duplicates skipped)")
+        fetcher = get_fetcher()
+        fetched = fetcher.fetch_all([planned[position][0] for position in to_fetch], accept=self._accept)
+        if fetcher.cache:
+            print(f"HTTP cache stats: {fetcher.cache.stats()}")
+
+        # Step 3: Scrape each downloaded body, keeping the input order
         results = []
-        loaded_websites = []
-        
-        # Step 1: Load all websites first
-        for website_url in website_urls:
-            try:
-                print(f"Checking URL: {website_url}")
-                # Initial request
-                response = requests.get(website_url, timeout=10)
-                response.raise_for_status()
-                
-                if self._is_binary(response.content):
-                    results.append({"url": website_url, "content": f"Skipped binary content at URL: {website_url}"})
-                    continue
-                
-                print(f"Loading website from URL: {website_url}")
-                loaded_websites.append((website_url, response.content))
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    results.append({"url": website_url, "content": f"403 error (forbidden) encountered for URL: {website_url}"})
-                elif e.response.status_code == 404:
-                    results.append({"url": website_url, "content": f"Website not found at URL: {website_url}"})
-                elif e.response.status_code == 500:
-                    results.append({"url": website_url, "content": f"Server error (500) encountered for URL: {website_url}"})
-                else:
-                    results.append({"url": website_url, "content": f"Failed to load website from {website_url}: {str(e)}"})
-            except Exception as e:
-                results.append({"url": website_url, "content": f"Error loading website from {website_url}: {str(e)}"})
-        
-        # Step 2: Scrape all successfully loaded websites
-        for website_url, website_content in loaded_websites:
-            try:
-                # Standard static scraping
-                scraper = ScrapeWebsiteTool(website_url=website_url)
-                static_content = scraper.run()
-                
-                # Check if content is binary or compressed
-                if isinstance(static_content, bytes):
-                    try:
-                        if static_content.startswith(b'\x1f\x8b'):  # gzip magic number
-                            static_content = gzip.decompress(static_content).decode('utf-8')
-                        elif static_content.startswith(b'\x78\x9c'):  # zlib magic number
-                            static_content = zlib.decompress(static_content).decode('utf-8')
-                        else:
-                            results.append({"url": website_url, "content": f"Binary content detected (e.g., images). Unable to process: {website_url}"})
-                            continue
-                    except Exception as e:
-                        results.append({"url": website_url, "content": f"Error decompressing content from {website_url}: {e}"})
-                        continue
-                
-                # Check if content appears to be JavaScript-rendered
-                if self._needs_js(static_content):
-                    results.append({
-                        "url": website_url,
-                        "content": f"This page requires JavaScript rendering: {website_url}"
-                    })
-                else:
-                    results.append({
-                        "url": website_url,
-                        "content": static_content
-                    })
-            
-            except Exception as e:
-                results.append({
-                    "url": website_url, 
-                    "content": f"Error scraping content from {website_url}: {e}"
-                })
-        
-        return results        
-    def _is_binary(self, content: bytes) -> bool:
-        """Detect if content is binary."""
-        # Common binary patterns
-        binary_patterns = [
-            b'\x00',  # Null byte
-            b'\xff',  # Non-ASCII byte
-            b'\x89PNG',  # PNG image
-            b'\xff\xd8\xff',  # JPEG image
-            b'GIF',  # GIF image
-            b'%PDF',  # PDF document
-        ]
-        
-        # If any of these patterns are found, assume content is binary
-        return any(pattern in content for pattern in binary_patterns)
+        extracted = []
+        js_pages = []
+        for page in fetched:
+            content, has_text, needs_js = self._scrape(page)
+            results.append({"url": page.url, "content": content})
+            extracted.append(has_text)
+            if needs_js:
+                js_pages.append(len(results) - 1)
+
+        # Step 4: Render the JavaScript-heavy pages in warm headless browsers, all at once
+        if js_pages and SCRAPE_RENDER_JS:
+            print(f"Rendering {len(js_pages)} JavaScript pages")
+            rendered = get_render_pool().render_all([results[result_index]["url"] for result_index in js_pages])
+            for result_index, page in zip(js_pages, rendered):
+                content = self._scrape_rendered(page)
+                if content:
+                    results[result_index]["content"] = content
+                    extracted[result_index] = True
+
+        # Step 5: Index the pages text came out of; pages whose rel=canonical names a page already scraped are dropped.
+        # Errors, skips and unrendered placeholders stay out of the index, so a later call tries them again.
+        scraped = dict(zip(to_fetch, zip(fetched, results)))
+        for (position, (page, result)), has_text in zip(list(scraped.items()), extracted):
+            if page.ok and has_text:
+                duplicate_of = index.record(planned[position][1], page.url, result["content"], self._canonical_url(page))
+                if duplicate_of:
+                    scraped[position] = (page, self._duplicate(page.url, duplicate_of))
+
+        output = []
+        for position, (url, (_, _, first)) in enumerate(zip(website_urls, planned)):
+            if position in scraped:
+                # Fetched under its canonical URL, reported under the one the caller passed
+                output.append({**scraped[position][1], "url": url})
+            elif position in repeats:
+                # Scraped by an earlier call in this run: no download, no extraction
+                output.append({"url": url, "content": repeats[position], "duplicate_of": first})
+            else:
+                output.append(self._duplicate(url, first))
+        print(f"URL index stats: {index.stats}")
+        return output
+
+    def _duplicate(self, url: str, duplicate_of: str) -> Dict[str, Any]:
+        """Result for a URL whose document is returned once, under another URL in the same call."""
+        return {"url": url, "content": f"Duplicate of {duplicate_of}; its content is returned once, under that URL.",
+                "duplicate_of": duplicate_of}
+
+    def _canonical_url(self, page: FetchResult) -> Optional[str]:
+        """The rel=canonical URL declared in the page's head, read from the body already downloaded."""
+        try:
+            return find_canonical_url(decode_body(page.content), page.url)
+        except Exception:
+            return None
+
+    def _scrape_rendered(self, page: FetchResult) -> Optional[str]:
+        """Extract text from a browser-rendered page; None keeps the static result."""
+        if page.error:
+            print(f"Error rendering {page.url}: {page.error}")
+            return None
+        text = extract_main_text(page.content, "utf-8")
+        return text if len(text) >= MIN_STATIC_TEXT else None
+
+    def _scrape(self, page: FetchResult) -> Tuple[str, bool, bool]:
+        """Turn a single download into scraped text or an error message, whether text came out, and whether it needs rendering."""
+        website_url = page.url
+        if page.error:
+            if page.status_code == 403:
+                return f"403 error (forbidden) encountered for URL: {website_url}", False, False
+            elif page.status_code == 404:
+                return f"Website not found at URL: {website_url}", False, False
+            elif page.status_code == 500:
+                return f"Server error (500) encountered for URL: {website_url}", False, False
+            elif page.status_code:
+                return f"Failed to load website from {website_url}: {page.error}", False, False
+            return f"Error loading website from {website_url}: {page.error}", False, False
+        if page.skipped:
+            return f"Skipped {page.skipped} at URL: {website_url}", False, False
+
+        try:
+            # Inflate bodies that arrive gzip/zlib compressed without a Content-Encoding header
+            content = decode_body(page.content)
+        except Exception as e:
+            return f"Error decompressing content from {website_url}: {e}", False, False
+
+        if self._is_binary(content, page.headers.get("content-type", "")):
+            return f"Skipped binary content at URL: {website_url}", False, False
+
+        try:
+            static_content = extract_main_text(content, self._charset(page.headers))
+        except Exception as e:
+            return f"Error scraping content from {website_url}: {e}", False, False
+
+        # Check if content appears to be JavaScript-rendered: framework markers and hardly any static text
+        if len(static_content) < MIN_STATIC_TEXT and self._needs_js(content.decode("utf-8", errors="ignore")):
+            return f"This page requires JavaScript rendering: {website_url}", False, True
+        return static_content, True, False
+
+    def _charset(self, headers: Dict[str, str]) -> Optional[str]:
+        """Get the charset declared in the Content-Type header, if any."""
+        charset = requests.utils.get_encoding_from_headers(headers)
+        # requests reports ISO-8859-1 for any text/* without a charset; let the parser sniff instead
+        if charset and "charset" not in headers.get("content-type", "").lower():
+            return None
+        return charset
+
+    def _accept(self, content_type: str, head: bytes) -> Optional[str]:
+        """Stop the download early when the Content-Type or leading bytes show a binary file."""
+        kind = sniff_binary(content_type, head)
+        return f"binary content ({kind})" if kind else None
+
+    def _is_binary(self, content: bytes, content_type: str = "") -> bool:
+        """Detect if (decompressed) content is binary from its leading bytes."""
+        return sniff_binary(content_type, content[:SNIFF_BYTES]) is not None
         
     def _needs_js(self, content: str) -> bool:
         """Detect if content appears to be JavaScript-rendered."""
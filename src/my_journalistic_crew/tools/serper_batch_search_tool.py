@@ -0,0 +1,50 @@
+from crewai.tools import BaseTool
+from typing import List, Type
+from pydantic import BaseModel, Field
+from my_journalistic_crew.models.outputs import (
+    BatchSerperGoogleNewsResults, BatchSerperSearchResults, BatchSerperWebSearchResults,
+    GoogleImageResults, SerperGoogleNewsResults
+)
+from my_journalistic_crew.utils.serper_client import SerperQuery, get_serper_client
+import time
+
+
+class SerperBatchSearchToolInput(BaseModel):
+    """Input schema for Serper Batch Search Tool."""
+    queries: List[SerperQuery] = Field(
+        ...,
+        description="The searches to run, each with its own query, search_type (search, news, images, ...) and options, e.g. [{'query': 'Trump tariffs'}, {'query': 'Trump tariffs', 'search_type': 'news', 'tbs': 'qdr:d'}, {'query': 'Trump tariffs', 'search_type': 'images'}]"
+    )
+
+
+class SerperBatchSearchTool(BaseTool):
+    name: str = "Serper Batch Search Tool"
+    description: str = (
+        "Runs many Serper searches at once: web, news, image and any other search types, in one call. Use this instead of calling the Serper Dev Tool repeatedly when researching a topic from several angles; all queries are answered in about the time of a single search. Results are grouped into web_results, news_results and image_results, each carrying the query it answers in searchParameters, and any query that failed is listed with its error."
+    )
+    args_schema: Type[BaseModel] = SerperBatchSearchToolInput
+
+    def _run(self, queries: List[SerperQuery]) -> str:
+        queries = [query if isinstance(query, SerperQuery) else SerperQuery(**query) for query in queries]
+        client = get_serper_client()
+        start = time.time()
+        results = client.search_many(queries)
+        print(f"Ran {len(queries)} Serper searches in {time.time() - start:.1f}s: {client.stats}")
+
+        web, news, images, failed = [], [], [], []
+        for query, (result, error) in zip(queries, results):
+            if error:
+                failed.append(BatchSerperSearchResults.FailedQuery(query=query.query, search_type=query.search_type, error=error))
+            elif isinstance(result, GoogleImageResults):
+                images.append(result)
+            elif isinstance(result, SerperGoogleNewsResults):
+                news.append(result)
+            else:
+                web.append(result)
+
+        return BatchSerperSearchResults(
+            web_results=BatchSerperWebSearchResults(results=web),
+            news_results=BatchSerperGoogleNewsResults(results=news),
+            image_results=images,
+            failed=failed,
+        ).model_dump_json()
@@ -1,10 +1,8 @@
 from crewai.tools import BaseTool
 from typing import Type, Literal, Union
 from pydantic import BaseModel, Field
-import os
-import requests
-import json
 from my_journalistic_crew.models.outputs import SerperWebSearchResults, GoogleImageResults, SerperGoogleNewsResults
+from my_journalistic_crew.utils.serper_client import SerperQuery, get_serper_client
 
 class SerperDevToolInput(BaseModel):
     """Input schema for SerperDevTool."""
@@ -27,33 +25,7 @@ class SerperDevTool(BaseTool):
     args_schema: Type[BaseModel] = SerperDevToolInput
 
     def _run(self, query: str, country: str = "", location: str = "", language: str = "en", date_range: str = "", autocorrect: bool = True, results_num: int = 10, page: int = 1, search_type: str = "search", tbs: str = "") -> Union[SerperWebSearchResults, GoogleImageResults, SerperGoogleNewsResults]:
-        api_key = os.getenv("SERPER_API_KEY")
-        if not api_key:
-            raise ValueError("Serper API key not found in environment variables.")
-
-        url = "https://google.serper.dev/search"
-        headers = {
-            "X-API-KEY": api_key,
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "q": query,
-            "gl": country,
-            "hl": language,
-            "num": results_num,
-            "page": page,
-            "type": search_type,
-            "location": location,
-            "tbs": tbs
-        }
-
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()
-        search_results = response.json()
-
-        if search_type == "images":
-            return GoogleImageResults(**search_results)
-        elif search_type == "news":
-            return SerperGoogleNewsResults(**search_results)
-        else:
-            return SerperWebSearchResults(**search_results)
+        query = SerperQuery(query=query, search_type=search_type, country=country, location=location,
+                            language=language, results_num=results_num, page=page, tbs=tbs)
+        # Shares the batch tool's pooled keep-alive session
+        return get_serper_client().search(query)
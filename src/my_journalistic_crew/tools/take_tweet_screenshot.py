@@ -1,9 +1,8 @@
 from crewai.tools import BaseTool
 from typing import Type, Dict, Any, Optional
 from pydantic import BaseModel, Field
-from my_journalistic_crew.utils.webdriver import WebDriverClient
 from my_journalistic_crew.utils.pagenav import PageNavigator
-import json
+from my_journalistic_crew.utils.session_pool import get_x_session_pool, load_x_cookies
 import os
 import time
 from datetime import datetime
@@ -285,29 +284,26 @@ class TweetScreenshotTool(BaseTool):
         Returns:
             str: Path to the saved screenshot or error message
         """
-        driver_client = None
+        # Load cookies (the pooled sessions log in with them)
+        try:
+            load_x_cookies()
+        except Exception as e:
+            return f"Error loading cookies: {str(e)}"
+        
+        pool = get_x_session_pool()
+        session = None
+        healthy = True
         
         try:
-            # Initialize webdriver with smaller width for better tweet capture
-            driver_client = WebDriverClient(headless=headless, device_type=device_type)
-            driver = driver_client.get_driver()
+            # Reuse a warm, already logged-in browser when one is available
+            session = pool.checkout((headless, device_type, False))
+            driver = session.driver
             
             # Set window size to emulate a narrower view (better for tweets)
             if device_type == "desktop":
                 driver.set_window_size(800, 900)
             
-            # Load cookies and navigate
-            try:
-                with open('auth.json') as f:
-                    cookies = json.load(f)['cookies']
-            except Exception as e:
-                return f"Error loading cookies: {str(e)}"
-            
-            # Configure browser and set up navigator
             navigator = PageNavigator(driver)
-            navigator.go_to_url("https://x.com")
-            driver_client.add_cookies(cookies, ".x.com")
-            navigator.refresh_page()
             
             # Navigate to the tweet - use direct status URL
             tweet_url = f"https://x.com/i/status/{tweet_id}"
@@ -374,12 +370,16 @@ class TweetScreenshotTool(BaseTool):
                 return f"Screenshot captured and saved to {filename}"
 
         except Exception as e:
+            healthy = False
             return f"Error capturing screenshot: {str(e)}"
         
         finally:
-            if driver_client:
-                try:
-                    driver_client.close()
-                except Exception as e:
-                    print(f"Error closing driver: {str(e)}")
-                    pass 
\ No newline at end of file
+            if session:
+                if healthy and device_type == "desktop":
+                    # Give the next user of this pooled browser its normal desktop viewport back
+                    try:
+                        driver.set_window_size(1920, 1080)
+                    except Exception as e:
+                        print(f"Error restoring window size: {str(e)}")
+                        healthy = False
+                pool.checkin(session, healthy) 
\ No newline at end of file
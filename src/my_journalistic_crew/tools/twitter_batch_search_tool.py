@@ -0,0 +1,203 @@
+from crewai.tools import BaseTool
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel, Field
+from concurrent.futures import ProcessPoolExecutor, wait
+from my_journalistic_crew.models.outputs import BatchTweetsModel, TweetsModel
+from my_journalistic_crew.utils.session_pool import X_AUTH_FILE, configure_x_sessions
+from my_journalistic_crew.tools.twitter_search_tool import TwitterSearchTool, X_CAPTURE_MODE
+import atexit
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+X_SEARCH_WORKERS = int(os.getenv('X_SEARCH_WORKERS', 4))
+# One cookies file per account; workers are assigned accounts round-robin
+X_AUTH_FILES = [path.strip() for path in os.getenv('X_AUTH_FILES', X_AUTH_FILE).split(',') if path.strip()]
+X_PROFILE_ROOT = os.getenv('X_PROFILE_ROOT', os.path.join('.cache', 'x-profiles'))
+
+# Extra time a worker gets beyond the trend budget for launching its browser and loading the page
+BUDGET_GRACE = 60
+
+
+class TwitterBatchSearchToolInput(BaseModel):
+    """Input schema for Twitter Batch Search Tool."""
+    trends: List[str] = Field(..., description="The trends, hashtags (starting with #) or search terms to scrape tweets for")
+    max_tweets: int = Field(
+        default=30,
+        description="Maximum number of tweets to collect per trend"
+    )
+    scroll_count: int = Field(
+        default=10,
+        description="Number of times to scroll down each trend's page"
+    )
+    time_budget: float = Field(
+        default=120,
+        description="Maximum seconds to spend collecting tweets for each trend"
+    )
+    device_type: str = Field(
+        default="tablet",
+        description="Device type to emulate (tablet or desktop)"
+    )
+
+
+def _init_worker(slots, auth_files: List[str], profile_root: str) -> None:
+    """Give a worker process its own x.com account and browser profile"""
+    # Leading its own process group lets a stuck worker be killed along with its chromedriver and browsers
+    if hasattr(os, "setsid"):
+        os.setsid()
+    slot = slots.get()
+    configure_x_sessions(
+        auth_file=auth_files[slot % len(auth_files)],
+        profile_dir=os.path.abspath(os.path.join(profile_root, f"worker-{slot}"))
+    )
+
+
+def _search_trend(trend: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one trend search inside a worker process, reusing the worker's warm browser.
+
+    The search runs on its own thread so the worker returns once the trend's budget and grace
+    have passed, even while the browser is stuck in a call the budget does not cover. The
+    abandoned thread keeps the worker's only browser, so the worker reports itself broken.
+    """
+    outcome = {}
+
+    def search():
+        try:
+            is_hashtag = trend.startswith('#')
+            outcome['result'] = json.loads(TwitterSearchTool()._run(trend=trend, is_hashtag=is_hashtag, **options))
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=search, name="trend-search", daemon=True)
+    thread.start()
+    thread.join(options['time_budget'] + BUDGET_GRACE)
+    if thread.is_alive():
+        return {"tweets": [], "trend": trend, "count": 0, "timed_out": True, "worker_broken": True}
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Process pool of search workers, kept alive between batches so browsers stay logged in"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers < workers:
+            if _executor is not None:
+                _terminate_executor(_executor)
+            # Spawned workers start clean instead of inheriting this process's threads and browsers
+            context = multiprocessing.get_context("spawn")
+            slots = context.Queue()
+            for slot in range(workers):
+                slots.put(slot)
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(slots, X_AUTH_FILES, X_PROFILE_ROOT))
+            _executor_workers = workers
+        return _executor
+
+
+def _terminate_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Shut a pool down and kill its workers with everything they launched.
+
+    shutdown() alone leaves a busy worker running, and its Chrome holding the worker's profile
+    directory, which the replacement pool's worker in the same slot needs.
+    """
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            # Not yet a group leader, or not POSIX: the worker alone can still be killed
+            process.kill()
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a pool whose workers are stuck or broken, so the next batch starts on fresh ones"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is executor:
+            _executor, _executor_workers = None, 0
+    _terminate_executor(executor)
+
+
+def _shutdown_executor() -> None:
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_executor)
+
+
+class TwitterBatchSearchTool(BaseTool):
+    name: str = "Twitter Batch Search Tool"
+    description: str = (
+        "Searches Twitter/X for several trends, hashtags or search terms at once, in parallel browsers, and returns the top tweets for each. Use this instead of calling the Twitter Search Tool repeatedly when a story has several angles, e.g ['Trump Tariffs', '#TradeWar', 'China retaliation']. Each tweet appears only once, under the first trend that found it. It extracts the tweet id, content, user, timestamp, engagement metrics and photo URLs."
+    )
+    args_schema: Type[BaseModel] = TwitterBatchSearchToolInput
+
+    def _run(self, trends: List[str], max_tweets: int = 30, scroll_count: int = 10, time_budget: float = 120,
+             device_type: str = "tablet") -> str:
+        # Search each distinct trend once, keeping the agent's order
+        trends = list(dict.fromkeys(trend.strip() for trend in trends if trend.strip()))
+        if not trends:
+            return BatchTweetsModel(results=[]).model_dump_json()
+
+        options = {
+            'headless': True,
+            'device_type': device_type,
+            'scroll_count': scroll_count,
+            'max_tweets': max_tweets,
+            'time_budget': time_budget,
+            'capture_mode': X_CAPTURE_MODE,
+        }
+        workers = max(1, min(X_SEARCH_WORKERS, len(trends)))
+        print(f"Searching {len(trends)} trends across {workers} browser workers")
+
+        start = time.time()
+        executor = _get_executor(workers)
+        futures = {trend: executor.submit(_search_trend, trend, options) for trend in trends}
+        # Every trend runs under its own budget; trends queued behind others get a full budget once they start.
+        # Workers give up on a trend by themselves, so one more grace period is left for them to report back.
+        rounds = -(-len(trends) // workers)
+        wait(futures.values(), timeout=rounds * (time_budget + BUDGET_GRACE) + BUDGET_GRACE)
+
+        # Queued trends are cancelled; a worker still running one is past even its own timeout
+        stuck = [future for future in futures.values() if not future.done() and not future.cancel()]
+        broken = [future for future in futures.values() if future.done() and not future.cancelled()
+                  and future.exception() is None and future.result().get('worker_broken')]
+        if stuck or broken:
+            print(f"{len(stuck) + len(broken)} browser workers did not finish in time; starting fresh ones for the next batch")
+            _discard_executor(executor)
+
+        results = []
+        seen_ids = set()
+        for trend, future in futures.items():
+            tweets = []
+            if not future.done() or future.cancelled():
+                print(f"Trend '{trend}' exceeded its time budget")
+            elif future.exception() is not None:
+                print(f"Error searching trend '{trend}': {str(future.exception())}")
+            elif future.result().get('timed_out'):
+                print(f"Trend '{trend}' exceeded its time budget")
+            else:
+                for tweet in future.result().get('tweets', []):
+                    # Global dedup: a tweet belongs to the first trend that found it
+                    if tweet['id'] in seen_ids:
+                        continue
+                    seen_ids.add(tweet['id'])
+                    tweets.append(TweetsModel.TweetItem(**tweet))
+            results.append(TweetsModel(trend=trend, count=len(tweets), tweets=tweets))
+
+        print(f"Batch search finished in {time.time() - start:.1f}s with {len(seen_ids)} unique tweets")
+        return BatchTweetsModel(results=results).model_dump_json()
@@ -1,10 +1,12 @@
 from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
-from my_journalistic_crew.utils.webdriver import WebDriverClient
 from my_journalistic_crew.utils.pagenav import PageNavigator
-from my_journalistic_crew.utils.scroller import scroll_to_load_tweets
-from my_journalistic_crew.utils.tweet_extractor import extract_tweet_data
+from my_journalistic_crew.utils.session_pool import get_x_session_pool, load_x_cookies
+from my_journalistic_crew.utils.scroller import scroll_to_load_tweets, summarize_scroll_stats
+from my_journalistic_crew.utils.tweet_extractor import extract_visible_tweets
+from my_journalistic_crew.utils.timeline_capture import TimelineCapture
+from my_journalistic_crew.utils.tweet_store import get_tweet_store
 from urllib.parse import quote
 import json
 import time
@@ -17,6 +19,8 @@ from datetime import datetime
 # Load environment variables
 load_dotenv()
 
+X_CAPTURE_MODE = os.getenv('X_CAPTURE_MODE', 'dom')
+
 class TwitterSearchToolInput(BaseModel):
     """Input schema for Twitter Search Tool."""
     trend: str = Field(..., description="The trend to navigate to and scrape tweets from")
@@ -38,12 +42,24 @@ class TwitterSearchToolInput(BaseModel):
     )
     scroll_delay: float = Field(
         default=5.0,
-        description="Delay in seconds between scrolls"
+        description="Maximum seconds to wait for new tweets after each scroll"
     )
     max_tweets: int = Field(
         default=50,
         description="Maximum number of tweets to collect"
     )
+    time_budget: float = Field(
+        default=300,
+        description="Maximum seconds to spend collecting tweets for this trend"
+    )
+    capture_mode: str = Field(
+        default=X_CAPTURE_MODE,
+        description="How tweets are read: 'network' parses X's search API responses (exact counts, more tweets per scroll), 'dom' reads the rendered page"
+    )
+    resume: bool = Field(
+        default=False,
+        description="Follow up an earlier search for the same trend: only return tweets posted since then, stopping once already-seen tweets are reached"
+    )
 
 def format_cookies_error(error):
     return json.dumps({
@@ -69,29 +85,45 @@ class TwitterSearchTool(BaseTool):
 
     def _run(self, trend: str, is_hashtag: bool = False, headless: bool = True, 
             device_type: str = "tablet", scroll_count: int = 20, 
-            scroll_delay: float = 5.0, max_tweets: int = 50) -> str:
+            scroll_delay: float = 5.0, max_tweets: int = 50, time_budget: float = 300,
+            capture_mode: str = X_CAPTURE_MODE, resume: bool = False) -> str:
+        search_start = time.time()
+        # Load cookies (the pooled sessions log in with them)
         try:
-            driver_client = None
-            
-            # Initialize webdriver
-            driver_client = WebDriverClient(headless=headless, device_type=device_type)
-            driver = driver_client.get_driver()
-            
-            # Load cookies and navigate (from TrendNavigatorTool)
-            try:
-                with open('auth.json') as f:
-                    cookies = json.load(f)['cookies']
-            except Exception as e:
-                return format_cookies_error(e)
-            
+            load_x_cookies()
+        except Exception as e:
+            return format_cookies_error(e)
+
+        pool = get_x_session_pool()
+        session = None
+        capture = None
+        healthy = True
+        try:
+            # Reuse a warm, already logged-in browser when one is available
+            capture_network = capture_mode == "network"
+            # A worker's only browser may still be held by a search it gave up on; wait no longer than the budget
+            session = pool.checkout((headless, device_type, capture_network), timeout=max(time_budget, 1))
+            driver = session.driver
             navigator = PageNavigator(driver)
-            navigator.go_to_url("https://x.com")
-            driver_client.add_cookies(cookies, ".x.com")
-            navigator.refresh_page()
+
+            # In network mode tweets come from the SearchTimeline responses recorded while scrolling
+            capture = TimelineCapture(driver) if capture_network and TimelineCapture.supported(driver) else None
+            if capture:
+                capture.start()
+
+            # Tweets collected for this trend by earlier runs; a resumed search stops when it reaches them
+            store = get_tweet_store()
+            known_ids = store.known_ids(trend) if store else set()
+            since_id = store.since_id(trend) if store and resume else None
+            reached_known = []
 
             # Prepare the search query
             query = f'%23{trend[1:]}' if is_hashtag else quote(trend)
             url = f"https://x.com/search?q={query}&src=trend_click&vertical=trends"
+            if since_id:
+                # The Latest tab lists newest first, so everything after the first known tweet is known too
+                url += "&f=live"
+                print(f"Resuming '{trend}' since tweet {since_id} ({len(known_ids)} known tweets)")
             
             # Navigate to the trend page
             navigator.go_to_url(url)
@@ -114,119 +146,65 @@ class TwitterSearchTool(BaseTool):
             
             tweets_collected = []
             processed_ids = set()
-            timeout = 300  # 5 minute timeout
+            # Whatever navigation left of the time budget goes to scrolling
+            timeout = max(time_budget - (time.time() - search_start), 0)
             
-            # Define a function to extrlact tweets that can be passed to scroll_to_load_tweets
-            def extract_tweets_func(tweet_elements, processed_ids):
+            # Define a function to extract tweets that can be passed to scroll_to_load_tweets.
+            # The DOM is read in one execute_script round-trip per call; network mode reads no DOM at all.
+            def extract_tweets_func(processed_ids):
                 new_tweets = []
                 new_processed_ids = set()
                 
-                print(f"Processing {len(tweet_elements)} tweet elements on page")
+                visible_tweets = capture.drain() if capture else extract_visible_tweets(driver)
+                print(f"Processing {len(visible_tweets)} tweets {'from captured responses' if capture else 'on page'}")
                 
-                for tweet_element in tweet_elements:
-                    try:
-                        # Get real tweet ID - try multiple methods
-                        tweet_id = None
-                        
-                        # Try data-tweet-id attribute first
-                        tweet_id = tweet_element.get_attribute("data-tweet-id")
-                        
-                        # Try link to tweet - this is more reliable than article element
-                        if not tweet_id:
-                            tweet_links = tweet_element.find_elements(By.CSS_SELECTOR, 'a[href*="/status/"]')
-                            for link in tweet_links:
-                                href = link.get_attribute('href')
-                                if href and '/status/' in href:
-                                    tweet_id = href.split('/status/')[-1].split('?')[0]
-                                    break
-                        
-                        # Try finding the tweet ID in the element's attributes
-                        if not tweet_id:
-                            for attr in tweet_element.get_property('attributes'):
-                                if attr['name'] == 'data-tweet-id' or 'tweet' in attr['name'].lower():
-                                    tweet_id = attr['value']
-                                    break
-                        
-                        # If we still don't have an ID, create one based on content
-                        if not tweet_id:
-                            try:
-                                # Try to get content from tweet text element
-                                content_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]')
-                                content = content_element.text[:50]  # First 50 chars
-                            except:
-                                content = tweet_element.text[:50]  # Fallback to full element text
-                            tweet_id = f"synthetic-id-{hash(content)}"
-                        
-                        # Skip if we've already processed this tweet
-                        if tweet_id in processed_ids:
-                            continue
-                        
-                        # Add to processed set
-                        new_processed_ids.add(tweet_id)
-                        processed_ids.add(tweet_id)  # Add to the main set immediately
-                        
-                        # Extract tweet data
-                        tweet = extract_tweet_data(tweet_element, tweet_id, driver)
-                        
-                        # Modify tweet collection to strictly enforce thresholds
-                        if (tweet.metrics.likes and tweet.metrics.likes >= MIN_LIKES) and \
-                           (tweet.metrics.retweets and tweet.metrics.retweets >= MIN_RETWEETS):
-                            new_tweets.append(tweet)
-                            new_processed_ids.add(tweet_id)
-                            processed_ids.add(tweet_id)
-                            print(f"Collected tweet: {tweet_id} with {tweet.metrics.likes} likes and {tweet.metrics.retweets} retweets")
-                        else:
-                            print(f"Skipping tweet: {tweet_id}")
-                            continue  # Skip this tweet
-                    except Exception as e:
-                        print(f"Error processing tweet element: {str(e)}")
+                # Record every tweet seen this scroll; known tweets only get their metrics refreshed
+                unseen = [tweet for tweet in visible_tweets if tweet.structure.id not in processed_ids]
+                if store and unseen:
+                    store.record(trend, unseen)
+                
+                for tweet in unseen:
+                    tweet_id = tweet.structure.id
+                    
+                    # Skip if we've already processed this tweet
+                    if tweet_id in processed_ids:
                         continue
+                    
+                    # Add to processed set
+                    new_processed_ids.add(tweet_id)
+                    processed_ids.add(tweet_id)  # Add to the main set immediately
+                    
+                    if since_id:
+                        if tweet_id.isdigit() and int(tweet_id) <= since_id:
+                            reached_known.append(tweet_id)
+                        if tweet_id in known_ids:
+                            continue
+                    
+                    # Modify tweet collection to strictly enforce thresholds
+                    if (tweet.metrics.likes and tweet.metrics.likes >= MIN_LIKES) and \
+                       (tweet.metrics.retweets and tweet.metrics.retweets >= MIN_RETWEETS):
+                        new_tweets.append(tweet)
+                        print(f"Collected tweet: {tweet_id} with {tweet.metrics.likes} likes and {tweet.metrics.retweets} retweets")
+                    else:
+                        print(f"Skipping tweet: {tweet_id}")
                 
                 print(f"Found {len(new_tweets)} new tweets meeting both criteria, total processed IDs: {len(processed_ids)}")
                 return new_tweets, new_processed_ids
             
-            # Use the enhanced scrolling utility to collect tweets while scrolling
+            # Scroll until enough tweets arrive; each scroll waits only as long as new tweets take to render
+            scroll_stats = []
+            scroll_start = time.time()
             scroll_success, tweets_collected = scroll_to_load_tweets(
                 driver, 
                 scroll_count, 
                 scroll_delay, 
                 extract_tweets_func=extract_tweets_func, 
                 max_tweets=max_tweets, 
-                timeout=timeout
+                timeout=timeout,
+                scroll_stats=scroll_stats,
+                stop_condition=(lambda: bool(reached_known)) if since_id else None
             )
-            
-            # If we haven't reached max_tweets yet, try scrolling more aggressively
-            if len(tweets_collected) < max_tweets:
-                print(f"Only collected {len(tweets_collected)} tweets. Trying additional scrolls...")
-                
-                # Try more scrolls with larger jumps
-                for _ in range(3):  # Try up to 3 more aggressive scrolls
-                    if len(tweets_collected) >= max_tweets:
-                        break
-                        
-                    # Scroll more aggressively
-                    driver.execute_script("window.scrollBy(0, 3000);")
-                    time.sleep(scroll_delay + 1)
-                    
-                    # Extract tweets after this aggressive scroll
-                    tweet_elements = driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
-                    new_tweets, new_processed_ids = extract_tweets_func(tweet_elements, processed_ids)
-                    tweets_collected.extend(new_tweets)
-                    processed_ids.update(new_processed_ids)
-                    
-                    if not new_tweets:  # If no new tweets found, try clicking "Show more"
-                        try:
-                            show_more = driver.find_elements(By.XPATH, "//span[contains(text(), 'Show more')]")
-                            if show_more:
-                                show_more[0].click()
-                                time.sleep(2)
-                                
-                                # Try to extract tweets after clicking "Show more"
-                                tweet_elements = driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
-                                new_tweets, new_processed_ids = extract_tweets_func(tweet_elements, processed_ids)
-                                tweets_collected.extend(new_tweets)
-                        except Exception as e:
-                            print(f"Error clicking 'Show more': {str(e)}")
+            print(f"Scrolling took {time.time() - scroll_start:.1f}s: {summarize_scroll_stats(scroll_stats)}")
             
             # Return as JSON string 
             return json.dumps({
@@ -248,6 +226,7 @@ class TwitterSearchTool(BaseTool):
             })
 
         except Exception as e:
+            healthy = False
             # Return an empty tweets list as flat JSON structure
             return json.dumps({
                 "tweets": [],
@@ -256,8 +235,8 @@ class TwitterSearchTool(BaseTool):
             })
         
         finally:
-            if driver_client:
-                try:
-                    driver_client.close()
-                except Exception as e:
-                    pass
\ No newline at end of file
+            if session:
+                pool.checkin(session, healthy)
+                print(f"Browser session pool stats: {pool.stats()}")
+            if capture:
+                print(f"Parsed {capture.tweets} tweets from {capture.responses} SearchTimeline responses")
\ No newline at end of file
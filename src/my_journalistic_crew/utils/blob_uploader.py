@@ -0,0 +1,257 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from my_journalistic_crew.models.outputs import BlobStorageResults, BlobStorageUpload
+from my_journalistic_crew.utils.image_registry import ImageRegistry, get_image_registry
+from my_journalistic_crew.utils.rate_limiter import backoff_delay
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+import requests
+
+BLOB_API_URL = os.getenv('VERCEL_BLOB_API_URL', 'https://blob.vercel-storage.com').rstrip('/')
+BLOB_API_VERSION = '7'
+# Relative file paths given to the upload tool are resolved against this directory
+BLOB_UPLOAD_ROOT = os.getenv('BLOB_UPLOAD_ROOT', '')
+BLOB_UPLOAD_WORKERS = int(os.getenv('BLOB_UPLOAD_WORKERS', 4))
+# Files at least this large are sent in parts; Vercel Blob requires parts of at least 5 MB
+BLOB_MULTIPART_THRESHOLD = int(os.getenv('BLOB_MULTIPART_THRESHOLD', 16 * 1024 * 1024))
+BLOB_PART_SIZE = max(int(os.getenv('BLOB_PART_SIZE', 8 * 1024 * 1024)), 5 * 1024 * 1024)
+BLOB_PART_WORKERS = int(os.getenv('BLOB_PART_WORKERS', 3))
+BLOB_UPLOAD_RETRIES = int(os.getenv('BLOB_UPLOAD_RETRIES', 4))
+BLOB_UPLOAD_TIMEOUT = float(os.getenv('BLOB_UPLOAD_TIMEOUT', 60))
+RETRY_BACKOFF = 0.5
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class BlobUploadError(Exception):
+    """Raised when the blob API rejects a request or keeps failing after every retry"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file, read in chunks so large files are never held in memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _error_message(response: requests.Response) -> str:
+    try:
+        error = response.json().get('error', {})
+        return f"{error.get('code', 'error')}: {error.get('message', response.reason)}"
+    except ValueError:
+        return f"{response.status_code} {response.reason}"
+
+
+class BlobUploader:
+    """
+    Uploads files to Vercel Blob over one pooled HTTP session.
+
+    Files upload concurrently on a bounded thread pool. Small files are streamed from disk in a
+    single request; files over BLOB_MULTIPART_THRESHOLD go up in parts, several at a time, and
+    the image registry remembers finished parts so an interrupted upload resumes where it stopped.
+    Requests that fail with a timeout, 429 or 5xx are retried with exponential backoff. Files
+    whose bytes were uploaded before are not sent again.
+    """
+
+    def __init__(self, token: Optional[str] = None, api_url: str = BLOB_API_URL, workers: int = BLOB_UPLOAD_WORKERS,
+                 multipart_threshold: int = BLOB_MULTIPART_THRESHOLD, part_size: int = BLOB_PART_SIZE,
+                 part_workers: int = BLOB_PART_WORKERS, retries: int = BLOB_UPLOAD_RETRIES,
+                 timeout: float = BLOB_UPLOAD_TIMEOUT, registry: Optional[ImageRegistry] = None):
+        self.token = token if token is not None else os.getenv('VERCEL_BLOB_TOKEN') or os.getenv('BLOB_READ_WRITE_TOKEN', '')
+        self.api_url = api_url.rstrip('/')
+        self.workers = workers
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.part_workers = part_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.registry = registry or get_image_registry()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(workers * part_workers, 1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'uploaded': 0, 'skipped': 0, 'failed': 0, 'parts': 0, 'resumed_parts': 0, 'retries': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _request(self, path: str, pathname: str, headers: Dict[str, str],
+                 body: Callable[[], Any] = lambda: None) -> Dict[str, Any]:
+        """
+        Call the blob API, retrying transient failures.
+
+        Args:
+            path: API path, '/' for single uploads and '/mpu' for multipart actions
+            pathname: Pathname of the blob in the store
+            headers: Extra request headers
+            body: Produces a fresh request body for each attempt, so streamed files can be re-read
+
+        Returns:
+            dict: The decoded JSON response
+        """
+        headers = {
+            'authorization': f"Bearer {self.token}",
+            'x-api-version': BLOB_API_VERSION,
+            **headers,
+        }
+        url = f"{self.api_url}{path}?pathname={quote(pathname)}"
+        method = 'PUT' if path == '/' else 'POST'
+        for attempt in range(self.retries + 1):
+            response = None
+            data = body()
+            try:
+                response = self.session.request(method, url, headers=headers, data=data, timeout=self.timeout)
+                if response.ok:
+                    return response.json()
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise BlobUploadError(_error_message(response), response.status_code)
+                error = BlobUploadError(_error_message(response), response.status_code)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = BlobUploadError(str(e))
+            finally:
+                if hasattr(data, 'close'):
+                    data.close()
+            if attempt < self.retries:
+                self._count('retries')
+                time.sleep(backoff_delay(attempt, response, RETRY_BACKOFF))
+        raise error
+
+    def _put(self, path: str, pathname: str, content_type: str) -> Dict[str, Any]:
+        """Stream a whole file in one request"""
+        return self._request('/', pathname, {'x-content-type': content_type, 'x-add-random-suffix': '1'},
+                             body=lambda: open(path, 'rb'))
+
+    def _read_part(self, path: str, offset: int) -> bytes:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return f.read(self.part_size)
+
+    def _multipart(self, path: str, pathname: str, content_type: str, digest: str) -> Dict[str, Any]:
+        """Upload a large file in parts, skipping parts a previous attempt already finished"""
+        pending = self.registry.pending_upload(digest)
+        if pending is None or pending['part_size'] != self.part_size:
+            created = self._request('/mpu', pathname, {
+                'x-mpu-action': 'create', 'x-content-type': content_type, 'x-add-random-suffix': '1'
+            })
+            self.registry.start_upload(digest, pathname, created['uploadId'], created['key'], self.part_size)
+            pending = self.registry.pending_upload(digest)
+        pathname = pending['pathname']
+        mpu_headers = {'x-mpu-upload-id': pending['upload_id'], 'x-mpu-key': quote(pending['upload_key'], safe='')}
+
+        size = os.path.getsize(path)
+        part_numbers = range(1, -(-size // self.part_size) + 1)
+        etags = dict(pending['parts'])
+        self._count('resumed_parts', len(etags))
+
+        def upload_part(part_number: int) -> None:
+            offset = (part_number - 1) * self.part_size
+            response = self._request('/mpu', pathname, {
+                **mpu_headers, 'x-mpu-action': 'upload', 'x-mpu-part-number': str(part_number)
+            }, body=lambda: self._read_part(path, offset))
+            etags[part_number] = response['etag']
+            self.registry.record_part(digest, part_number, response['etag'])
+            self._count('parts')
+
+        # Each part is read from disk only when its request starts, so memory stays at a few parts
+        missing = [number for number in part_numbers if number not in etags]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.part_workers, len(missing)), thread_name_prefix="blob-part") as executor:
+                list(executor.map(upload_part, missing))
+
+        parts = [{'partNumber': number, 'etag': etags[number]} for number in part_numbers]
+        try:
+            result = self._request('/mpu', pathname, {
+                **mpu_headers, 'x-mpu-action': 'complete', 'content-type': 'application/json',
+                'x-content-type': content_type, 'x-add-random-suffix': '1'
+            }, body=lambda: json.dumps(parts))
+        except BlobUploadError as e:
+            # The upload expired or was rejected as a whole; the next attempt starts a fresh one
+            if e.status_code and e.status_code < 500:
+                self.registry.finish_upload(digest)
+            raise
+        self.registry.finish_upload(digest)
+        return result
+
+    def upload_file(self, file_path: str) -> BlobStorageUpload:
+        """Upload one file, never raising; failures are reported on the result"""
+        full_path = os.path.join(BLOB_UPLOAD_ROOT, file_path)
+        if not os.path.exists(full_path):
+            self._count('failed')
+            return BlobStorageUpload(blob_url="", success=False, message=f"Error: File {full_path} does not exist")
+
+        if not self.token:
+            self._count('failed')
+            return BlobStorageUpload(blob_url="", success=False,
+                                     message="Error: VERCEL_BLOB_TOKEN environment variable is not set")
+
+        try:
+            # Identical bytes are uploaded only once, whatever the file is called
+            digest = file_digest(full_path)
+            blob_url = self.registry.blob_url(digest)
+            if blob_url:
+                self._count('skipped')
+                return BlobStorageUpload(blob_url=blob_url, success=True, message=f"File already uploaded to: {blob_url}")
+
+            pathname = os.path.basename(full_path)
+            content_type = mimetypes.guess_type(pathname)[0] or 'application/octet-stream'
+            if os.path.getsize(full_path) >= self.multipart_threshold:
+                response = self._multipart(full_path, pathname, content_type, digest)
+            else:
+                response = self._put(full_path, pathname, content_type)
+
+            blob_url = response.get("url")
+            if not blob_url:
+                self._count('failed')
+                return BlobStorageUpload(blob_url="", success=False, message="Error: Upload succeeded but no URL was returned")
+            self.registry.record_blob(digest, blob_url, response.get("pathname"))
+            self._count('uploaded')
+            return BlobStorageUpload(blob_url=blob_url, success=True, message=f"File uploaded successfully to: {blob_url}")
+        except Exception as e:
+            self._count('failed')
+            return BlobStorageUpload(blob_url="", success=False, message=f"Error during upload: {str(e)}")
+
+    def upload_files(self, file_paths: List[str]) -> BlobStorageResults:
+        """
+        Upload many files concurrently.
+
+        Args:
+            file_paths: Paths of the files, relative to BLOB_UPLOAD_ROOT unless absolute
+
+        Returns:
+            BlobStorageResults: One upload per path, in the same order as the input
+        """
+        uploads = []
+        if file_paths:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(file_paths)), thread_name_prefix="blob") as executor:
+                uploads = list(executor.map(self.upload_file, file_paths))
+        success_count = sum(1 for upload in uploads if upload.success)
+        return BlobStorageResults(uploads=uploads, success_count=success_count,
+                                  failure_count=len(uploads) - success_count)
+
+
+_blob_uploader: Optional[BlobUploader] = None
+_blob_uploader_lock = threading.Lock()
+
+
+def get_blob_uploader() -> BlobUploader:
+    """Get the process-wide blob uploader"""
+    global _blob_uploader
+    with _blob_uploader_lock:
+        if _blob_uploader is None:
+            _blob_uploader = BlobUploader()
+        return _blob_uploader
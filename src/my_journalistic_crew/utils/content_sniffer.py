@@ -0,0 +1,96 @@
+from typing import Optional
+
+# Leading bytes of common binary formats agents tend to pass as "websites"
+MAGIC_NUMBERS = [
+    (b'%PDF', "PDF document"),
+    (b'\x89PNG\r\n\x1a\n', "PNG image"),
+    (b'\xff\xd8\xff', "JPEG image"),
+    (b'GIF87a', "GIF image"),
+    (b'GIF89a', "GIF image"),
+    (b'RIFF', "RIFF media (WebP/WAV/AVI)"),
+    (b'PK\x03\x04', "ZIP archive (docx/xlsx/epub)"),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', "Office document"),
+    (b'\x1a\x45\xdf\xa3', "WebM/Matroska video"),
+    (b'OggS', "Ogg media"),
+    (b'ID3', "MP3 audio"),
+    (b'fLaC', "FLAC audio"),
+    (b'\x00\x00\x01\x00', "ICO image"),
+    (b'Rar!', "RAR archive"),
+    (b'7z\xbc\xaf\x27\x1c', "7z archive"),
+    (b'\x7fELF', "executable"),
+    (b'MZ', "executable"),
+]
+
+TEXT_CONTENT_TYPES = ("text/", "application/xhtml+xml", "application/xml", "application/json",
+                      "application/ld+json", "application/rss+xml", "application/atom+xml", "application/javascript",
+                      "application/x-javascript", "application/ecmascript", "application/x-www-form-urlencoded")
+# Structured-syntax suffixes (RFC 6839) mark text formats such as application/vnd.api+json
+TEXT_SUFFIXES = ("+json", "+xml")
+
+# Only specific subtypes: the x- and vnd. trees hold text formats too
+BINARY_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/", "application/pdf", "application/zip", "application/gzip",
+    "application/octet-stream", "application/msword", "application/wasm", "application/vnd.ms-",
+    "application/vnd.openxmlformats-officedocument.", "application/vnd.oasis.opendocument.", "application/vnd.rar",
+    "application/vnd.android.package-archive", "application/x-gzip", "application/x-tar", "application/x-bzip2",
+    "application/x-7z-compressed", "application/x-rar-compressed", "application/x-msdownload",
+    "application/x-executable", "application/x-shockwave-flash", "application/x-font-",
+)
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(';')[0].strip().lower()
+
+
+def _is_text_type(media_type: str) -> bool:
+    return media_type.startswith(TEXT_CONTENT_TYPES) or (
+        media_type.startswith("application/") and media_type.endswith(TEXT_SUFFIXES))
+
+
+def sniff_binary(content_type: str, head: bytes) -> Optional[str]:
+    """
+    Decide from the Content-Type header and the first bytes of a body whether it is binary.
+
+    Args:
+        content_type: Value of the Content-Type header (may be empty)
+        head: The first few KB of the (decoded) body
+
+    Returns:
+        str: A short description of the binary format, or None if the body looks like text
+    """
+    media_type = _media_type(content_type)
+    if not _is_text_type(media_type) and media_type.startswith(BINARY_CONTENT_TYPES):
+        return media_type
+
+    for magic, description in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return description
+    # MP4/MOV keep their signature at offset 4
+    if head[4:8] == b'ftyp':
+        return "MP4/QuickTime video"
+
+    # Text is allowed to arrive compressed; the caller inflates it
+    if head.startswith(b'\x1f\x8b') or head[:2] in (b'\x78\x9c', b'\x78\x01', b'\x78\xda'):
+        return None
+
+    # Mislabelled or unlabelled bodies: NUL bytes never occur in HTML/UTF-8 text
+    if b'\x00' in head:
+        return "binary data"
+    if not _is_text_type(media_type) and _looks_binary(head):
+        return "binary data"
+    return None
+
+
+def _looks_binary(head: bytes) -> bool:
+    """Heuristic for unlabelled bodies: text decodes as UTF-8 (or Latin-1) with few control characters"""
+    if not head:
+        return False
+    try:
+        head.decode('utf-8')
+        return False
+    except UnicodeDecodeError as e:
+        # A multi-byte sequence cut at the end of the sniffed window is still text
+        if e.start >= len(head) - 4:
+            return False
+    controls = sum(1 for byte in head if byte < 0x09 or 0x0e <= byte < 0x20)
+    return controls / len(head) > 0.1
@@ -0,0 +1,154 @@
+from typing import Dict, Optional
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+# A locally installed chromedriver; when set no version lookup or download ever happens
+CHROMEDRIVER_PATH = os.getenv('CHROMEDRIVER_PATH', '')
+CHROMEDRIVER_CACHE_FILE = os.getenv(
+    'CHROMEDRIVER_CACHE_FILE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'my_journalistic_crew', 'chromedriver.json')
+)
+
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+# How the last resolution in this process was satisfied and how long it took
+resolve_stats: Dict[str, object] = {}
+
+_resolved_path: Optional[str] = None
+_resolve_lock = threading.Lock()
+
+
+def _major_version(output: str) -> Optional[str]:
+    match = re.search(r"(\d+)\.\d+\.\d+", output or "")
+    return match.group(1) if match else None
+
+
+def _run_version(binary: str) -> Optional[str]:
+    """Run `<binary> --version` and return the major version, without touching the network"""
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return _major_version(output)
+
+
+def installed_chrome_major() -> Optional[str]:
+    """Major version of the locally installed Chrome, or None if it cannot be determined"""
+    for name in CHROME_BINARIES:
+        binary = shutil.which(name)
+        if binary:
+            return _run_version(binary)
+    return None
+
+
+def _is_executable(path: str) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _load_record() -> Optional[Dict[str, str]]:
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_record(path: str) -> None:
+    """Remember a resolved driver on disk for later processes on this host"""
+    record = {
+        "path": path,
+        "driver_major": _run_version(path),
+        "chrome_major": installed_chrome_major(),
+        "host": platform.node(),
+        "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{CHROMEDRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp_path, CHROMEDRIVER_CACHE_FILE)
+    except OSError as e:
+        print(f"Could not save chromedriver cache: {str(e)}")
+
+
+def _record_is_valid(record: Optional[Dict[str, str]]) -> bool:
+    """Cheap validation: the binary still exists on this host and matches the installed Chrome"""
+    if not record or record.get("host") != platform.node() or not _is_executable(record.get("path", "")):
+        return False
+    chrome_major = installed_chrome_major()
+    # If Chrome's version cannot be read we trust the record rather than going online
+    return chrome_major is None or record.get("driver_major") in (None, chrome_major)
+
+
+def resolve_chromedriver() -> str:
+    """
+    Find a chromedriver binary, doing the expensive lookup at most once per host.
+
+    Resolution order:
+        1. The path already resolved in this process
+        2. CHROMEDRIVER_PATH (zero network calls)
+        3. The on-disk record from an earlier run, if still valid
+        4. webdriver_manager (version lookup and possibly a download), then recorded on disk
+        5. A chromedriver on PATH, for offline workers where webdriver_manager fails
+
+    Returns:
+        str: Path to the chromedriver executable
+    """
+    global _resolved_path
+    with _resolve_lock:
+        if _resolved_path:
+            resolve_stats.update(source="process", seconds=0.0)
+            return _resolved_path
+
+        start = time.time()
+        path, source = None, None
+        if CHROMEDRIVER_PATH:
+            if not _is_executable(CHROMEDRIVER_PATH):
+                raise FileNotFoundError(f"CHROMEDRIVER_PATH is not an executable file: {CHROMEDRIVER_PATH}")
+            path, source = CHROMEDRIVER_PATH, "configured"
+
+        if path is None:
+            record = _load_record()
+            if _record_is_valid(record):
+                path, source = record["path"], "disk cache"
+
+        if path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path, source = ChromeDriverManager().install(), "webdriver_manager"
+                _save_record(path)
+            except Exception as e:
+                fallback = shutil.which("chromedriver")
+                if not fallback:
+                    raise
+                print(f"webdriver_manager failed ({str(e)}), using chromedriver from PATH")
+                path, source = fallback, "PATH"
+
+        _resolved_path = path
+        resolve_stats.update(source=source, seconds=round(time.time() - start, 3), path=path)
+        print(f"Resolved chromedriver from {source} in {resolve_stats['seconds']}s: {path}")
+        return path
+
+
+if __name__ == "__main__":
+    # Compare a cold resolution through webdriver_manager with the cached path
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    start = time.time()
+    ChromeDriverManager().install()
+    print(f"webdriver_manager install(): {time.time() - start:.3f}s")
+
+    start = time.time()
+    resolve_chromedriver()
+    print(f"resolve_chromedriver(), first call: {time.time() - start:.3f}s ({resolve_stats['source']})")
+
+    start = time.time()
+    resolve_chromedriver()
+    print(f"resolve_chromedriver(), same process: {time.time() - start:.6f}s")
@@ -0,0 +1,218 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from my_journalistic_crew.models.outputs import FinalArticle
+from my_journalistic_crew.utils.rate_limiter import RateLimiter
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'nvidia/llama-3.2-nv-embedqa-1b-v2')
+EMBEDDING_API_URL = os.getenv('EMBEDDING_API_URL', 'https://integrate.api.nvidia.com/v1')
+# Texts embedded per request, and requests in flight at once
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+EMBEDDING_CONCURRENCY = int(os.getenv('EMBEDDING_CONCURRENCY', 4))
+EMBEDDING_REQUESTS_PER_MINUTE = float(os.getenv('EMBEDDING_REQUESTS_PER_MINUTE', 40))
+EMBEDDING_RETRIES = int(os.getenv('EMBEDDING_RETRIES', 4))
+EMBEDDING_TIMEOUT = float(os.getenv('EMBEDDING_TIMEOUT', 60))
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', os.path.join('.cache', 'embeddings.sqlite3'))
+# Chunk length and the words shared by neighbouring chunks, so no passage is cut off from its context
+CHUNK_WORDS = int(os.getenv('CHUNK_WORDS', 250))
+CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', 50))
+
+
+def chunk_text(text: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Split text into chunks of `size` words, each starting `size - overlap` words after the last.
+
+    Line breaks and Markdown inside a chunk are kept as written.
+    """
+    words = re.findall(r'\S+\s*', text)
+    if not words:
+        return []
+    step = max(size - overlap, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append("".join(words[start:start + size]).strip())
+        if start + size >= len(words):
+            break
+    return chunks
+
+
+class ChunkEmbedding(BaseModel):
+    """Model for one overlapping passage of an article and its vector"""
+    index: int
+    text: str
+    embedding: List[float]
+
+
+class ArticleEmbeddings(BaseModel):
+    """Model for every vector stored with an article"""
+    embedding: List[float] = Field(..., description="Whole content, as stored on Article.embedding")
+    title_embedding: List[float]
+    summary_embedding: List[float]
+    chunks: List[ChunkEmbedding] = Field(default_factory=list)
+
+
+class EmbeddingCache:
+    """SQLite cache of vectors keyed by the hash of model, input type and text"""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def key(model: str, input_type: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{input_type}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = array('f', vector).tolist()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) VALUES (?, ?, ?, ?)",
+                [(key, model, array('f', vector).tobytes(), now) for key, vector in vectors.items()]
+            )
+
+
+def _default_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=EMBEDDING_API_URL,
+                  max_retries=EMBEDDING_RETRIES, timeout=EMBEDDING_TIMEOUT)
+
+
+class EmbeddingService:
+    """
+    Embeds texts over one shared client, in batches, skipping every text embedded before.
+
+    Texts are deduplicated and looked up in the cache first; the rest go out EMBEDDING_BATCH_SIZE
+    per request, up to EMBEDDING_CONCURRENCY requests at a time under a shared rate limiter. The
+    client retries 429 and 5xx answers with backoff.
+    """
+
+    def __init__(self, client=None, model: str = EMBEDDING_MODEL, batch_size: int = EMBEDDING_BATCH_SIZE,
+                 concurrency: int = EMBEDDING_CONCURRENCY, per_minute: float = EMBEDDING_REQUESTS_PER_MINUTE,
+                 cache: Optional[EmbeddingCache] = None):
+        self.client = client or _default_client()
+        self.model = model
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.cache = cache or EmbeddingCache()
+        self.limiter = RateLimiter(per_minute, burst=concurrency)
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'embedded': 0, 'cached': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _request(self, texts: List[str], input_type: str, truncate: str) -> List[List[float]]:
+        self.limiter.acquire()
+        self._count('requests')
+        response = self.client.embeddings.create(
+            input=texts,
+            model=self.model,
+            encoding_format="float",
+            extra_body={"input_type": input_type, "truncate": truncate}
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def embed(self, texts: List[str], input_type: str = "passage", truncate: str = "END") -> List[List[float]]:
+        """
+        Embed many texts, in input order.
+
+        Args:
+            texts: Texts to embed; repeats are embedded once
+            input_type: "passage" for stored documents, "query" for search queries
+            truncate: What the API does with texts over the model's token limit
+
+        Returns:
+            list: One vector per text
+        """
+        keys = [self.cache.key(self.model, input_type, text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys)))
+        missing = list({key: text for key, text in zip(keys, texts) if key not in vectors}.items())
+        self._count('cached', len(set(keys)) - len(missing))
+
+        batches = [missing[start:start + self.batch_size] for start in range(0, len(missing), self.batch_size)]
+
+        def embed_batch(batch):
+            embedded = dict(zip((key for key, _ in batch), self._request([text for _, text in batch], input_type, truncate)))
+            # Stored per batch, so work finished before a failure is not paid for again
+            self.cache.put_many(self.model, embedded)
+            self._count('embedded', len(embedded))
+            return embedded
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches)), thread_name_prefix="embed") as executor:
+                for embedded in executor.map(embed_batch, batches):
+                    vectors.update(embedded)
+        return [vectors[key] for key in keys]
+
+    def embed_articles(self, articles: List[FinalArticle]) -> List[ArticleEmbeddings]:
+        """
+        Embed the content, title, summary and overlapping content chunks of many articles at once.
+
+        The whole-content vector keeps the "query" input type it has always been stored with;
+        titles, summaries and chunks are embedded as passages for retrieval.
+        """
+        chunks = [chunk_text(article.content) for article in articles]
+        contents = self.embed([article.content for article in articles], input_type="query")
+        passages = self.embed(
+            [article.title for article in articles]
+            + [article.summary for article in articles]
+            + [chunk for article_chunks in chunks for chunk in article_chunks]
+        )
+
+        titles, summaries = passages[:len(articles)], passages[len(articles):2 * len(articles)]
+        chunk_vectors = iter(passages[2 * len(articles):])
+        return [
+            ArticleEmbeddings(
+                embedding=contents[index],
+                title_embedding=titles[index],
+                summary_embedding=summaries[index],
+                chunks=[ChunkEmbedding(index=number, text=text, embedding=next(chunk_vectors))
+                        for number, text in enumerate(chunks[index])],
+            )
+            for index in range(len(articles))
+        ]
+
+
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the process-wide embedding service"""
+    global _embedding_service
+    with _embedding_service_lock:
+        if _embedding_service is None:
+            _embedding_service = EmbeddingService()
+        return _embedding_service
@@ -0,0 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from my_journalistic_crew.utils.http_cache import HttpCache, get_http_cache
+import os
+import threading
+import time
+import requests
+
+MAX_CONCURRENT_FETCHES = int(os.getenv('MAX_CONCURRENT_FETCHES', 8))
+MAX_FETCHES_PER_HOST = int(os.getenv('MAX_FETCHES_PER_HOST', 2))
+FETCH_TIMEOUT = float(os.getenv('FETCH_TIMEOUT', 10))
+FETCH_MAX_BYTES = int(os.getenv('FETCH_MAX_BYTES', 5 * 1024 * 1024))
+SNIFF_BYTES = 4096
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class FetchResult(BaseModel):
+    """Model for the outcome of fetching a single URL"""
+    url: str
+    status_code: Optional[int] = None
+    headers: Dict[str, str] = Field(default_factory=dict, description="Response headers with lower-cased names")
+    content: bytes = b""
+    error: Optional[str] = None
+    skipped: Optional[str] = Field(default=None, description="Why the body was not downloaded, e.g. binary or oversized")
+    elapsed: float = 0.0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.skipped is None
+
+
+# Decides from (Content-Type, first bytes of the body) whether to keep downloading; returns a reason to skip
+AcceptFunc = Callable[[str, bytes], Optional[str]]
+
+
+class ConcurrentFetcher:
+    """HTTP fetcher with bounded global and per-host concurrency over pooled keep-alive connections"""
+
+    def __init__(self, max_workers: int = MAX_CONCURRENT_FETCHES, per_host: int = MAX_FETCHES_PER_HOST,
+                 timeout: float = FETCH_TIMEOUT, max_bytes: int = FETCH_MAX_BYTES,
+                 cache: Optional[HttpCache] = None):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.cache = cache
+
+        # One session for every request so TCP/TLS connections are kept alive and reused
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max(16, max_workers), pool_maxsize=max(per_host, 1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore bounding concurrent requests to the URL's host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch(self, url: str, accept: Optional[AcceptFunc] = None, max_bytes: Optional[int] = None) -> FetchResult:
+        """
+        Download a single URL, never raising; failures are reported on the result.
+
+        Args:
+            url: URL to download
+            accept: Optional check run on the Content-Type and first bytes before the rest is downloaded
+            max_bytes: Abort bodies larger than this (defaults to the fetcher's limit)
+
+        Returns:
+            FetchResult: The response, or the reason it failed or was skipped
+        """
+        start = time.time()
+        max_bytes = max_bytes or self.max_bytes
+        if self.cache:
+            result = self._fetch_cached(url, accept, max_bytes)
+        else:
+            result = self._fetch_network(url, {}, accept, max_bytes)
+        result.elapsed = time.time() - start
+        return result
+
+    def _fetch_cached(self, url: str, accept: Optional[AcceptFunc], max_bytes: int) -> FetchResult:
+        """Serve fresh responses from the cache and revalidate stale ones with a conditional request"""
+        entry = self.cache.lookup(url)
+        if entry and self.cache.is_fresh(entry):
+            body = self.cache.load_body(entry)
+            if body is not None:
+                self.cache.record('hits')
+                return self._cached_result(url, entry.status_code, entry.headers, body, accept)
+
+        result = self._fetch_network(url, self.cache.conditional_headers(entry) if entry else {}, accept, max_bytes)
+        if entry and result.status_code == 304:
+            body = self.cache.load_body(entry)
+            if body is not None:
+                self.cache.record('revalidated')
+                entry = self.cache.refresh(entry, result.headers)
+                return self._cached_result(url, entry.status_code, entry.headers, body, accept)
+            # The blob vanished underneath the index, so fetch the full body again
+            result = self._fetch_network(url, {}, accept, max_bytes)
+
+        self.cache.record('misses')
+        if result.ok:
+            self.cache.store(url, result.status_code, result.headers, result.content)
+        return result
+
+    def _cached_result(self, url: str, status_code: int, headers: Dict[str, str], body: bytes,
+                       accept: Optional[AcceptFunc]) -> FetchResult:
+        skipped = accept(headers.get('content-type', ''), body[:SNIFF_BYTES]) if accept else None
+        return FetchResult(url=url, status_code=status_code, headers=headers, content=b"" if skipped else body,
+                           skipped=skipped, from_cache=True)
+
+    def _fetch_network(self, url: str, extra_headers: Dict[str, str], accept: Optional[AcceptFunc],
+                       max_bytes: int) -> FetchResult:
+        """Stream a URL over the pooled session, deciding early whether the body is wanted"""
+        try:
+            with self._host_limit(url):
+                with self.session.get(url, headers=extra_headers, timeout=self.timeout, stream=True) as response:
+                    result = FetchResult(
+                        url=url,
+                        status_code=response.status_code,
+                        headers={name.lower(): value for name, value in response.headers.items()},
+                    )
+                    response.raise_for_status()
+                    if response.status_code == 304:
+                        return result
+                    self._read_body(response, result, accept, max_bytes)
+        except requests.exceptions.HTTPError as e:
+            result.error = str(e)
+        except Exception as e:
+            result = FetchResult(url=url, error=str(e))
+        return result
+
+    def _read_body(self, response: requests.Response, result: FetchResult, accept: Optional[AcceptFunc],
+                   max_bytes: int) -> None:
+        """Read a streamed body into the result, stopping as soon as it is rejected or too large"""
+        content_length = result.headers.get('content-length', '')
+        if content_length.isdigit() and 'content-encoding' not in result.headers and int(content_length) > max_bytes:
+            result.skipped = f"oversized content ({content_length} bytes, limit {max_bytes})"
+            return
+
+        chunks = []
+        received = 0
+        sniffed = accept is None
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            received += len(chunk)
+            if not sniffed and received >= SNIFF_BYTES:
+                sniffed = True
+                result.skipped = accept(result.headers.get('content-type', ''), b"".join(chunks)[:SNIFF_BYTES])
+                if result.skipped:
+                    return
+            if received > max_bytes:
+                result.skipped = f"oversized content (over {max_bytes} bytes)"
+                return
+
+        body = b"".join(chunks)
+        if not sniffed:
+            result.skipped = accept(result.headers.get('content-type', ''), body[:SNIFF_BYTES])
+            if result.skipped:
+                return
+        result.content = body
+
+    def fetch_all(self, urls: List[str], accept: Optional[AcceptFunc] = None,
+                  max_bytes: Optional[int] = None) -> List[FetchResult]:
+        """
+        Download many URLs concurrently.
+
+        Args:
+            urls: URLs to download
+            accept: Optional early check applied to every URL, see fetch()
+            max_bytes: Per-body size limit, see fetch()
+
+        Returns:
+            list: One FetchResult per URL, in the same order as the input
+        """
+        return list(self._executor.map(lambda url: self.fetch(url, accept, max_bytes), urls))
+
+
+_fetcher: Optional[ConcurrentFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> ConcurrentFetcher:
+    """Get the process-wide fetcher shared by all HTTP-fetching tools"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = ConcurrentFetcher(cache=get_http_cache())
+        return _fetcher
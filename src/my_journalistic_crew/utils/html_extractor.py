@@ -0,0 +1,167 @@
+from bs4 import BeautifulSoup, FeatureNotFound
+from typing import Optional, Union
+import os
+import re
+import zlib
+
+SCRAPE_MAX_CHARS = int(os.getenv('SCRAPE_MAX_CHARS', 20000))
+MAX_DECODED_BYTES = int(os.getenv('MAX_DECODED_BYTES', 10 * 1024 * 1024))
+
+# Elements that never carry article text
+NOISE_TAGS = ["script", "style", "noscript", "template", "svg", "canvas", "iframe", "form", "button",
+              "input", "select", "nav", "footer", "aside"]
+
+# id/class/role fragments typical of navigation, cookie banners, share bars and ad slots
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|consent|gdpr|banner|newsletter|subscribe|signup|promo|advert|\bads?\b|sponsor|share|social|"
+    r"related|recommend|comment|footer|masthead|navbar|\bnav\b|menu|breadcrumb|sidebar|popup|modal|paywall|"
+    r"outbrain|taboola|trending|most-read",
+    re.IGNORECASE,
+)
+
+# Containers that usually wrap the article body, in order of preference
+CONTENT_SELECTORS = ['[itemprop="articleBody"]', 'article', 'main', '[role="main"]']
+
+BLOCK_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "blockquote", "pre", "figcaption", "td"]
+
+# Below this many characters a candidate container is not trusted as the main content
+MIN_CONTENT_CHARS = 250
+
+
+def decode_body(content: bytes, max_bytes: int = MAX_DECODED_BYTES) -> bytes:
+    """
+    Decompress a gzip or zlib body incrementally, never inflating past max_bytes.
+
+    Bodies without a gzip/zlib magic number are returned unchanged.
+    """
+    if content.startswith(b'\x1f\x8b'):  # gzip magic number
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif content.startswith(b'\x78\x9c') or content.startswith(b'\x78\x01') or content.startswith(b'\x78\xda'):  # zlib
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+    else:
+        return content
+
+    chunks = []
+    produced = 0
+    chunk_size = 64 * 1024
+    for offset in range(0, len(content), chunk_size):
+        data = content[offset:offset + chunk_size]
+        while data and produced < max_bytes:
+            chunk = decompressor.decompress(data, max_bytes - produced)
+            chunks.append(chunk)
+            produced += len(chunk)
+            data = decompressor.unconsumed_tail
+        if produced >= max_bytes or decompressor.eof:
+            break
+    return b"".join(chunks)
+
+
+def _make_soup(html: Union[bytes, str], encoding: Optional[str]) -> BeautifulSoup:
+    """Parse with lxml when it is installed, falling back to the stdlib parser"""
+    try:
+        return BeautifulSoup(html, "lxml", from_encoding=encoding if isinstance(html, bytes) else None)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser", from_encoding=encoding if isinstance(html, bytes) else None)
+
+
+def _strip_boilerplate(soup: BeautifulSoup) -> None:
+    """Remove navigation, banners and other chrome in place"""
+    for tag in soup.find_all(NOISE_TAGS):
+        tag.decompose()
+
+    body = soup.body or soup
+    body_length = len(body.get_text(" ", strip=True)) or 1
+    for tag in body.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "main", "article"):
+            continue
+        attrs = tag.attrs or {}
+        marker = " ".join([attrs.get("id") or "", " ".join(attrs.get("class") or []), attrs.get("role") or "",
+                           attrs.get("aria-label") or ""])
+        if not marker.strip() or not BOILERPLATE_PATTERN.search(marker):
+            continue
+        # Guard against wrappers like <div class="page has-sidebar"> that hold the whole story
+        if len(tag.get_text(" ", strip=True)) > body_length / 2:
+            continue
+        tag.decompose()
+
+
+def _text_length(tag) -> int:
+    return sum(len(p.get_text(" ", strip=True)) for p in tag.find_all("p"))
+
+
+def _find_main_content(soup: BeautifulSoup):
+    """Pick the element most likely to hold the article body"""
+    for selector in CONTENT_SELECTORS:
+        candidates = soup.select(selector)
+        if candidates:
+            best = max(candidates, key=_text_length)
+            if _text_length(best) >= MIN_CONTENT_CHARS:
+                return best
+
+    # Fall back to scoring paragraph parents by text length, penalising link-heavy blocks
+    scores = {}
+    for paragraph in soup.find_all("p"):
+        length = len(paragraph.get_text(" ", strip=True))
+        if length < 25:
+            continue
+        parent = paragraph.parent
+        grandparent = parent.parent if parent is not None else None
+        for node, weight in ((parent, 1.0), (grandparent, 0.5)):
+            if node is not None:
+                scores[id(node)] = (scores.get(id(node), (0.0, node))[0] + length * weight, node)
+
+    best, best_score = None, 0.0
+    for score, node in scores.values():
+        text_length = len(node.get_text(" ", strip=True)) or 1
+        link_length = sum(len(a.get_text(" ", strip=True)) for a in node.find_all("a"))
+        score *= 1 - link_length / text_length
+        if score > best_score:
+            best, best_score = node, score
+    return best or soup.body or soup
+
+
+def _block_text(container) -> str:
+    """Render a container as one line per block element"""
+    lines = []
+    for block in container.find_all(BLOCK_TAGS):
+        # Nested blocks (p inside li, etc.) are rendered through their outermost block
+        if block.find_parent(BLOCK_TAGS) is not None:
+            continue
+        text = re.sub(r"\s+", " ", block.get_text(" ", strip=True))
+        if text and (not lines or lines[-1] != text):
+            lines.append(text)
+    if not lines:
+        return re.sub(r"\s+\n\s+", "\n", re.sub(r"[ \t]+", " ", container.get_text(" "))).strip()
+    return "\n".join(lines)
+
+
+def truncate_text(text: str, max_chars: int = SCRAPE_MAX_CHARS) -> str:
+    """Cap text at max_chars, cutting on a word boundary"""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip() + "\n[truncated]"
+
+
+def extract_main_text(html: Union[bytes, str], encoding: Optional[str] = None,
+                      max_chars: int = SCRAPE_MAX_CHARS) -> str:
+    """
+    Extract the readable article text from an HTML document.
+
+    Args:
+        html: Raw (already decompressed) HTML bytes or a decoded string
+        encoding: Charset from the Content-Type header, if known
+        max_chars: Maximum number of characters to return
+
+    Returns:
+        str: Title and main-content text with boilerplate removed
+    """
+    soup = _make_soup(html, encoding)
+    title = soup.title.get_text(" ", strip=True) if soup.title else ""
+
+    _strip_boilerplate(soup)
+    text = _block_text(_find_main_content(soup))
+
+    if title and not text.startswith(title):
+        text = f"{title}\n{text}"
+    return truncate_text(text, max_chars)
@@ -0,0 +1,244 @@
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join('.cache', 'http'))
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+HTTP_CACHE_DISABLED = os.getenv('HTTP_CACHE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+# Heuristic freshness for responses that only carry Last-Modified is capped at a day
+MAX_HEURISTIC_FRESHNESS = 24 * 3600
+
+
+class CacheEntry(BaseModel):
+    """Model for a cached HTTP response as recorded in the index"""
+    url: str
+    digest: str
+    size: int
+    status_code: int = 200
+    headers: Dict[str, str] = Field(default_factory=dict)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = 0.0
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date header into a unix timestamp"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Split a Cache-Control header into its directives"""
+    directives = {}
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class HttpCache:
+    """Content-addressed on-disk HTTP response cache: a SQLite index plus one blob file per distinct body"""
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)")
+        self._db.commit()
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _freshness_deadline(self, headers: Dict[str, str], now: float) -> Optional[float]:
+        """Work out until when a response may be served without revalidation; None means do not store"""
+        directives = _parse_cache_control(headers.get('cache-control', ''))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now
+        if directives.get('max-age') and directives['max-age'].isdigit():
+            return now + int(directives['max-age'])
+
+        date = _parse_http_date(headers.get('date')) or now
+        expires = _parse_http_date(headers.get('expires'))
+        if expires is not None:
+            return now + max(0.0, expires - date)
+
+        last_modified = _parse_http_date(headers.get('last-modified'))
+        if last_modified is not None:
+            return now + min(MAX_HEURISTIC_FRESHNESS, max(0.0, (date - last_modified) / 10))
+        return now
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Get the index entry for a URL, marking it as recently used"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, digest, size, status_code, headers, etag, last_modified, expires_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        return CacheEntry(
+            url=row[0], digest=row[1], size=row[2], status_code=row[3], headers=json.loads(row[4]),
+            etag=row[5], last_modified=row[6], expires_at=row[7]
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() < entry.expires_at
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        """Build the If-None-Match / If-Modified-Since headers to revalidate an entry"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def load_body(self, entry: CacheEntry) -> Optional[bytes]:
+        """Read the cached body, or None if the blob has gone missing"""
+        try:
+            with open(self._blob_path(entry.digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, status_code: int, headers: Dict[str, str], content: bytes) -> None:
+        """Record a full response, if its headers allow caching"""
+        now = time.time()
+        expires_at = self._freshness_deadline(headers, now)
+        if status_code != 200 or expires_at is None:
+            return
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        # A response that is already stale and cannot be revalidated is useless to keep
+        if expires_at <= now and not (etag or last_modified):
+            return
+
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, len(content), status_code, json.dumps(headers), etag, last_modified, expires_at, now)
+            )
+            self._db.commit()
+            self._evict()
+
+    def refresh(self, entry: CacheEntry, headers: Dict[str, str]) -> CacheEntry:
+        """Update an entry after a 304 Not Modified, merging in the new headers"""
+        merged = {**entry.headers, **headers}
+        expires_at = self._freshness_deadline(merged, time.time()) or time.time()
+        entry = entry.model_copy(update={
+            'headers': merged,
+            'etag': merged.get('etag'),
+            'last_modified': merged.get('last-modified'),
+            'expires_at': expires_at,
+        })
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, expires_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(merged), entry.etag, entry.last_modified, expires_at, time.time(), entry.url)
+            )
+            self._db.commit()
+        return entry
+
+    def _total_bytes(self) -> int:
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM responses GROUP BY digest)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the blobs fit in the size budget; caller holds the lock"""
+        while self._total_bytes() > self.max_bytes:
+            row = self._db.execute("SELECT url, digest FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            url, digest = row
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.evictions += 1
+            still_used = self._db.execute("SELECT 1 FROM responses WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+        self._db.commit()
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: 'hits', 'revalidated' or 'misses'"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters for this process"""
+        with self._lock:
+            total_bytes = self._total_bytes()
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes': total_bytes,
+        }
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Get the process-wide HTTP cache, or None when caching is disabled"""
+    global _cache
+    if HTTP_CACHE_DISABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
@@ -0,0 +1,244 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from PIL import Image
+from my_journalistic_crew.utils.fetcher import ConcurrentFetcher, get_fetcher
+from my_journalistic_crew.utils.image_registry import ImageRegistry, fingerprint_image, get_image_registry
+from my_journalistic_crew.utils.payload_encoder import (
+    VISION_PAYLOAD_BUDGET, VISION_PAYLOAD_FORMATS, EncodedPayload, encode_cached_payload, load_cached_payload
+)
+from my_journalistic_crew.utils.renditions import (
+    ANALYSIS, IMAGE_TASK_RENDITIONS, RenditionOutput, RenditionSpec, render_renditions
+)
+import atexit
+import hashlib
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', os.cpu_count() or 2))
+# Images downloaded but not yet encoded; bounds memory to about this many source files at once
+IMAGE_MAX_IN_FLIGHT = int(os.getenv('IMAGE_MAX_IN_FLIGHT', 4))
+IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', 20 * 1024 * 1024))
+RENDITION_DIR = os.getenv('RENDITION_DIR', os.path.join('.cache', 'renditions'))
+
+
+class ImageResult(BaseModel):
+    """Model for the outcome of rendering a single source image"""
+    url: str
+    digest: Optional[str] = Field(default=None, description="Canonical SHA-256 shared by identical and near-identical images")
+    renditions: Dict[str, RenditionOutput] = Field(default_factory=dict)
+    source_bytes: int = 0
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    from_cache: bool = False
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds per stage: fetch, decode and one per rendition")
+
+
+def _accept_image(content_type: str, head: bytes) -> Optional[str]:
+    """Stop downloading pages served where an image was expected"""
+    media_type = content_type.split(';')[0].strip().lower()
+    if media_type.startswith("text/"):
+        return f"non-image content ({media_type})"
+    return None
+
+
+def export_rendition(rendition: RenditionOutput, output_path: str) -> str:
+    """Place a rendition at the path a tool reports, hard-linking where the filesystem allows"""
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    try:
+        os.link(rendition.path, output_path)
+    except OSError:
+        shutil.copyfile(rendition.path, output_path)
+    return output_path
+
+
+class ImagePipeline:
+    """
+    Fetches each source image once and renders every rendition the image tools need from one decode.
+
+    Downloads reuse the shared fetcher's pooled connections and timeouts. Decoding, resampling
+    and encoding run in worker processes so they use every core. At most max_in_flight source
+    images are held in memory at any time. Renditions are kept under RENDITION_DIR by the
+    image registry's canonical digest: a URL processed before is not fetched again, and bytes
+    identical or near-identical to an image processed before are not decoded again.
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS, max_in_flight: int = IMAGE_MAX_IN_FLIGHT,
+                 fetcher: Optional[ConcurrentFetcher] = None, rendition_dir: str = RENDITION_DIR,
+                 default_specs: List[RenditionSpec] = IMAGE_TASK_RENDITIONS,
+                 registry: Optional[ImageRegistry] = None):
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.fetcher = fetcher or get_fetcher()
+        self.registry = registry or get_image_registry()
+        self.rendition_dir = rendition_dir
+        self.default_specs = default_specs
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # One lock per canonical digest, so copies of a picture arriving together are rendered once
+        self._digest_locks: Dict[str, threading.Lock] = {}
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # Spawned workers do not inherit this process's threads and open connections
+                self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+
+    def _digest_lock(self, digest: str) -> threading.Lock:
+        with self._lock:
+            return self._digest_locks.setdefault(digest, threading.Lock())
+
+    def _source_dir(self, digest: str) -> str:
+        return os.path.join(self.rendition_dir, digest[:2], digest)
+
+    def _cached(self, url: str, digest: str, specs: List[RenditionSpec]) -> Optional[ImageResult]:
+        """Renditions already on disk for a canonical digest, or None if any requested one is missing"""
+        source_dir = self._source_dir(digest)
+        renditions = {}
+        for spec in specs:
+            path = os.path.join(source_dir, spec.filename)
+            if not os.path.exists(path):
+                return None
+            if spec.fit == "contain":
+                with Image.open(path) as img:
+                    width, height = img.size
+            else:
+                width, height = spec.size
+            renditions[spec.name] = RenditionOutput(name=spec.name, path=path, width=width,
+                                                    height=height, bytes=os.path.getsize(path))
+        return ImageResult(url=url, digest=digest, renditions=renditions, from_cache=True)
+
+    def _render_one(self, url: str, specs: List[RenditionSpec]) -> ImageResult:
+        # A URL processed before needs no download at all
+        known = self.registry.source_digest(url)
+        canonical = self.registry.canonical(known) if known else None
+        cached = self._cached(url, canonical, specs) if canonical else None
+        if cached is not None:
+            self.registry.count('url_hits')
+            return cached
+
+        start = time.perf_counter()
+        page = self.fetcher.fetch(url, accept=_accept_image, max_bytes=IMAGE_MAX_BYTES)
+        timings = {'fetch': time.perf_counter() - start}
+        if not page.ok:
+            return ImageResult(url=url, status_code=page.status_code, error=page.error or page.skipped, timings=timings)
+
+        try:
+            sha256 = hashlib.sha256(page.content).hexdigest()
+            canonical = self.registry.canonical(sha256)
+            if canonical:
+                self.registry.count('exact_duplicates')
+            else:
+                # New bytes: a cheap perceptual fingerprint finds the same picture from another source
+                start = time.perf_counter()
+                phash, width, height = self._process_pool().submit(fingerprint_image, page.content).result()
+                timings['fingerprint'] = time.perf_counter() - start
+                canonical = self.registry.add_image(sha256, phash, width, height, len(page.content))
+            self.registry.record_source(url, sha256)
+
+            with self._digest_lock(canonical):
+                cached = self._cached(url, canonical, specs)
+                if cached is not None:
+                    cached.timings, cached.status_code, cached.source_bytes = timings, page.status_code, len(page.content)
+                    return cached
+
+                # Render everything the image task uses while the source is decoded, not just what was asked for
+                wanted = {spec.name: spec for spec in self.default_specs + specs}
+                outputs, render_timings = self._process_pool().submit(
+                    render_renditions, page.content, list(wanted.values()), self._source_dir(canonical)
+                ).result()
+        except Exception as e:
+            return ImageResult(url=url, status_code=page.status_code, error=str(e) or type(e).__name__,
+                               source_bytes=len(page.content), timings=timings)
+        timings.update(render_timings)
+        return ImageResult(url=url, digest=canonical, renditions={output.name: output for output in outputs},
+                           status_code=page.status_code, source_bytes=len(page.content), timings=timings)
+
+    def render(self, urls: List[str], specs: List[RenditionSpec]) -> List[ImageResult]:
+        """
+        Get the requested renditions of every URL, keeping the input order.
+
+        Args:
+            urls: Source image URLs
+            specs: Renditions the caller needs
+
+        Returns:
+            List[ImageResult]: One result per URL
+        """
+        if not urls:
+            return []
+        # Each thread holds at most one downloaded body until its encode finishes
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(urls)), thread_name_prefix="image") as executor:
+            results = list(executor.map(lambda url: self._render_one(url, specs), urls))
+        print(f"Image pipeline stage timings: {summarize_timings(results)}")
+        print(f"Image registry stats: {self.registry.stats()}")
+        return results
+
+    def encode_payloads(self, results: List[ImageResult], budget: int = VISION_PAYLOAD_BUDGET,
+                        formats: List[str] = VISION_PAYLOAD_FORMATS) -> List[Optional[EncodedPayload]]:
+        """
+        Encode the vision payload of each rendered image within a byte budget, reusing earlier encodes.
+
+        Args:
+            results: Images rendered with the ANALYSIS rendition
+            budget: Largest base64 payload per image
+            formats: Formats the encoder may choose from
+
+        Returns:
+            list: One payload per result, None where the image has no analysis rendition
+        """
+        payloads: List[Optional[EncodedPayload]] = [None] * len(results)
+        pending: Dict[int, Future] = {}
+        encoding: Dict[str, Future] = {}
+        for index, result in enumerate(results):
+            if ANALYSIS.name not in result.renditions:
+                continue
+            source_dir = self._source_dir(result.digest)
+            payloads[index] = load_cached_payload(source_dir, budget, formats)
+            if payloads[index] is None:
+                # Duplicates of one picture share a source directory and are encoded once
+                if source_dir not in encoding:
+                    encoding[source_dir] = self._process_pool().submit(
+                        encode_cached_payload, result.renditions[ANALYSIS.name].path, source_dir, budget, formats
+                    )
+                pending[index] = encoding[source_dir]
+        for index, future in pending.items():
+            payloads[index] = future.result()
+        return payloads
+
+    def close(self) -> None:
+        with self._lock:
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+                self._processes = None
+
+
+def summarize_timings(results: List[ImageResult]) -> Dict[str, float]:
+    """Total seconds per stage across results, plus how many sources were served from disk"""
+    totals: Dict[str, float] = {}
+    for result in results:
+        for stage, seconds in result.timings.items():
+            totals[stage] = round(totals.get(stage, 0.0) + seconds, 3)
+    totals['cached'] = sum(1 for result in results if result.from_cache)
+    return totals
+
+
+_image_pipeline: Optional[ImagePipeline] = None
+_image_pipeline_lock = threading.Lock()
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """Get the process-wide image pipeline; worker processes start on first use and stop at exit"""
+    global _image_pipeline
+    with _image_pipeline_lock:
+        if _image_pipeline is None:
+            _image_pipeline = ImagePipeline()
+            atexit.register(_image_pipeline.close)
+        return _image_pipeline
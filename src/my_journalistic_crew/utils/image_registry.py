@@ -0,0 +1,265 @@
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image
+from io import BytesIO
+import os
+import sqlite3
+import threading
+import time
+
+IMAGE_REGISTRY_PATH = os.getenv('IMAGE_REGISTRY_PATH', os.path.join('.cache', 'images.sqlite3'))
+# Maximum differing bits between two perceptual hashes for images to count as the same picture
+IMAGE_PHASH_DISTANCE = int(os.getenv('IMAGE_PHASH_DISTANCE', 5))
+# Near-duplicates must also share their shape; a crop is a different image
+MAX_ASPECT_DIFFERENCE = 0.05
+
+
+def perceptual_hash(img: Image.Image) -> int:
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail"""
+    small = img.convert("L").resize((9, 8), Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def fingerprint_image(content: bytes) -> Tuple[str, int, int]:
+    """
+    Perceptual hash and dimensions of an encoded image; runs in an image worker process.
+
+    JPEGs are decoded at 1/8 scale, which is all a 9x8 hash needs.
+    """
+    img = Image.open(BytesIO(content))
+    width, height = img.size
+    if img.format == "JPEG":
+        img.draft("L", (64, 64))
+    return f"{perceptual_hash(img):016x}", width, height
+
+
+def _is_distinctive(phash: int) -> bool:
+    """Flat or nearly flat images hash to almost all 0s or 1s and would match each other"""
+    return 8 <= phash.bit_count() <= 56
+
+
+class ImageRegistry:
+    """
+    Content-addressed registry of processed images.
+
+    Maps source URLs to the SHA-256 of their bytes, groups byte-identical and perceptually
+    near-identical images (the same photo served by different CDNs) under one canonical
+    digest, and remembers the blob URL of every uploaded file by the SHA-256 of its bytes,
+    along with the parts of multipart uploads still in progress and the descriptions vision
+    models gave of each picture.
+    Renditions are stored by canonical digest, so each picture is processed and uploaded once.
+    """
+
+    def __init__(self, path: str = IMAGE_REGISTRY_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                seen_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS images (
+                sha256 TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                phash TEXT NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                blob_url TEXT NOT NULL,
+                pathname TEXT,
+                uploaded_at REAL NOT NULL
+            )
+        """)
+        # Multipart uploads in progress, so an interrupted upload resumes from its last finished part
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS multipart_uploads (
+                sha256 TEXT PRIMARY KEY,
+                pathname TEXT NOT NULL,
+                upload_id TEXT NOT NULL,
+                upload_key TEXT NOT NULL,
+                part_size INTEGER NOT NULL,
+                started_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS multipart_parts (
+                sha256 TEXT NOT NULL,
+                part_number INTEGER NOT NULL,
+                etag TEXT NOT NULL,
+                PRIMARY KEY (sha256, part_number)
+            )
+        """)
+        # Vision model descriptions, so a picture is described once per model
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS descriptions (
+                sha256 TEXT NOT NULL,
+                model TEXT NOT NULL,
+                description TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (sha256, model)
+            )
+        """)
+        self._db.commit()
+
+        self.url_hits = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def count(self, name: str) -> None:
+        """Count a pipeline outcome: 'url_hits' or 'exact_duplicates'; pipeline threads share the counters"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def source_digest(self, url: str) -> Optional[str]:
+        """SHA-256 of the bytes last downloaded from url, if it was processed before"""
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM sources WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def canonical(self, sha256: str) -> Optional[str]:
+        """Canonical digest of a known image, or None if these bytes were never registered"""
+        with self._lock:
+            row = self._db.execute("SELECT canonical FROM images WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def record_source(self, url: str, sha256: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO sources (url, sha256, seen_at) VALUES (?, ?, ?)",
+                             (url, sha256, time.time()))
+
+    def add_image(self, sha256: str, phash: str, width: int, height: int, size: int) -> str:
+        """
+        Register new image bytes and return their canonical digest.
+
+        If a perceptually near-identical image of the same shape is already registered the new
+        bytes join its group; otherwise they start a group of their own.
+        """
+        value = int(phash, 16)
+        with self._lock, self._db:
+            canonical = None
+            if _is_distinctive(value):
+                best = IMAGE_PHASH_DISTANCE + 1
+                for other, other_phash, other_width, other_height in self._db.execute(
+                        "SELECT canonical, phash, width, height FROM images WHERE sha256 = canonical"):
+                    if abs(width / height - other_width / other_height) > MAX_ASPECT_DIFFERENCE * width / height:
+                        continue
+                    distance = (value ^ int(other_phash, 16)).bit_count()
+                    if distance < best:
+                        canonical, best = other, distance
+            if canonical:
+                self.near_duplicates += 1
+            self._db.execute(
+                "INSERT OR IGNORE INTO images (sha256, canonical, phash, width, height, bytes, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sha256, canonical or sha256, phash, width, height, size, time.time())
+            )
+            row = self._db.execute("SELECT canonical FROM images WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0]
+
+    def blob_url(self, sha256: str) -> Optional[str]:
+        """Public URL of a file with these bytes that was already uploaded"""
+        with self._lock:
+            row = self._db.execute("SELECT blob_url FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def record_blob(self, sha256: str, blob_url: str, pathname: Optional[str] = None) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO blobs (sha256, blob_url, pathname, uploaded_at) VALUES (?, ?, ?, ?)",
+                             (sha256, blob_url, pathname, time.time()))
+
+    def pending_upload(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        State of an unfinished multipart upload of these bytes, or None.
+
+        Returns:
+            dict: pathname, upload_id, upload_key, part_size and parts (part number -> etag)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT pathname, upload_id, upload_key, part_size FROM multipart_uploads WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if not row:
+                return None
+            parts = self._db.execute("SELECT part_number, etag FROM multipart_parts WHERE sha256 = ?", (sha256,)).fetchall()
+        return {'pathname': row[0], 'upload_id': row[1], 'upload_key': row[2], 'part_size': row[3], 'parts': dict(parts)}
+
+    def start_upload(self, sha256: str, pathname: str, upload_id: str, upload_key: str, part_size: int) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM multipart_parts WHERE sha256 = ?", (sha256,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO multipart_uploads (sha256, pathname, upload_id, upload_key, part_size, started_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (sha256, pathname, upload_id, upload_key, part_size, time.time())
+            )
+
+    def record_part(self, sha256: str, part_number: int, etag: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO multipart_parts (sha256, part_number, etag) VALUES (?, ?, ?)",
+                             (sha256, part_number, etag))
+
+    def finish_upload(self, sha256: str) -> None:
+        """Forget a multipart upload once it is completed or abandoned"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM multipart_parts WHERE sha256 = ?", (sha256,))
+            self._db.execute("DELETE FROM multipart_uploads WHERE sha256 = ?", (sha256,))
+
+    def description(self, sha256: str, model: str) -> Optional[str]:
+        """Description of a picture previously produced by a vision model"""
+        with self._lock:
+            row = self._db.execute("SELECT description FROM descriptions WHERE sha256 = ? AND model = ?",
+                                   (sha256, model)).fetchone()
+        return row[0] if row else None
+
+    def record_description(self, sha256: str, model: str, description: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO descriptions (sha256, model, description, created_at) VALUES (?, ?, ?, ?)",
+                (sha256, model, description, time.time())
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            images = self._db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            groups = self._db.execute("SELECT COUNT(*) FROM images WHERE sha256 = canonical").fetchone()[0]
+            blobs = self._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            descriptions = self._db.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0]
+        return {
+            'images': images,
+            'distinct_pictures': groups,
+            'blobs': blobs,
+            'descriptions': descriptions,
+            'url_hits': self.url_hits,
+            'exact_duplicates': self.exact_duplicates,
+            'near_duplicates': self.near_duplicates,
+        }
+
+
+_image_registry: Optional[ImageRegistry] = None
+_image_registry_lock = threading.Lock()
+
+
+def get_image_registry() -> ImageRegistry:
+    """Get the process-wide image registry"""
+    global _image_registry
+    with _image_registry_lock:
+        if _image_registry is None:
+            _image_registry = ImageRegistry()
+        return _image_registry
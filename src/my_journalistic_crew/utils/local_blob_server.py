@@ -0,0 +1,181 @@
+"""
+Local stand-in for the Vercel Blob API, for exercising BlobStorageTool offline.
+
+Implements single PUT uploads and the multipart create/upload/complete actions the uploader
+uses, stores blobs under a directory and serves them back over GET. It can fail a share of
+requests with 503 to exercise retries. Point the uploader at it with:
+
+    python -m my_journalistic_crew.utils.local_blob_server --port 8790
+    VERCEL_BLOB_API_URL=http://127.0.0.1:8790 VERCEL_BLOB_TOKEN=local ...
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+import argparse
+import hashlib
+import json
+import os
+import random
+import secrets
+import threading
+
+
+class LocalBlobServer(ThreadingHTTPServer):
+    """Threaded HTTP server keeping blobs in storage_dir and multipart parts until completion"""
+    daemon_threads = True
+
+    def __init__(self, address, storage_dir: str, token: Optional[str] = None, failure_rate: float = 0.0):
+        super().__init__(address, LocalBlobHandler)
+        self.storage_dir = storage_dir
+        self.token = token
+        self.failure_rate = failure_rate
+        self.lock = threading.Lock()
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.requests = {'put': 0, 'create': 0, 'upload': 0, 'complete': 0, 'failed': 0}
+        os.makedirs(storage_dir, exist_ok=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def store(self, pathname: str, content: bytes, content_type: str, random_suffix: bool) -> Dict[str, str]:
+        """Write a blob and describe it the way the Vercel API does"""
+        if random_suffix:
+            stem, extension = os.path.splitext(pathname)
+            pathname = f"{stem}-{secrets.token_hex(8)}{extension}"
+        path = os.path.join(self.storage_dir, pathname)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        url = f"{self.url}/{pathname}"
+        return {'url': url, 'downloadUrl': f"{url}?download=1", 'pathname': pathname, 'contentType': content_type,
+                'contentDisposition': f'inline; filename="{os.path.basename(pathname)}"'}
+
+
+class LocalBlobHandler(BaseHTTPRequestHandler):
+    server: LocalBlobServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, code: str, message: str) -> None:
+        self._reply(status, {'error': {'code': code, 'message': message}})
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _authorized(self) -> bool:
+        if not self.server.token:
+            return True
+        return self.headers.get('authorization') == f"Bearer {self.server.token}"
+
+    def _fail_randomly(self) -> bool:
+        if random.random() >= self.server.failure_rate:
+            return False
+        with self.server.lock:
+            self.server.requests['failed'] += 1
+        self._error(503, 'service_unavailable', 'Injected failure')
+        return True
+
+    def do_GET(self):
+        path = os.path.join(self.server.storage_dir, unquote(urlparse(self.path).path).lstrip('/'))
+        if not os.path.isfile(path):
+            self._error(404, 'not_found', 'The requested blob does not exist')
+            return
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_PUT(self):
+        query = parse_qs(urlparse(self.path).query)
+        if not self._authorized():
+            self._error(403, 'forbidden', 'Access denied, please provide a valid token for this resource')
+            return
+        content = self._body()
+        if self._fail_randomly():
+            return
+        with self.server.lock:
+            self.server.requests['put'] += 1
+        pathname = query.get('pathname', [''])[0]
+        self._reply(200, self.server.store(pathname, content, self.headers.get('x-content-type', ''),
+                                           self.headers.get('x-add-random-suffix') == '1'))
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/mpu':
+            self._error(404, 'not_found', 'Unknown endpoint')
+            return
+        if not self._authorized():
+            self._error(403, 'forbidden', 'Access denied, please provide a valid token for this resource')
+            return
+        content = self._body()
+        if self._fail_randomly():
+            return
+
+        action = self.headers.get('x-mpu-action')
+        pathname = parse_qs(urlparse(self.path).query).get('pathname', [''])[0]
+        with self.server.lock:
+            if action in self.server.requests:
+                self.server.requests[action] += 1
+            if action == 'create':
+                upload_id = secrets.token_hex(8)
+                self.server.uploads[upload_id] = {}
+                self._reply(200, {'uploadId': upload_id, 'key': pathname})
+                return
+            parts = self.server.uploads.get(self.headers.get('x-mpu-upload-id', ''))
+            if parts is None:
+                self._error(400, 'bad_request', 'Unknown multipart upload')
+                return
+            if action == 'upload':
+                part_number = int(self.headers.get('x-mpu-part-number', 0))
+                parts[part_number] = content
+                self._reply(200, {'etag': hashlib.md5(content).hexdigest(), 'partNumber': part_number})
+                return
+            if action == 'complete':
+                listed = json.loads(content)
+                if any(part['etag'] != hashlib.md5(parts.get(part['partNumber'], b'')).hexdigest() for part in listed):
+                    self._error(400, 'bad_request', 'Part etags do not match the uploaded parts')
+                    return
+                del self.server.uploads[self.headers['x-mpu-upload-id']]
+                blob = b"".join(parts[part['partNumber']] for part in sorted(listed, key=lambda part: part['partNumber']))
+        if action == 'complete':
+            self._reply(200, self.server.store(pathname, blob, self.headers.get('x-content-type', ''),
+                                               self.headers.get('x-add-random-suffix') == '1'))
+            return
+        self._error(400, 'bad_request', f"Unknown multipart action: {action}")
+
+
+def start_local_blob_server(storage_dir: str, port: int = 0, token: Optional[str] = None,
+                            failure_rate: float = 0.0) -> LocalBlobServer:
+    """Start a stand-in blob server on a background thread; port 0 picks a free port"""
+    server = LocalBlobServer(('127.0.0.1', port), storage_dir, token=token, failure_rate=failure_rate)
+    threading.Thread(target=server.serve_forever, name="local-blob-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Vercel Blob API")
+    parser.add_argument('--port', type=int, default=8790)
+    parser.add_argument('--dir', default=os.path.join('.cache', 'local-blob'))
+    parser.add_argument('--token', default=None, help="Require this bearer token")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    server = LocalBlobServer(('127.0.0.1', args.port), args.dir, token=args.token, failure_rate=args.failure_rate)
+    print(f"Local blob server storing in {args.dir} at {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
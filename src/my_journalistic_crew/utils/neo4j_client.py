@@ -0,0 +1,208 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from my_journalistic_crew.models.outputs import FinalArticle
+from my_journalistic_crew.utils.embeddings import ArticleEmbeddings
+import atexit
+import os
+import threading
+
+# bolt://localhost:7687 for a local container, memory:// for the in-process stand-in
+NEO4J_URI = os.getenv("NEO4J_URI", "neo4j+s://f3a8bf56.databases.neo4j.io")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "h316Qd4uC5CsfdLSDj7dsVsMmC9HbwFwgsnWjPtFacA")
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE") or None
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", 10))
+# Aura closes idle connections after a while; recycle them before it does
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", 1800))
+# Managed transactions retry transient failures (leader switches, deadlocks) for up to this long
+NEO4J_MAX_RETRY_TIME = float(os.getenv("NEO4J_MAX_RETRY_TIME", 30))
+# Articles carry their full content and a dozen or so vectors, so keep each transaction to a few MB
+NEO4J_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", 25))
+
+# Articles are published in East Africa Time
+PUBLISH_TIMEZONE = timezone(timedelta(hours=3))
+
+SCHEMA_QUERIES = [
+    "CREATE CONSTRAINT article_slug IF NOT EXISTS FOR (art:Article) REQUIRE art.slug IS UNIQUE",
+    "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (chunk:Chunk) REQUIRE chunk.id IS UNIQUE",
+]
+
+UPSERT_ARTICLES_QUERY = """
+// Merge every article in the batch by slug; the slug constraint makes each MERGE an index lookup
+UNWIND $rows AS row
+MERGE (art:Article {slug: row.slug})
+ON CREATE SET art.publishedAt = datetime({timezone: '+03:00'})
+ON MATCH SET art.updatedAt = datetime({timezone: '+03:00'})
+SET art += row.properties
+WITH art, row
+// Drop chunks left over from a longer previous version
+OPTIONAL MATCH (art)-[:HAS_CHUNK]->(old:Chunk)
+WHERE old.index >= size(row.chunks)
+DETACH DELETE old
+WITH DISTINCT art, row
+// Chunks hang off their article and are linked in reading order
+CALL {
+    WITH art, row
+    UNWIND row.chunks AS chunk
+    MERGE (c:Chunk {id: row.slug + '#' + toString(chunk.index)})
+    SET c.slug = row.slug, c.index = chunk.index, c.text = chunk.text, c.embedding = chunk.embedding
+    MERGE (art)-[:HAS_CHUNK]->(c)
+    WITH c ORDER BY c.index
+    WITH collect(c) AS chunks
+    FOREACH (i IN range(0, size(chunks) - 2) |
+        FOREACH (current IN [chunks[i]] |
+            FOREACH (next IN [chunks[i + 1]] | MERGE (current)-[:NEXT]->(next))))
+    RETURN size(chunks) AS chunkCount
+}
+RETURN art.title AS title, art.slug AS slug, toString(art.publishedAt) AS publishedAt, chunkCount AS chunks
+"""
+
+
+def article_row(article: FinalArticle, embeddings: Optional[ArticleEmbeddings] = None) -> Dict[str, Any]:
+    """Parameters for one article, and its chunks, in an UNWIND batch"""
+    return {
+        "slug": article.slug,
+        "properties": {
+            "title": article.title,
+            "content": article.content,
+            "category": article.category,
+            "subcategory": article.subcategory,
+            "story": article.story,
+            "breaking_news": article.breaking_news,
+            "trending": article.trending,
+            "author": article.author,
+            "summary": article.summary,
+            "keywords": article.keywords,
+            "thumbnailUrl": article.thumbnailUrl,
+            "entities": article.entities,
+            "publisher": article.publisher,
+            "embedding": embeddings.embedding if embeddings else None,
+            "titleEmbedding": embeddings.title_embedding if embeddings else None,
+            "summaryEmbedding": embeddings.summary_embedding if embeddings else None,
+        },
+        "chunks": [chunk.model_dump() for chunk in embeddings.chunks] if embeddings else [],
+    }
+
+
+def _batches(rows: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    # One row per slug, the last one winning, so a batch never merges the same node twice
+    rows = list({row["slug"]: row for row in rows}.values())
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+_driver = None
+_driver_lock = threading.Lock()
+
+
+def get_neo4j_driver():
+    """
+    Get the process-wide Neo4j driver.
+
+    The driver keeps a pool of up to NEO4J_MAX_POOL_SIZE connections, so the TLS handshake to
+    Aura happens once per connection rather than once per article. It is closed at exit.
+    """
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            from neo4j import GraphDatabase
+            _driver = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=(NEO4J_USER, NEO4J_PASSWORD),
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                max_transaction_retry_time=NEO4J_MAX_RETRY_TIME,
+                keep_alive=True,
+            )
+            atexit.register(close_neo4j_driver)
+        return _driver
+
+
+def close_neo4j_driver() -> None:
+    """Close the shared driver and its pooled connections; the next call to get_neo4j_driver opens a new one"""
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+
+
+class Neo4jArticleStore:
+    """Writes articles to Neo4j in batched UNWIND transactions over the shared driver"""
+
+    def __init__(self, driver=None, database: Optional[str] = NEO4J_DATABASE, batch_size: int = NEO4J_BATCH_SIZE):
+        self.driver = driver or get_neo4j_driver()
+        self.database = database
+        self.batch_size = batch_size
+        self._schema_ready = False
+
+    def _ensure_schema(self, session) -> None:
+        if not self._schema_ready:
+            for query in SCHEMA_QUERIES:
+                session.run(query).consume()
+            self._schema_ready = True
+
+    @staticmethod
+    def _upsert_batch(tx, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [record.data() for record in tx.run(UPSERT_ARTICLES_QUERY, rows=rows)]
+
+    def upsert_articles(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create or update articles by slug, one managed transaction per batch of NEO4J_BATCH_SIZE.
+
+        Each batch is retried as a whole on transient errors, so it is stored completely or not at all.
+
+        Args:
+            rows: Rows built with article_row()
+
+        Returns:
+            list: title, slug, publishedAt and number of chunks of every stored article
+        """
+        stored = []
+        with self.driver.session(database=self.database) as session:
+            self._ensure_schema(session)
+            for batch in _batches(rows, self.batch_size):
+                stored.extend(session.execute_write(self._upsert_batch, batch))
+        return stored
+
+
+class InMemoryArticleStore:
+    """Stand-in for Neo4jArticleStore that keeps articles in a dict, for tests and offline runs"""
+
+    def __init__(self, batch_size: int = NEO4J_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.articles: Dict[str, Dict[str, Any]] = {}
+        self.chunks: Dict[str, List[Dict[str, Any]]] = {}
+        self.transactions = 0
+        self._lock = threading.Lock()
+
+    def upsert_articles(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same contract as Neo4jArticleStore.upsert_articles"""
+        stored = []
+        for batch in _batches(rows, self.batch_size):
+            with self._lock:
+                self.transactions += 1
+                now = datetime.now(PUBLISH_TIMEZONE).isoformat()
+                for row in batch:
+                    article = self.articles.get(row["slug"])
+                    if article is None:
+                        article = self.articles[row["slug"]] = {"slug": row["slug"], "publishedAt": now}
+                    else:
+                        article["updatedAt"] = now
+                    article.update(row["properties"])
+                    self.chunks[row["slug"]] = sorted(row["chunks"], key=lambda chunk: chunk["index"])
+                    stored.append({"title": article["title"], "slug": article["slug"],
+                                   "publishedAt": article["publishedAt"], "chunks": len(row["chunks"])})
+        return stored
+
+
+_article_store = None
+_article_store_lock = threading.Lock()
+
+
+def get_article_store():
+    """Get the process-wide article store: in memory when NEO4J_URI is memory://, Neo4j otherwise"""
+    global _article_store
+    with _article_store_lock:
+        if _article_store is None:
+            _article_store = InMemoryArticleStore() if NEO4J_URI.startswith("memory://") else Neo4jArticleStore()
+        return _article_store
@@ -0,0 +1,220 @@
+from calendar import timegm
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Literal, Optional, Tuple
+from urllib.parse import quote_plus, urlencode
+from pydantic import BaseModel, Field
+from my_journalistic_crew.utils.fetcher import ConcurrentFetcher
+from my_journalistic_crew.utils.http_cache import get_http_cache
+import feedparser
+import hashlib
+import os
+import re
+import threading
+
+GOOGLE_NEWS_RSS_URL = os.getenv('GOOGLE_NEWS_RSS_URL', 'https://news.google.com/rss').rstrip('/')
+# Feeds fetched at once; all come from one host, so this is also the per-host limit
+GOOGLE_NEWS_CONCURRENCY = int(os.getenv('GOOGLE_NEWS_CONCURRENCY', 20))
+GOOGLE_NEWS_TIMEOUT = float(os.getenv('GOOGLE_NEWS_TIMEOUT', 15))
+# Parsed feeds kept in memory, so a feed revalidated with a 304 is not parsed again
+PARSED_FEEDS_MAX = int(os.getenv('PARSED_FEEDS_MAX', 256))
+
+# Topics Google News serves as headline sections rather than by topic ID
+SECTION_TOPICS = {"WORLD", "NATION", "BUSINESS", "TECHNOLOGY", "ENTERTAINMENT", "SCIENCE", "SPORTS", "HEALTH"}
+WHEN_UNITS = {"h": 3600, "d": 86400, "w": 604800, "m": 2592000}
+
+
+class NewsFeed(BaseModel):
+    """One Google News RSS feed: a topic's headlines or the results of a query"""
+    kind: Literal["topic", "query"]
+    value: str = Field(..., description="Topic ID or search query")
+    language: str = "en"
+    country: str = "US"
+    when: Optional[str] = Field(default=None, description="Passed on to Google for query feeds, e.g. '12h' or '7d'")
+    helper: bool = Field(default=True, description="URL-escape the query")
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.value}:{self.country}"
+
+    def url(self, base_url: str = GOOGLE_NEWS_RSS_URL) -> str:
+        locale = urlencode({"hl": self.language, "gl": self.country, "ceid": f"{self.country}:{self.language}"})
+        if self.kind == "topic":
+            if self.value.upper() in SECTION_TOPICS:
+                return f"{base_url}/headlines/section/topic/{self.value.upper()}?{locale}"
+            return f"{base_url}/topics/{self.value}?{locale}"
+        query = f"{self.value} when:{self.when}" if self.when else self.value
+        return f"{base_url}/search?q={quote_plus(query) if self.helper else query}&{locale}"
+
+
+class NewsEntry(BaseModel):
+    """Model for one article merged from one or more feeds"""
+    title: str
+    link: str
+    source: str = ""
+    published_at: datetime
+    feeds: List[str] = Field(default_factory=list, description="Labels of every feed the article appeared in")
+
+    def formatted(self, now: datetime) -> Dict[str, str]:
+        """The title/link/published dict the RSS tools return"""
+        return {"title": self.title, "link": self.link, "published": format_age(now - self.published_at)}
+
+
+def parse_when(when: Optional[str]) -> Optional[int]:
+    """Convert a time frame such as '2h', '3d', '2w' or '1m' (30 days) into seconds"""
+    if not when:
+        return None
+    if when[-1] not in WHEN_UNITS or not when[:-1].isdigit():
+        raise ValueError("Invalid 'when' format. Use formats like '2h', '3d', '1m', or '2w'.")
+    return int(when[:-1]) * WHEN_UNITS[when[-1]]
+
+
+def valid_when(when: Optional[str]) -> Optional[str]:
+    """The time frame if it can be parsed, else None; like Google, the tools ignore one they do not understand"""
+    try:
+        parse_when(when)
+    except ValueError:
+        return None
+    return when or None
+
+
+def format_age(time_difference: timedelta) -> str:
+    """Convert a timedelta to a human-readable 'ago' format."""
+    seconds = int(time_difference.total_seconds())
+    if seconds < 60:
+        return f"{seconds} seconds ago"
+    elif seconds < 3600:
+        minutes = seconds // 60
+        return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+    elif seconds < 86400:
+        hours = seconds // 3600
+        return f"{hours} hour{'s' if hours > 1 else ''} ago"
+    else:
+        days = seconds // 86400
+        return f"{days} day{'s' if days > 1 else ''} ago"
+
+
+def _timestamp(entry) -> Optional[float]:
+    # feedparser has already parsed the date into UTC; the raw string is only a fallback
+    if entry.get("published_parsed"):
+        return float(timegm(entry.published_parsed))
+    try:
+        return parsedate_to_datetime(entry.get("published", "")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_feed(content: bytes) -> List[Tuple[str, str, str, float]]:
+    """Parse an RSS body into (title, link, source, published timestamp) rows, dropping undated entries"""
+    rows = []
+    for entry in feedparser.parse(content).entries:
+        timestamp = _timestamp(entry)
+        if timestamp is not None and entry.get("link"):
+            rows.append((entry.get("title", ""), entry.link, entry.get("source", {}).get("title", ""), timestamp))
+    return rows
+
+
+def _title_key(title: str, source: str) -> str:
+    # Google News appends " - Publisher" to titles; the same story syndicated under another link keeps its headline
+    if source and title.endswith(f" - {source}"):
+        title = title[:-len(source) - 3]
+    return re.sub(r'\W+', ' ', title).strip().casefold()
+
+
+class GoogleNewsAggregator:
+    """
+    Fetches many Google News RSS feeds at once and merges them into one time-sorted stream.
+
+    All feeds are requested concurrently over one pooled session. Responses go through the
+    shared HTTP cache, so unchanged feeds are revalidated with If-None-Match/If-Modified-Since,
+    and a body already parsed is not parsed again. Every date is parsed once, and entries
+    outside the time frame are dropped before anything else is done with them.
+    """
+
+    def __init__(self, fetcher: Optional[ConcurrentFetcher] = None, base_url: str = GOOGLE_NEWS_RSS_URL,
+                 concurrency: int = GOOGLE_NEWS_CONCURRENCY):
+        self.base_url = base_url.rstrip('/')
+        self.fetcher = fetcher or ConcurrentFetcher(max_workers=concurrency, per_host=concurrency,
+                                                    timeout=GOOGLE_NEWS_TIMEOUT, cache=get_http_cache())
+        self._parsed: "OrderedDict[str, List[Tuple[str, str, str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'feeds': 0, 'from_cache': 0, 'parsed': 0, 'entries': 0, 'duplicates': 0, 'filtered': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _rows(self, content: bytes) -> List[Tuple[str, str, str, float]]:
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            if digest in self._parsed:
+                self._parsed.move_to_end(digest)
+                return self._parsed[digest]
+        rows = parse_feed(content)
+        self._count('parsed')
+        with self._lock:
+            self._parsed[digest] = rows
+            while len(self._parsed) > PARSED_FEEDS_MAX:
+                self._parsed.popitem(last=False)
+        return rows
+
+    def collect(self, feeds: List[NewsFeed], when: Optional[str] = None,
+                limit: Optional[int] = None) -> Tuple[List[NewsEntry], Dict[str, str]]:
+        """
+        Fetch feeds concurrently and merge their entries.
+
+        Args:
+            feeds: Feeds to poll
+            when: Keep only entries published within this time frame, e.g. '12h'
+            limit: Keep at most this many of the newest entries
+
+        Returns:
+            tuple: Entries deduplicated by link and headline, newest first, and an error per failed feed label
+        """
+        max_age = parse_when(when)
+        now = datetime.now(timezone.utc)
+        cutoff = now.timestamp() - max_age if max_age is not None else None
+
+        results = self.fetcher.fetch_all([feed.url(self.base_url) for feed in feeds])
+        self._count('feeds', len(feeds))
+
+        merged: Dict[str, NewsEntry] = {}
+        by_title: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        for feed, result in zip(feeds, results):
+            if not result.ok:
+                errors[feed.label] = result.error or result.skipped
+                continue
+            if result.from_cache:
+                self._count('from_cache')
+            for title, link, source, timestamp in self._rows(result.content):
+                if cutoff is not None and timestamp < cutoff:
+                    self._count('filtered')
+                    continue
+                key = by_title.setdefault(_title_key(title, source), link)
+                entry = merged.get(link) or merged.get(key)
+                if entry is None:
+                    merged[link] = NewsEntry(title=title, link=link, source=source, feeds=[feed.label],
+                                             published_at=datetime.fromtimestamp(timestamp, timezone.utc))
+                    continue
+                self._count('duplicates')
+                if feed.label not in entry.feeds:
+                    entry.feeds.append(feed.label)
+
+        entries = sorted(merged.values(), key=lambda entry: entry.published_at, reverse=True)[:limit]
+        self._count('entries', len(entries))
+        return entries, errors
+
+
+_aggregator: Optional[GoogleNewsAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_news_aggregator() -> GoogleNewsAggregator:
+    """Get the process-wide Google News aggregator"""
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            _aggregator = GoogleNewsAggregator()
+        return _aggregator
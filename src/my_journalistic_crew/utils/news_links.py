@@ -0,0 +1,273 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from my_journalistic_crew.utils.fetcher import DEFAULT_HEADERS
+from my_journalistic_crew.utils.rate_limiter import RateLimiter
+from my_journalistic_crew.utils.url_index import canonicalize_url, url_key
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import requests
+
+GOOGLE_NEWS_URL = os.getenv('GOOGLE_NEWS_URL', 'https://news.google.com').rstrip('/')
+NEWS_LINKS_CACHE_PATH = os.getenv('NEWS_LINKS_CACHE_PATH', os.path.join('.cache', 'news_links.sqlite3'))
+NEWS_LINKS_CONCURRENCY = int(os.getenv('NEWS_LINKS_CONCURRENCY', 8))
+# Google throttles the decoding endpoint hard, so every request to it goes through one limiter
+NEWS_LINKS_REQUESTS_PER_MINUTE = float(os.getenv('NEWS_LINKS_REQUESTS_PER_MINUTE', 120))
+# Article IDs decoded per batchexecute request
+NEWS_LINKS_BATCH_SIZE = int(os.getenv('NEWS_LINKS_BATCH_SIZE', 20))
+NEWS_LINKS_TIMEOUT = float(os.getenv('NEWS_LINKS_TIMEOUT', 15))
+
+ARTICLE_PATH = re.compile(r'^/(?:rss/)?(?:articles|read)/([A-Za-z0-9_-]+)')
+SIGNATURE = re.compile(r'data-n-a-sg="([^"]+)"')
+TIMESTAMP = re.compile(r'data-n-a-ts="([^"]+)"')
+
+
+def google_news_id(url: str) -> Optional[str]:
+    """The article ID of a news.google.com article link, or None for any other URL"""
+    parsed = urlparse(url)
+    if parsed.netloc.lower() != "news.google.com":
+        return None
+    match = ARTICLE_PATH.match(parsed.path)
+    return match.group(1) if match else None
+
+
+def decode_legacy_id(article_id: str) -> Optional[str]:
+    """
+    Decode an article ID that embeds the publisher URL, without any request.
+
+    Older IDs are base64 protobuf holding the URL as a length-prefixed string; newer ones
+    (starting AU_yqL once decoded) are opaque and return None.
+    """
+    try:
+        data = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except ValueError:
+        return None
+    if not data.startswith(b"\x08\x13\x22"):
+        return None
+    data = data[3:]
+    # The URL's length is a protobuf varint
+    length, shift, position = 0, 0, 0
+    while position < len(data):
+        byte = data[position]
+        position += 1
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+    url = data[position:position + length].decode("utf-8", "ignore")
+    return url if url.startswith(("http://", "https://")) else None
+
+
+class NewsLinkCache:
+    """SQLite mapping of Google News article IDs to publisher URLs; successful resolutions never expire"""
+
+    def __init__(self, path: str = NEWS_LINKS_CACHE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS news_links (
+                article_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get_many(self, article_ids: List[str]) -> Dict[str, str]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(article_ids), 500):
+                batch = article_ids[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT article_id, url FROM news_links WHERE article_id IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, urls: Dict[str, str]) -> None:
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO news_links (article_id, url, resolved_at) VALUES (?, ?, ?)",
+                [(article_id, url, now) for article_id, url in urls.items()]
+            )
+
+
+class NewsLinkResolver:
+    """
+    Turns news.google.com article links into the publisher URLs they redirect to, in bulk.
+
+    Each article ID is resolved once and remembered. Older IDs are decoded locally; newer ones
+    need their signature from the article page, fetched concurrently, after which up to
+    NEWS_LINKS_BATCH_SIZE are decoded per batchexecute request. Links that still fail are
+    followed through their redirects as a last resort, and left as they are if that fails too.
+    """
+
+    def __init__(self, base_url: str = GOOGLE_NEWS_URL, cache: Optional[NewsLinkCache] = None,
+                 concurrency: int = NEWS_LINKS_CONCURRENCY, batch_size: int = NEWS_LINKS_BATCH_SIZE,
+                 per_minute: float = NEWS_LINKS_REQUESTS_PER_MINUTE, timeout: float = NEWS_LINKS_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache or NewsLinkCache()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.limiter = RateLimiter(per_minute, burst=concurrency)
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Skips the consent.google.com interstitial served to new visitors in the EU
+        self.session.cookies.set("CONSENT", "YES+cb", domain=".google.com")
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'cached': 0, 'decoded': 0, 'resolved': 0, 'redirected': 0, 'failed': 0, 'requests': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        self.limiter.acquire()
+        self._count('requests')
+        return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+    def _signature(self, article_id: str) -> Optional[Tuple[str, str]]:
+        """Get the (signature, timestamp) pair the decoding endpoint wants for an article"""
+        try:
+            response = self._request("GET", f"{self.base_url}/rss/articles/{article_id}")
+            signature, timestamp = SIGNATURE.search(response.text), TIMESTAMP.search(response.text)
+        except requests.exceptions.RequestException:
+            return None
+        if not (response.ok and signature and timestamp):
+            return None
+        return signature.group(1), timestamp.group(1)
+
+    def _decode_batch(self, signed: List[Tuple[str, str, str]]) -> Dict[str, str]:
+        """Decode many signed article IDs in one batchexecute request"""
+        rpcs = [
+            ["Fbv4je", json.dumps(["garturlreq", [["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1, None, None,
+                                                   None, None, None, 0, 1], "X", "X", 1, [1, 1, 1], 1, 1, None, 0, 0, None, 0],
+                                   article_id, int(timestamp), signature]), None, str(number)]
+            for number, (article_id, signature, timestamp) in enumerate(signed)
+        ]
+        try:
+            response = self._request("POST", f"{self.base_url}/_/DotsSplashUi/data/batchexecute",
+                                     data={"f.req": json.dumps([rpcs])},
+                                     headers={"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"})
+        except requests.exceptions.RequestException:
+            return {}
+        if not response.ok:
+            return {}
+
+        decoded = {}
+        for line in response.text.splitlines():
+            if not line.startswith("["):
+                continue
+            try:
+                envelopes = json.loads(line)
+            except ValueError:
+                continue
+            for envelope in envelopes:
+                if len(envelope) < 3 or envelope[:2] != ["wrb.fr", "Fbv4je"] or not envelope[2]:
+                    continue
+                try:
+                    payload: Any = json.loads(envelope[2])
+                    article_id = signed[int(envelope[-1])][0]
+                except (ValueError, IndexError, TypeError):
+                    continue
+                if payload[0] == "garturlres" and str(payload[1]).startswith("http"):
+                    decoded[article_id] = payload[1]
+        return decoded
+
+    def _follow_redirects(self, article_id: str) -> Optional[str]:
+        try:
+            response = self._request("GET", f"{self.base_url}/rss/articles/{article_id}", stream=True)
+            response.close()
+        except requests.exceptions.RequestException:
+            return None
+        host = urlparse(response.url).netloc.lower()
+        return response.url if response.ok and not host.endswith("google.com") and host != urlparse(self.base_url).netloc else None
+
+    def resolve_many(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Resolve many links at once.
+
+        Args:
+            urls: Any URLs; those not pointing at a Google News article are passed through
+
+        Returns:
+            dict: Publisher URL for every input URL, or the URL itself where it could not be resolved
+        """
+        ids = {url: google_news_id(url) for url in urls}
+        pending = list(dict.fromkeys(article_id for article_id in ids.values() if article_id))
+        resolved = self.cache.get_many(pending)
+        self._count('cached', len(resolved))
+        pending = [article_id for article_id in pending if article_id not in resolved]
+
+        decoded = {article_id: decode_legacy_id(article_id) for article_id in pending}
+        fresh = {article_id: url for article_id, url in decoded.items() if url}
+        self._count('decoded', len(fresh))
+        pending = [article_id for article_id in pending if article_id not in fresh]
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending)), thread_name_prefix="news-links") as executor:
+                signed = [(article_id, *signature)
+                          for article_id, signature in zip(pending, executor.map(self._signature, pending)) if signature]
+                batches = [signed[start:start + self.batch_size] for start in range(0, len(signed), self.batch_size)]
+                for batch in executor.map(self._decode_batch, batches):
+                    fresh.update(batch)
+                    self._count('resolved', len(batch))
+
+                pending = [article_id for article_id in pending if article_id not in fresh]
+                for article_id, url in zip(pending, executor.map(self._follow_redirects, pending)):
+                    if url:
+                        fresh[article_id] = url
+                        self._count('redirected')
+                    else:
+                        self._count('failed')
+
+        self.cache.put_many(fresh)
+        resolved.update(fresh)
+        return {url: resolved.get(article_id, url) if article_id else url for url, article_id in ids.items()}
+
+    def resolve_articles(self, articles: List[Dict[str, Any]], key: str = "link") -> List[Dict[str, Any]]:
+        """
+        Replace the links in RSS tool results with publisher URLs.
+
+        Links are canonicalized too, and articles whose link then matches one already listed are
+        dropped, keeping the first.
+        """
+        urls = self.resolve_many([article[key] for article in articles])
+        seen = set()
+        resolved = []
+        for article in articles:
+            url = canonicalize_url(urls[article[key]])
+            if url_key(url) in seen:
+                continue
+            seen.add(url_key(url))
+            resolved.append({**article, key: url})
+        return resolved
+
+
+_resolver: Optional[NewsLinkResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_news_link_resolver() -> NewsLinkResolver:
+    """Get the process-wide Google News link resolver"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = NewsLinkResolver()
+        return _resolver
@@ -0,0 +1,205 @@
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+from PIL import Image
+from io import BytesIO
+import json
+import os
+
+# Largest base64 payload sent to the vision model per image
+VISION_PAYLOAD_BUDGET = int(os.getenv('VISION_PAYLOAD_BUDGET', 64_000))
+# Formats tried, in order of preference when they reach the same quality
+VISION_PAYLOAD_FORMATS = [name.strip().upper() for name in os.getenv('VISION_PAYLOAD_FORMATS', 'WEBP,JPEG').split(',') if name.strip()]
+# Longest side sent, and the smallest the encoder may shrink to before giving up on quality instead
+MAX_SIDE = 768
+MIN_SIDE = 224
+# Images more elongated than this are letterboxed to it instead of being squeezed or cropped
+MAX_ASPECT = 2.5
+# Quality used while searching for the resolution, the best quality worth paying for, and the floor
+SEARCH_QUALITY = 60
+MAX_QUALITY = 85
+MIN_QUALITY = 30
+# Resolution search granularity in pixels of the longest side
+SIDE_STEP = 16
+
+MIME_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+def base64_size(size: int) -> int:
+    """Length of the base64 encoding of size bytes"""
+    return 4 * -(-size // 3)
+
+
+class EncodedPayload(BaseModel):
+    """Model for an image encoded to fit a vision payload budget"""
+    format: str
+    width: int
+    height: int
+    quality: int
+    bytes: int
+    budget: int
+    letterboxed: bool = False
+    encodes: int = 0
+    path: Optional[str] = None
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.format]
+
+    @property
+    def fits_budget(self) -> bool:
+        return base64_size(self.bytes) <= self.budget
+
+
+def letterbox(img: Image.Image, max_aspect: float = MAX_ASPECT) -> Tuple[Image.Image, bool]:
+    """Pad an overly elongated image with white bars up to max_aspect; other images are returned as they are"""
+    width, height = img.size
+    if width / height > max_aspect:
+        size = (width, round(width / max_aspect))
+    elif height / width > max_aspect:
+        size = (round(height / max_aspect), height)
+    else:
+        return img, False
+    canvas = Image.new("RGB", size, (255, 255, 255))
+    canvas.paste(img, ((size[0] - width) // 2, (size[1] - height) // 2))
+    return canvas, True
+
+
+class _Search:
+    """Encodes one image at candidate sizes and qualities, remembering every result"""
+
+    def __init__(self, img: Image.Image, budget: int, formats: List[str]):
+        self.img = img
+        self.budget = budget
+        self.formats = formats
+        self.encodes = 0
+        self._sizes = {}
+        self._results = {}
+
+    def size_for(self, side: int) -> Tuple[int, int]:
+        if side not in self._sizes:
+            scale = min(1.0, side / max(self.img.size))
+            self._sizes[side] = (max(1, round(self.img.width * scale)), max(1, round(self.img.height * scale)))
+        return self._sizes[side]
+
+    def encode(self, side: int, format: str, quality: int) -> bytes:
+        key = (side, format, quality)
+        if key not in self._results:
+            size = self.size_for(side)
+            resized = self.img if size == self.img.size else self.img.resize(size, Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, format=format, quality=quality)
+            self.encodes += 1
+            self._results[key] = buffer.getvalue()
+        return self._results[key]
+
+    def fits(self, side: int, format: str, quality: int) -> bool:
+        return base64_size(len(self.encode(side, format, quality))) <= self.budget
+
+    def best_quality(self, side: int, format: str, low: int, high: int) -> Optional[int]:
+        """Highest quality in [low, high] that fits the budget at this size, by binary search"""
+        if not self.fits(side, format, low):
+            return None
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.fits(side, format, middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def largest_side(self, low: int, high: int, quality: int) -> Optional[int]:
+        """Largest longest-side in [low, high] at which some format fits at this quality, by binary search"""
+        def any_fits(side: int) -> bool:
+            return any(self.fits(side, format, quality) for format in self.formats)
+
+        if not any_fits(low):
+            return None
+        while high - low > SIDE_STEP:
+            middle = (low + high) // 2
+            if any_fits(middle):
+                low = middle
+            else:
+                high = middle
+        return high if any_fits(high) else low
+
+
+def encode_payload(content: bytes, budget: int = VISION_PAYLOAD_BUDGET,
+                   formats: List[str] = VISION_PAYLOAD_FORMATS) -> Tuple[EncodedPayload, bytes]:
+    """
+    Encode an image for the vision model within a base64 byte budget; runs in an image worker process.
+
+    Keeps the aspect ratio, letterboxing only images more elongated than MAX_ASPECT. Images that
+    fit at MAX_SIDE and MAX_QUALITY are sent as they are. Otherwise the longest side is binary
+    searched for the largest size that fits at SEARCH_QUALITY, then quality is binary searched
+    at that size in each format, and the format reaching the higher quality wins. Only when even
+    MIN_SIDE does not fit does quality drop below SEARCH_QUALITY.
+
+    Returns:
+        tuple: (payload, data) - the chosen encoding and its bytes
+    """
+    img = Image.open(BytesIO(content))
+    img.draft("RGB", (MAX_SIDE, MAX_SIDE))
+    img = img.convert("RGB")
+    img, letterboxed = letterbox(img)
+    max_side = min(MAX_SIDE, max(img.size))
+    min_side = min(MIN_SIDE, max_side)
+    search = _Search(img, budget, formats)
+
+    def result(side: int, format: str, quality: int) -> Tuple[EncodedPayload, bytes]:
+        data = search.encode(side, format, quality)
+        width, height = search.size_for(side)
+        return EncodedPayload(format=format, width=width, height=height, quality=quality, bytes=len(data),
+                              budget=budget, letterboxed=letterboxed, encodes=search.encodes), data
+
+    # Common case: the image is small or simple enough to send at full size and quality
+    fitting = [format for format in formats if search.fits(max_side, format, MAX_QUALITY)]
+    if fitting:
+        return result(max_side, min(fitting, key=lambda format: len(search.encode(max_side, format, MAX_QUALITY))), MAX_QUALITY)
+
+    side = search.largest_side(min_side, max_side, SEARCH_QUALITY)
+    low, high = SEARCH_QUALITY, MAX_QUALITY
+    if side is None:
+        side, low, high = min_side, MIN_QUALITY, SEARCH_QUALITY
+    best = None
+    for format in formats:
+        quality = search.best_quality(side, format, low, high)
+        if quality is not None and (best is None or quality > best[1]):
+            best = (format, quality)
+    if best is None:
+        # Nothing fits; send the smallest encoding rather than nothing
+        format = min(formats, key=lambda format: len(search.encode(min_side, format, MIN_QUALITY)))
+        print(f"Warning: image does not fit the {budget} byte payload budget even at {min_side}px and quality {MIN_QUALITY}")
+        return result(min_side, format, MIN_QUALITY)
+    return result(side, *best)
+
+
+def payload_name(budget: int, formats: List[str]) -> str:
+    """Cache file stem for a budget and format list inside a source's rendition directory"""
+    return f"payload-{budget}-{'-'.join(format.lower() for format in formats)}"
+
+
+def load_cached_payload(source_dir: str, budget: int, formats: List[str]) -> Optional[EncodedPayload]:
+    """A payload encoded earlier for this source and budget, or None"""
+    metadata_path = os.path.join(source_dir, payload_name(budget, formats) + ".json")
+    try:
+        with open(metadata_path) as f:
+            payload = EncodedPayload(**json.load(f))
+    except (OSError, ValueError):
+        return None
+    return payload if payload.path and os.path.exists(payload.path) else None
+
+
+def encode_cached_payload(master_path: str, source_dir: str, budget: int = VISION_PAYLOAD_BUDGET,
+                          formats: List[str] = VISION_PAYLOAD_FORMATS) -> EncodedPayload:
+    """Encode a payload from a source's analysis master and store it next to it; runs in an image worker process"""
+    with open(master_path, 'rb') as f:
+        payload, data = encode_payload(f.read(), budget, formats)
+    stem = os.path.join(source_dir, payload_name(budget, formats))
+    payload.path = f"{stem}.{EXTENSIONS[payload.format]}"
+    for path, content in ((payload.path, data), (f"{stem}.json", payload.model_dump_json().encode())):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    return payload
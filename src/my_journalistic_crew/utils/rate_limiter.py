@@ -0,0 +1,53 @@
+from typing import Optional
+import random
+import threading
+import time
+import requests
+
+
+def backoff_delay(attempt: int, response: Optional[requests.Response] = None, base: float = 0.5) -> float:
+    """Exponential backoff with jitter, or the server's Retry-After when it sends one"""
+    retry_after = response.headers.get('retry-after', '') if response is not None else ''
+    if retry_after.isdigit():
+        return float(retry_after)
+    return base * (2 ** attempt) * (0.5 + random.random())
+
+
+class RateLimiter:
+    """
+    Token bucket shared by the threads calling one API.
+
+    Allows bursts of up to `burst` requests, then `per_minute` requests per minute. When the API
+    answers 429, pause() holds every caller back, not just the thread that was throttled.
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.interval:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                else:
+                    self._tokens = self.burst
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) * self.interval)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for a while, e.g. after the API reports too many requests"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
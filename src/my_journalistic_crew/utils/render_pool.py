@@ -0,0 +1,104 @@
+from my_journalistic_crew.utils.webdriver import WebDriverClient
+from my_journalistic_crew.utils.fetcher import FetchResult
+from my_journalistic_crew.utils.session_pool import WebDriverSessionPool
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import TimeoutException
+from typing import List, Optional
+import atexit
+import os
+import threading
+import time
+
+RENDER_POOL_SIZE = int(os.getenv('RENDER_POOL_SIZE', 2))
+RENDER_BUDGET = float(os.getenv('RENDER_BUDGET', 15))
+# Render browsers are recycled on their own schedule, independent of the x.com session pool's
+RENDER_POOL_IDLE_TIMEOUT = float(os.getenv('RENDER_POOL_IDLE_TIMEOUT', 300))
+RENDER_SESSION_MAX_AGE = float(os.getenv('RENDER_SESSION_MAX_AGE', 1800))
+
+# Heavy resources that never contribute text to a rendered page
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg", "*.wav",
+]
+
+
+class RenderPool:
+    """Small pool of warm headless browsers that render JavaScript-heavy pages"""
+
+    def __init__(self, size: int = RENDER_POOL_SIZE, budget: float = RENDER_BUDGET,
+                 idle_timeout: float = RENDER_POOL_IDLE_TIMEOUT, max_age: float = RENDER_SESSION_MAX_AGE):
+        self.size = size
+        self.budget = budget
+        self._sessions = WebDriverSessionPool(self._launch, max_size=size, idle_timeout=idle_timeout, max_age=max_age)
+
+    def _launch(self, key) -> WebDriverClient:
+        """Start a browser tuned for fast text rendering"""
+        client = WebDriverClient(headless=True, device_type="desktop", page_load_strategy="eager", debugging_port=0)
+        client.block_resources(BLOCKED_RESOURCE_PATTERNS)
+        return client
+
+    def _wait_for_content(self, driver, deadline: float) -> None:
+        """Wait until the page's visible text stops growing or the budget runs out"""
+        last_length = -1
+        while time.time() < deadline:
+            length = driver.execute_script("return document.body ? document.body.innerText.length : 0")
+            if length == last_length and length > 200:
+                return
+            last_length = length
+            time.sleep(0.25)
+
+    def render(self, url: str, budget: Optional[float] = None) -> FetchResult:
+        """Render a single URL and return its final HTML"""
+        start = time.time()
+        budget = budget or self.budget
+        try:
+            session = self._sessions.checkout("render")
+        except Exception as e:
+            return FetchResult(url=url, error=f"Could not start browser: {e}", elapsed=time.time() - start)
+
+        healthy = True
+        try:
+            driver = session.driver
+            driver.set_page_load_timeout(budget)
+            try:
+                driver.get(url)
+            except TimeoutException:
+                # Keep whatever has rendered so far rather than losing the page
+                driver.execute_script("window.stop();")
+            self._wait_for_content(driver, start + budget)
+            html = driver.page_source
+            # Leave the browser on a blank page so the next render starts clean
+            driver.get("about:blank")
+            return FetchResult(url=url, status_code=200, headers={"content-type": "text/html; charset=utf-8"},
+                               content=html.encode("utf-8"), elapsed=time.time() - start)
+        except Exception as e:
+            healthy = False
+            return FetchResult(url=url, error=str(e), elapsed=time.time() - start)
+        finally:
+            self._sessions.checkin(session, healthy)
+
+    def render_all(self, urls: List[str], budget: Optional[float] = None) -> List[FetchResult]:
+        """Render many URLs concurrently across the pool, keeping the input order"""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.size, len(urls)), thread_name_prefix="render") as executor:
+            return list(executor.map(lambda url: self.render(url, budget), urls))
+
+    def close(self) -> None:
+        """Shut down every idle browser"""
+        self._sessions.close()
+
+
+_render_pool: Optional[RenderPool] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """Get the process-wide render pool; browsers are launched lazily and closed at exit"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = RenderPool()
+            atexit.register(_render_pool.close)
+        return _render_pool
@@ -0,0 +1,149 @@
+from typing import Dict, List, Literal, Tuple
+from pydantic import BaseModel
+from PIL import Image
+from io import BytesIO
+import os
+import time
+
+# Shrink cheaply (JPEG DCT scaling, box reduce) only while the image stays this many times the target,
+# so the final LANCZOS resample still has enough pixels to work with
+REDUCING_GAP = 2.0
+
+
+class RenditionSpec(BaseModel):
+    """Model for one output produced from a decoded source image"""
+    name: str
+    width: int
+    height: int
+    format: Literal["WEBP", "JPEG"] = "WEBP"
+    quality: int = 90
+    fit: Literal["stretch", "cover", "contain"] = "stretch"
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def filename(self) -> str:
+        """File name inside a source's rendition directory; changing the spec changes the name"""
+        extension = "webp" if self.format == "WEBP" else "jpg"
+        return f"{self.name}-{self.width}x{self.height}-q{self.quality}-{self.fit}.{extension}"
+
+
+# 800x600 article image, as DownloadImageTool has always produced
+ARTICLE = RenditionSpec(name="article", width=800, height=600)
+# 300x168 thumbnail, as DownloadThumbnailTool has always produced
+THUMBNAIL = RenditionSpec(name="thumbnail", width=300, height=168)
+# Near-lossless master, aspect ratio kept, from which ImageAnalysisTool encodes its vision payload
+ANALYSIS = RenditionSpec(name="analysis", width=1024, height=1024, format="JPEG", quality=95, fit="contain")
+
+# Renditions made whenever a source is decoded, so the other image tools never fetch or decode it again
+IMAGE_TASK_RENDITIONS = [ARTICLE, THUMBNAIL, ANALYSIS]
+
+
+class RenditionOutput(BaseModel):
+    """Model for a rendition written to disk"""
+    name: str
+    path: str
+    width: int
+    height: int
+    bytes: int
+
+
+def load_for_size(content: bytes, size: Tuple[int, int]) -> Image.Image:
+    """
+    Decode an image at the smallest scale that still leaves REDUCING_GAP headroom over size.
+
+    JPEGs are decoded directly at 1/2, 1/4 or 1/8 scale with draft(); other formats are
+    decoded in full and then shrunk by an integer factor with reduce().
+    """
+    img = Image.open(BytesIO(content))
+    target = (int(size[0] * REDUCING_GAP), int(size[1] * REDUCING_GAP))
+    if img.format == "JPEG":
+        img.draft("RGB", target)
+    img.load()
+
+    factor = min(img.width // target[0], img.height // target[1])
+    if factor >= 2:
+        img = img.reduce(factor)
+
+    # Renditions are stored as RGB(A) only; palette, CMYK and 16-bit images need converting
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = img.mode in ("LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    return img
+
+
+def _cover(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """Scale to fill size and crop the centre; images too small to fill are centred on white"""
+    width, height = img.size
+    if width > height:
+        new_height = size[1]
+        new_width = int(width * (new_height / height))
+    else:
+        new_width = size[0]
+        new_height = int(height * (new_width / width))
+    resized = img.resize((new_width, new_height), Image.LANCZOS)
+
+    if new_width < size[0] or new_height < size[1]:
+        canvas = Image.new(resized.mode, size, (255, 255, 255) if resized.mode == "RGB" else (255, 255, 255, 255))
+        canvas.paste(resized, (max(0, (size[0] - new_width) // 2), max(0, (size[1] - new_height) // 2)))
+        return canvas
+    left = (new_width - size[0]) // 2
+    top = (new_height - size[1]) // 2
+    return resized.crop((left, top, left + size[0], top + size[1]))
+
+
+def _contain(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """Scale down to fit inside size, keeping the aspect ratio; smaller images are left as they are"""
+    scale = min(size[0] / img.width, size[1] / img.height)
+    if scale >= 1:
+        return img
+    return img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.LANCZOS)
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """Composite transparency onto white, for formats without an alpha channel"""
+    if img.mode != "RGBA":
+        return img
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    background.paste(img, mask=img.split()[3])
+    return background
+
+
+def render_renditions(content: bytes, specs: List[RenditionSpec], output_dir: str) -> Tuple[List[RenditionOutput], Dict[str, float]]:
+    """
+    Decode a source image once and write every requested rendition from that one bitmap.
+
+    Runs in an image worker process.
+
+    Returns:
+        tuple: (outputs, timings) - the written renditions and seconds spent per stage
+    """
+    timings = {}
+    start = time.perf_counter()
+    # Decode once at a scale big enough for the largest rendition
+    img = load_for_size(content, (max(spec.width for spec in specs), max(spec.height for spec in specs)))
+    timings['decode'] = time.perf_counter() - start
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for spec in specs:
+        start = time.perf_counter()
+        if spec.fit == "cover":
+            rendition = _cover(img, spec.size)
+        elif spec.fit == "contain":
+            rendition = _contain(img, spec.size)
+        else:
+            rendition = img.resize(spec.size, Image.LANCZOS)
+        if spec.format == "JPEG":
+            rendition = _flatten(rendition)
+
+        path = os.path.join(output_dir, spec.filename)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        rendition.save(tmp_path, format=spec.format, quality=spec.quality)
+        os.replace(tmp_path, path)
+        outputs.append(RenditionOutput(name=spec.name, path=path, width=rendition.width, height=rendition.height,
+                                       bytes=os.path.getsize(path)))
+        timings[spec.name] = time.perf_counter() - start
+    return outputs, timings
@@ -1,94 +1,176 @@
 from my_journalistic_crew.utils.webdriver import WebDriverClient
+from typing import Callable, Dict, List, Optional
+import os
 import time
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 
-def scroll_to_load_tweets(driver: WebDriverClient, scroll_count: int, scroll_delay: float, extract_tweets_func=None, max_tweets: int = None, timeout: int = 300):
+# Shortest wait after a scroll, so a burst of rendering has time to finish
+SCROLL_MIN_WAIT = float(os.getenv('SCROLL_MIN_WAIT', 0.5))
+# Quiet period without new tweets after which a batch counts as fully rendered
+SCROLL_SETTLE = float(os.getenv('SCROLL_SETTLE', 0.3))
+# Scrolls in a row without a single new tweet before giving up
+SCROLL_PLATEAU = int(os.getenv('SCROLL_PLATEAU', 3))
+
+# Counts tweet articles added to the page; installed once per document
+INSTALL_TWEET_SIGNAL_JS = """
+if (!window.__tweetSignal) {
+    const signal = {added: 0, lastChange: Date.now()};
+    const isTweet = node => node.nodeType === 1 &&
+        (node.matches('[data-testid="tweet"]') || node.querySelector('[data-testid="tweet"]'));
+    new MutationObserver(records => {
+        for (const record of records) {
+            for (const node of record.addedNodes) {
+                if (isTweet(node)) {
+                    signal.added += 1;
+                    signal.lastChange = Date.now();
+                }
+            }
+        }
+    }).observe(document.body, {childList: true, subtree: true});
+    window.__tweetSignal = signal;
+}
+return window.__tweetSignal.added;
+"""
+
+# Scrolls, then resolves once new tweets have arrived and settled, or after the maximum wait
+SCROLL_AND_WAIT_JS = """
+const [distance, baseline, minWait, maxWait, settle, done] = arguments;
+const signal = window.__tweetSignal;
+const start = Date.now();
+window.scrollBy(0, distance);
+const check = () => {
+    const now = Date.now();
+    const grew = signal.added > baseline;
+    if (now - start >= maxWait || (now - start >= minWait && grew && now - signal.lastChange >= settle)) {
+        done(signal.added);
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+
+def _click_show_more(driver) -> bool:
+    try:
+        show_more = driver.find_elements(By.XPATH, "//span[contains(text(), 'Show more')]")
+        if show_more:
+            show_more[0].click()
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def scroll_to_load_tweets(driver: WebDriverClient, scroll_count: int, scroll_delay: float, extract_tweets_func=None,
+                          max_tweets: int = None, timeout: int = 300, min_wait: float = SCROLL_MIN_WAIT,
+                          plateau: int = SCROLL_PLATEAU, scroll_stats: Optional[List[Dict[str, float]]] = None,
+                          stop_condition: Optional[Callable[[], bool]] = None):
     """
     Scroll down the page to load more tweets, extracting tweets during scrolling.
-    
+
+    Instead of sleeping a fixed delay, each scroll waits on a MutationObserver installed in the
+    page: it moves on as soon as new tweets have rendered and settled (but not before min_wait),
+    and never waits longer than scroll_delay. Scrolling stops early once `plateau` scrolls in a
+    row produce no new tweets.
+
     Args:
         driver: Selenium WebDriver instance
         scroll_count: Number of times to scroll; each scroll fetches roughly 10 tweets
-        scroll_delay: Delay between scrolls
-        extract_tweets_func: Function to extract tweets from the page
+        scroll_delay: Maximum wait for new tweets after each scroll
+        extract_tweets_func: Function called with the set of processed IDs that reads the tweets
+            currently on the page and returns (new_tweets, new_processed_ids)
         max_tweets: Maximum number of tweets to collect
         timeout: Maximum time to spend scrolling
-        
+        min_wait: Minimum wait after each scroll
+        plateau: Consecutive scrolls without new tweets before stopping
+        scroll_stats: Optional list that receives one timing record per scroll
+        stop_condition: Optional check run after each extraction; scrolling ends once it returns True
+
     Returns:
         tuple: (bool, list) - Success status and collected tweets
     """
     start_time = time.time()
     tweets_collected = []
     processed_ids = set()
-    last_height = 0
-    consecutive_no_change = 0
-    
-    for i in range(scroll_count):
+    consecutive_empty = 0
+    scroll_stats = scroll_stats if scroll_stats is not None else []
+
+    added = driver.execute_script(INSTALL_TWEET_SIGNAL_JS)
+    # The async wait must be allowed to run for the whole maximum wait
+    driver.set_script_timeout(scroll_delay + 10)
+
+    for i in range(scroll_count + 1):
         # Check timeout
         if time.time() - start_time > timeout:
             return False, tweets_collected
-            
-        # Check if we've reached max tweets
-        if max_tweets and len(tweets_collected) >= max_tweets:
-            return True, tweets_collected
 
-        # Extract tweets after this scroll if extract function provided
+        # Extract tweets already on the page (i == 0) or loaded by the last scroll
+        new_ids = 0
+        extract_seconds = 0.0
         if extract_tweets_func:
-            tweet_elements = driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
-            print(f"Found {len(tweet_elements)} tweet elements on scroll {i+1}")
-            
-            # Call the extract function with the tweet elements
-            new_tweets, new_processed_ids = extract_tweets_func(tweet_elements, processed_ids)
+            extract_start = time.time()
+            new_tweets, new_processed_ids = extract_tweets_func(processed_ids)
+            extract_seconds = time.time() - extract_start
             tweets_collected.extend(new_tweets)
             processed_ids.update(new_processed_ids)
-            
-            print(f"Collected {len(new_tweets)} new tweets on scroll {i+1}, total: {len(tweets_collected)}")
-            
+            new_ids = len(new_processed_ids)
+
+            print(f"Collected {len(new_tweets)} new tweets on scroll {i}, total: {len(tweets_collected)}")
+
             # Check if we've reached the maximum
             if max_tweets and len(tweets_collected) >= max_tweets:
                 return True, tweets_collected
 
-        # Get current scroll height
-        current_height = driver.execute_script("return document.body.scrollHeight")
-        
-        # If height hasn't changed, try more aggressive scrolling
-        if current_height == last_height:
-            consecutive_no_change += 1
-            if consecutive_no_change >= 2:
-                # Try scrolling more aggressively
-                driver.execute_script("window.scrollBy(0, 2000);")
-                time.sleep(scroll_delay)
-                
-                # Try clicking "Show more" if available
-                try:
-                    show_more = driver.find_elements(By.XPATH, "//span[contains(text(), 'Show more')]")
-                    if show_more:
-                        show_more[0].click()
-                        time.sleep(2)
-                except:
-                    pass
-        else:
-            consecutive_no_change = 0
-        
-        # Remember the height for next comparison
-        last_height = current_height
-        
-        # Scroll down - use a larger scroll distance to ensure new tweets load
-        scroll_distance = min(1500, current_height // 3)  # Scroll by 1/3 of page or 1500px max
-        driver.execute_script(f"window.scrollBy(0, {scroll_distance});")
-        
-        # Wait between scrolls
-        time.sleep(scroll_delay + 0.5)
-        
-        # Wait for new content to load after scrolling
+        if stop_condition and stop_condition():
+            return True, tweets_collected
+
+        if i > 0:
+            scroll_stats[-1].update(extract=round(extract_seconds, 3), new_tweets=new_ids)
+            # Stop once the yield of new tweets has plateaued
+            produced = new_ids if extract_tweets_func else scroll_stats[-1]['dom_added']
+            consecutive_empty = consecutive_empty + 1 if produced == 0 else 0
+            if consecutive_empty >= plateau:
+                print(f"No new tweets for {consecutive_empty} scrolls, stopping")
+                return True, tweets_collected
+        if i == scroll_count:
+            break
+
+        # After a scroll that loaded nothing, jump further and try the "Show more" button
+        distance = 2000 if consecutive_empty else 1500
+        if consecutive_empty:
+            _click_show_more(driver)
+
+        scroll_start = time.time()
         try:
-            WebDriverWait(driver, 5).until(
-                lambda d: d.execute_script("return document.body.scrollHeight") > current_height
-            )
-        except:
-            # If no new content loaded, try again with a different approach
-            driver.execute_script("window.scrollBy(0, 2000);")
-            time.sleep(scroll_delay)
-    
-    return True, tweets_collected 
\ No newline at end of file
+            now_added = driver.execute_async_script(SCROLL_AND_WAIT_JS, distance, added, min_wait * 1000,
+                                                    scroll_delay * 1000, SCROLL_SETTLE * 1000)
+        except Exception as e:
+            # The page navigated or the signal was lost; reinstall it and carry on
+            print(f"Error waiting for new tweets: {str(e)}")
+            added = now_added = driver.execute_script(INSTALL_TWEET_SIGNAL_JS)
+        scroll_stats.append({
+            'scroll': i + 1,
+            'wait': round(time.time() - scroll_start, 3),
+            'dom_added': now_added - added,
+            'timed_out': now_added == added,
+        })
+        added = now_added
+
+    return True, tweets_collected
+
+
+def summarize_scroll_stats(scroll_stats: List[Dict[str, float]]) -> Dict[str, float]:
+    """Totals over the per-scroll records filled in by scroll_to_load_tweets"""
+    if not scroll_stats:
+        return {'scrolls': 0}
+    waits = [stat['wait'] for stat in scroll_stats]
+    return {
+        'scrolls': len(scroll_stats),
+        'total_wait': round(sum(waits), 2),
+        'average_wait': round(sum(waits) / len(waits), 2),
+        'max_wait': max(waits),
+        'timed_out': sum(1 for stat in scroll_stats if stat['timed_out']),
+        'extract': round(sum(stat.get('extract', 0.0) for stat in scroll_stats), 2),
+        'new_tweets': sum(stat.get('new_tweets', 0) for stat in scroll_stats),
+    }
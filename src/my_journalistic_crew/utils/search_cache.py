@@ -0,0 +1,214 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+from pydantic import BaseModel
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+SEARCH_CACHE_PATH = os.getenv('SEARCH_CACHE_PATH', os.path.join('.cache', 'search.sqlite3'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 5000))
+SEARCH_CACHE_DISABLED = os.getenv('SEARCH_CACHE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+# Seconds a result stays fresh, by search type: news moves by the minute, papers and patents hardly at all
+SEARCH_TTLS = {
+    'news': 15 * 60,
+    'search': 24 * 3600,
+    'images': 24 * 3600,
+    'videos': 6 * 3600,
+    'places': 7 * 24 * 3600,
+    'maps': 7 * 24 * 3600,
+    'reviews': 24 * 3600,
+    'shopping': 6 * 3600,
+    'scholar': 30 * 24 * 3600,
+    'patent': 30 * 24 * 3600,
+    'autocomplete': 7 * 24 * 3600,
+}
+# Overrides as "news=600,search=43200"
+for _item in os.getenv('SEARCH_CACHE_TTLS', '').split(','):
+    _name, _, _seconds = _item.partition('=')
+    if _seconds.strip().isdigit():
+        SEARCH_TTLS[_name.strip()] = int(_seconds)
+DEFAULT_TTL = 6 * 3600
+# After going stale a result is still served, and refreshed in the background, for this many TTLs more
+STALE_WHILE_REVALIDATE = float(os.getenv('SEARCH_CACHE_STALE_FACTOR', 3))
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, Unicode forms and whitespace so trivially different spellings share a cache entry"""
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+def search_cache_key(provider: str, query: str, params: Dict[str, Any]) -> str:
+    """Cache key for a query and every parameter that changes its results"""
+    material = json.dumps([provider, normalize_query(query), {name: params[name] for name in sorted(params)}])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class CachedSearch(BaseModel):
+    """Model for a cached search result and whether it may be served"""
+    value: Any
+    credits: int = 1
+    stale: bool = False
+
+
+class SearchCache:
+    """
+    SQLite cache of raw search results, shared by the Serper and Google Custom Search tools.
+
+    Entries are fresh for their search type's TTL. For STALE_WHILE_REVALIDATE TTLs after that
+    they are still served at once while a background refresh fetches the new result; later
+    they count as misses. The least recently used entries are evicted beyond max_entries.
+    Counters report the hit rate and the search credits saved.
+    """
+
+    def __init__(self, path: str = SEARCH_CACHE_PATH, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                search_type TEXT NOT NULL,
+                value TEXT NOT NULL,
+                credits INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS searches_accessed_at ON searches(accessed_at)")
+        self._db.commit()
+
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+        self._refreshing: Set[str] = set()
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0, 'credits_saved': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def lookup(self, key: str) -> Optional[CachedSearch]:
+        """
+        Get a servable result, counting the hit or miss.
+
+        Returns:
+            CachedSearch: The result, marked stale when it should be refreshed; None if it must be fetched
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, credits, fresh_until, stale_until FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now >= row[3]:
+                self.counters['misses'] += 1
+                return None
+            self._db.execute("UPDATE searches SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            stale = now >= row[2]
+            self.counters['stale_hits' if stale else 'hits'] += 1
+            self.counters['credits_saved'] += row[1]
+        return CachedSearch(value=json.loads(row[0]), credits=row[1], stale=stale)
+
+    def store(self, key: str, search_type: str, value: Any, credits: int = 1) -> None:
+        """Record a successful result, evicting the least recently used entries over the bound"""
+        now = time.time()
+        ttl = SEARCH_TTLS.get(search_type, DEFAULT_TTL)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO searches (key, search_type, value, credits, stored_at, fresh_until, stale_until, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, search_type, json.dumps(value), credits, now, now + ttl, now + ttl * (1 + STALE_WHILE_REVALIDATE), now)
+            )
+            excess = self._db.execute("SELECT COUNT(*) FROM searches").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM searches WHERE key IN (SELECT key FROM searches ORDER BY accessed_at LIMIT ?)", (excess,)
+                )
+                self.counters['evictions'] += excess
+
+    def refresh_in_background(self, keys: List[str], refresh: Callable[[List[str]], Any]) -> None:
+        """
+        Refresh stale entries on a background thread.
+
+        refresh() is called once with those of the keys not already being refreshed, and is
+        expected to store their new results.
+        """
+        with self._lock:
+            claimed = [key for key in dict.fromkeys(keys) if key not in self._refreshing]
+            self._refreshing.update(claimed)
+        if not claimed:
+            return
+
+        def run():
+            try:
+                refresh(claimed)
+                self._count('refreshes', len(claimed))
+            except Exception as e:
+                print(f"Background search refresh failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(claimed)
+
+        self._refresher.submit(run)
+
+    def get_or_fetch(self, key: str, search_type: str, fetch: Callable[[], Optional[Any]],
+                     credits: Callable[[Any], int] = lambda value: 1) -> Optional[Any]:
+        """
+        Serve a cached result or fetch and store it.
+
+        Args:
+            key: Key from search_cache_key()
+            search_type: Decides the TTL
+            fetch: Runs the search; returns None for failures, which are not cached
+            credits: Credits a result cost, counted as saved whenever it is served from cache
+
+        Returns:
+            The cached or freshly fetched result, or None if the fetch failed
+        """
+        def fetch_and_store():
+            value = fetch()
+            if value is not None:
+                self.store(key, search_type, value, credits(value))
+            return value
+
+        cached = self.lookup(key)
+        if cached is None:
+            return fetch_and_store()
+        if cached.stale:
+            self.refresh_in_background([key], lambda keys: fetch_and_store())
+        return cached.value
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process, plus the hit rate and number of stored entries"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        counters['hit_rate'] = round((counters['hits'] + counters['stale_hits']) / lookups, 3) if lookups else 0.0
+        counters['entries'] = entries
+        return counters
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the process-wide search cache, or None when SEARCH_CACHE_DISABLED is set"""
+    global _search_cache
+    if SEARCH_CACHE_DISABLED:
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
@@ -0,0 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, Field, ValidationError
+from requests.adapters import HTTPAdapter
+from my_journalistic_crew.models.outputs import SerperWebSearchResults, GoogleImageResults, SerperGoogleNewsResults
+from my_journalistic_crew.utils.rate_limiter import backoff_delay
+from my_journalistic_crew.utils.search_cache import SearchCache, get_search_cache, search_cache_key
+import os
+import threading
+import time
+import requests
+
+SERPER_API_URL = os.getenv('SERPER_API_URL', 'https://google.serper.dev').rstrip('/')
+# Serper accepts up to 100 queries in one request body
+SERPER_BATCH_SIZE = int(os.getenv('SERPER_BATCH_SIZE', 100))
+SERPER_CONCURRENCY = int(os.getenv('SERPER_CONCURRENCY', 4))
+SERPER_TIMEOUT = float(os.getenv('SERPER_TIMEOUT', 30))
+SERPER_RETRIES = int(os.getenv('SERPER_RETRIES', 3))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+SearchType = Literal["search", "images", "videos", "places", "maps", "reviews", "news", "shopping", "scholar", "patent", "autocomplete"]
+# Endpoint per search type, where it differs from the type's name
+ENDPOINTS = {"patent": "patents"}
+
+SerperResult = Union[SerperWebSearchResults, GoogleImageResults, SerperGoogleNewsResults]
+
+
+class SerperQuery(BaseModel):
+    """One search in a Serper batch."""
+    query: str = Field(..., description="The search query.")
+    search_type: SearchType = Field(default="search", description="The type of search to perform.")
+    country: str = Field(default="", description="The country code for the search (e.g., 'us' for United States).")
+    location: str = Field(default="", description="The location for the search.")
+    language: str = Field(default="en", description="The language for the search (e.g., 'en' for English).")
+    results_num: int = Field(default=10, description="The number of results to return.")
+    page: int = Field(default=1, description="The page number of the results.")
+    tbs: str = Field(default="", description="Time-based search parameter (e.g., 'qdr:d' for the past day).")
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "q": self.query,
+            "gl": self.country,
+            "hl": self.language,
+            "num": self.results_num,
+            "page": self.page,
+            "type": self.search_type,
+            "location": self.location,
+            "tbs": self.tbs
+        }
+
+    def cache_key(self) -> str:
+        params = self.payload()
+        return search_cache_key("serper", params.pop("q"), params)
+
+
+class SerperError(Exception):
+    """Raised when Serper rejects a request or keeps failing after every retry"""
+
+
+def parse_result(search_type: str, search_results: Dict[str, Any]) -> SerperResult:
+    """Validate one query's raw result into the output model for its search type"""
+    if search_type == "images":
+        return GoogleImageResults(**search_results)
+    elif search_type == "news":
+        return SerperGoogleNewsResults(**search_results)
+    else:
+        return SerperWebSearchResults(**search_results)
+
+
+class SerperClient:
+    """
+    Runs Serper searches over one pooled keep-alive session, many queries per request.
+
+    Queries are grouped by endpoint and sent up to SERPER_BATCH_SIZE per request body; the
+    requests for a batch run concurrently and every answer is mapped back to its query.
+    With a cache, queries it can answer are not sent at all and stale answers are refreshed
+    in the background.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, api_url: str = SERPER_API_URL,
+                 batch_size: int = SERPER_BATCH_SIZE, concurrency: int = SERPER_CONCURRENCY,
+                 timeout: float = SERPER_TIMEOUT, retries: int = SERPER_RETRIES,
+                 cache: Optional[SearchCache] = None):
+        self.api_key = api_key if api_key is not None else os.getenv("SERPER_API_KEY")
+        self.api_url = api_url.rstrip('/')
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'queries': 0, 'requests': 0, 'retries': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _post(self, endpoint: str, payload: Any) -> Any:
+        """POST to one Serper endpoint, retrying 429, 5xx and connection failures with backoff"""
+        headers = {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json"
+        }
+        url = f"{self.api_url}/{endpoint}"
+        for attempt in range(self.retries + 1):
+            response = None
+            self._count('requests')
+            try:
+                response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+                if response.ok:
+                    return response.json()
+                error = SerperError(f"{response.status_code} {response.reason} for {url}: {response.text[:200]}")
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = SerperError(str(e))
+            if attempt < self.retries:
+                self._count('retries')
+                time.sleep(backoff_delay(attempt, response))
+        raise error
+
+    def _search_group(self, endpoint: str, queries: List[Tuple[int, SerperQuery]]) -> List[Tuple[int, Optional[SerperResult], Optional[str]]]:
+        """Send one request body holding several queries and map each answer back by position"""
+        try:
+            answers = self._post(endpoint, [query.payload() for _, query in queries])
+            if isinstance(answers, dict):
+                answers = [answers]
+            if len(answers) != len(queries):
+                raise SerperError(f"Serper returned {len(answers)} results for {len(queries)} queries")
+        except Exception as e:
+            return [(index, None, str(e)) for index, _ in queries]
+
+        results = []
+        for (index, query), answer in zip(queries, answers):
+            try:
+                results.append((index, parse_result(query.search_type, answer), None))
+            except ValidationError as e:
+                results.append((index, None, f"Unexpected result for '{query.query}': {str(e)}"))
+                continue
+            if self.cache:
+                self.cache.store(query.cache_key(), query.search_type, answer, int(answer.get("credits", 1)))
+        return results
+
+    def _send(self, queries: List[Tuple[int, SerperQuery]]) -> List[Tuple[int, Optional[SerperResult], Optional[str]]]:
+        """Group queries by endpoint and send the groups concurrently, SERPER_BATCH_SIZE queries per request"""
+        groups: Dict[str, List[Tuple[int, SerperQuery]]] = {}
+        for index, query in queries:
+            groups.setdefault(ENDPOINTS.get(query.search_type, query.search_type), []).append((index, query))
+        requests_to_send = [
+            (endpoint, group[start:start + self.batch_size])
+            for endpoint, group in groups.items()
+            for start in range(0, len(group), self.batch_size)
+        ]
+        if not requests_to_send:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(requests_to_send)), thread_name_prefix="serper") as executor:
+            return [result for group_results in executor.map(lambda request: self._search_group(*request), requests_to_send)
+                    for result in group_results]
+
+    def search_many(self, queries: List[SerperQuery]) -> List[Tuple[Optional[SerperResult], Optional[str]]]:
+        """
+        Run many searches of any types in as few requests as possible.
+
+        Args:
+            queries: Searches to run
+
+        Returns:
+            list: One (result, error) pair per query, in input order; exactly one of the two is set
+        """
+        if not self.api_key:
+            raise ValueError("Serper API key not found in environment variables.")
+        self._count('queries', len(queries))
+
+        results: List[Tuple[Optional[SerperResult], Optional[str]]] = [(None, "Not searched")] * len(queries)
+        pending: List[Tuple[int, SerperQuery]] = []
+        stale: Dict[str, SerperQuery] = {}
+        for index, query in enumerate(queries):
+            cached = self.cache.lookup(query.cache_key()) if self.cache else None
+            if cached is None:
+                pending.append((index, query))
+                continue
+            results[index] = (parse_result(query.search_type, cached.value), None)
+            if cached.stale:
+                stale[query.cache_key()] = query
+
+        for index, result, error in self._send(pending):
+            results[index] = (result, error)
+        if stale:
+            self.cache.refresh_in_background(list(stale), lambda keys: self._send([(0, stale[key]) for key in keys]))
+        return results
+
+    def search(self, query: SerperQuery) -> SerperResult:
+        """Run a single search, raising SerperError if it fails"""
+        result, error = self.search_many([query])[0]
+        if error:
+            raise SerperError(error)
+        return result
+
+
+_serper_client: Optional[SerperClient] = None
+_serper_client_lock = threading.Lock()
+
+
+def get_serper_client() -> SerperClient:
+    """Get the process-wide Serper client"""
+    global _serper_client
+    with _serper_client_lock:
+        if _serper_client is None:
+            _serper_client = SerperClient(cache=get_search_cache())
+        return _serper_client
@@ -0,0 +1,258 @@
+from my_journalistic_crew.utils.webdriver import WebDriverClient
+from my_journalistic_crew.utils.pagenav import PageNavigator
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+import atexit
+import json
+import os
+import threading
+import time
+
+X_POOL_SIZE = int(os.getenv('X_POOL_SIZE', 2))
+X_POOL_IDLE_TIMEOUT = float(os.getenv('X_POOL_IDLE_TIMEOUT', 300))
+X_SESSION_MAX_AGE = float(os.getenv('X_SESSION_MAX_AGE', 1800))
+X_AUTH_FILE = os.getenv('X_AUTH_FILE', 'auth.json')
+
+
+class PooledSession:
+    """A browser session owned by a pool, with the bookkeeping needed to recycle it"""
+
+    def __init__(self, key: Hashable, client: WebDriverClient, launch_seconds: float):
+        self.key = key
+        self.client = client
+        self.launch_seconds = launch_seconds
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.uses = 0
+
+    @property
+    def driver(self):
+        return self.client.get_driver()
+
+
+class WebDriverSessionPool:
+    """
+    Pool of long-lived browser sessions with checkout/checkin.
+
+    Sessions are keyed (e.g. by headless/device type) so a caller only ever gets a browser
+    launched with the options it asked for. Idle sessions are health-checked before reuse,
+    recycled after max_age seconds and closed after idle_timeout seconds without use.
+    """
+
+    def __init__(self, factory: Callable[[Hashable], WebDriverClient], max_size: int = X_POOL_SIZE,
+                 idle_timeout: float = X_POOL_IDLE_TIMEOUT, max_age: float = X_SESSION_MAX_AGE):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+
+        self._idle: List[PooledSession] = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.launches = 0
+        self.reuses = 0
+        self.recycled = 0
+        self.launch_seconds = 0.0
+
+    def _expired(self, session: PooledSession, now: float) -> bool:
+        return now - session.created_at > self.max_age or now - session.last_used > self.idle_timeout
+
+    def _healthy(self, session: PooledSession) -> bool:
+        """Cheap liveness probe: one script round-trip to the browser"""
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, session: PooledSession) -> None:
+        self.recycled += 1
+        try:
+            session.client.close()
+        except Exception:
+            pass
+
+    def _launch(self, key: Hashable) -> PooledSession:
+        start = time.time()
+        client = self.factory(key)
+        session = PooledSession(key, client, time.time() - start)
+        with self._cond:
+            self.launches += 1
+            self.launch_seconds += session.launch_seconds
+        return session
+
+    def checkout(self, key: Hashable, timeout: Optional[float] = None) -> PooledSession:
+        """Get a ready session for key, reusing an idle one when possible"""
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            stale = []
+            with self._cond:
+                now = time.time()
+                session = None
+                for candidate in list(self._idle):
+                    if self._expired(candidate, now):
+                        self._idle.remove(candidate)
+                        stale.append(candidate)
+                    elif session is None and candidate.key == key:
+                        self._idle.remove(candidate)
+                        session = candidate
+                launch = False
+                if session is None:
+                    # Make room by closing an idle browser launched with other options
+                    if self._in_use + len(self._idle) >= self.max_size and self._idle:
+                        stale.append(self._idle.pop(0))
+                    if self._in_use + len(self._idle) < self.max_size:
+                        launch = True
+                if session is not None or launch:
+                    self._in_use += 1
+                elif not stale:
+                    remaining = deadline - time.time() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No browser session became available")
+                    self._cond.wait(remaining)
+                    continue
+
+            for old in stale:
+                self._discard(old)
+
+            if session is not None:
+                if self._healthy(session):
+                    with self._cond:
+                        self.reuses += 1
+                    session.uses += 1
+                    return session
+                self._discard(session)
+                launch = True
+            if launch:
+                try:
+                    session = self._launch(key)
+                except Exception:
+                    with self._cond:
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+                session.uses += 1
+                self._start_reaper()
+                return session
+
+    def checkin(self, session: PooledSession, healthy: bool = True) -> None:
+        """Return a session; unhealthy or expired sessions are closed instead of pooled"""
+        session.last_used = time.time()
+        keep = healthy and not self._closed and not self._expired(session, session.last_used)
+        with self._cond:
+            self._in_use -= 1
+            if keep:
+                self._idle.append(session)
+            self._cond.notify()
+        if not keep:
+            self._discard(session)
+
+    @contextmanager
+    def session(self, key: Hashable) -> Iterator[PooledSession]:
+        """Check a session out for the duration of a with-block"""
+        session = self.checkout(key)
+        healthy = True
+        try:
+            yield session
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.checkin(session, healthy)
+
+    def _start_reaper(self) -> None:
+        """Start the background thread that closes sessions idle for too long"""
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="session-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while not self._closed:
+            time.sleep(max(1.0, min(self.idle_timeout, self.max_age) / 2))
+            with self._cond:
+                now = time.time()
+                stale = [session for session in self._idle if self._expired(session, now)]
+                self._idle = [session for session in self._idle if session not in stale]
+            for session in stale:
+                self._discard(session)
+
+    def stats(self) -> Dict[str, float]:
+        """Launch/reuse counters and the browser start-up time saved by reuse"""
+        average_launch = self.launch_seconds / self.launches if self.launches else 0.0
+        return {
+            'launches': self.launches,
+            'reuses': self.reuses,
+            'recycled': self.recycled,
+            'idle': len(self._idle),
+            'in_use': self._in_use,
+            'average_launch_seconds': round(average_launch, 2),
+            'launch_seconds_saved': round(average_launch * self.reuses, 2),
+        }
+
+    def close(self) -> None:
+        """Close every idle session and stop pooling"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+
+# Browser profile for x.com sessions; set per worker process by configure_x_sessions
+_x_profile_dir: Optional[str] = None
+
+
+def configure_x_sessions(auth_file: Optional[str] = None, profile_dir: Optional[str] = None) -> None:
+    """
+    Point this process's x.com sessions at their own cookies file and browser profile.
+
+    Used by search worker processes so each one logs in with its own account and profile.
+    Must be called before the first session is checked out.
+    """
+    global X_AUTH_FILE, _x_profile_dir
+    if auth_file:
+        X_AUTH_FILE = auth_file
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        _x_profile_dir = profile_dir
+
+
+def load_x_cookies(path: Optional[str] = None) -> Dict[str, str]:
+    """Read the x.com session cookies exported to auth.json"""
+    with open(path or X_AUTH_FILE) as f:
+        return json.load(f)['cookies']
+
+
+def _launch_x_session(key: Hashable) -> WebDriverClient:
+    """Launch a browser and log it into x.com with the saved cookies"""
+    headless, device_type, capture_network = key
+    client = WebDriverClient(headless=headless, device_type=device_type, debugging_port=0,
+                             capture_network=capture_network, user_data_dir=_x_profile_dir)
+    try:
+        navigator = PageNavigator(client.get_driver())
+        navigator.go_to_url("https://x.com")
+        client.add_cookies(load_x_cookies(), ".x.com")
+        navigator.refresh_page()
+    except Exception:
+        client.close()
+        raise
+    return client
+
+
+_x_pool: Optional[WebDriverSessionPool] = None
+_x_pool_lock = threading.Lock()
+
+
+def get_x_session_pool() -> WebDriverSessionPool:
+    """Get the process-wide pool of pre-authenticated x.com sessions, keyed by (headless, device_type, capture_network)"""
+    global _x_pool
+    with _x_pool_lock:
+        if _x_pool is None:
+            # Chrome locks a profile directory, so a dedicated profile allows a single browser
+            _x_pool = WebDriverSessionPool(_launch_x_session, max_size=1 if _x_profile_dir else X_POOL_SIZE)
+            atexit.register(_x_pool.close)
+        return _x_pool
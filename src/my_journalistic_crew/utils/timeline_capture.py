@@ -0,0 +1,213 @@
+from .x_elements import TweetModel, UserModel, TimestampModel, MetricsModel, MediaModel, TweetStructureModel
+from typing import Any, Dict, Iterator, List, Optional, Set
+from datetime import datetime
+import html
+import json
+
+# X's web client loads search results from this GraphQL operation, one response per scroll
+SEARCH_TIMELINE_PATTERN = r".*/graphql/[^/]+/SearchTimeline.*"
+
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def _tweet_result(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Unwrap a tweet_results.result; None for tombstones and unavailable tweets"""
+    if not result:
+        return None
+    # Tweets from accounts with limited visibility are nested one level deeper
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet") or {}
+    if not result.get("legacy") or not result.get("rest_id"):
+        return None
+    return result
+
+
+def _timeline_items(entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the itemContent of every tweet in a timeline entry (single items and modules)"""
+    content = entry.get("content") or {}
+    if content.get("itemContent"):
+        yield content["itemContent"]
+    for module_item in content.get("items") or []:
+        item_content = (module_item.get("item") or {}).get("itemContent")
+        if item_content:
+            yield item_content
+
+
+def _timeline_entries(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    timeline = (((payload.get("data") or {}).get("search_by_raw_query") or {})
+                .get("search_timeline") or {}).get("timeline") or {}
+    for instruction in timeline.get("instructions") or []:
+        for entry in instruction.get("entries") or []:
+            yield entry
+        if instruction.get("entry"):
+            yield instruction["entry"]
+
+
+def _user(result: Dict[str, Any]) -> UserModel:
+    user = ((result.get("core") or {}).get("user_results") or {}).get("result") or {}
+    # Newer responses moved name/screen_name from legacy into core
+    core = user.get("core") or {}
+    legacy = user.get("legacy") or {}
+    name = core.get("name") or legacy.get("name") or ""
+    screen_name = core.get("screen_name") or legacy.get("screen_name")
+    return UserModel(name=name, handle=f"@{screen_name}" if screen_name else None)
+
+
+def _text(result: Dict[str, Any], media: List[Dict[str, Any]]) -> str:
+    """Full tweet text as the page shows it: long-form text when present, without trailing media links"""
+    note = ((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {}
+    text = note.get("text") or result["legacy"].get("full_text") or ""
+    for item in media:
+        if item.get("url"):
+            text = text.replace(item["url"], "")
+    return html.unescape(text).strip()
+
+
+def _timestamp(created_at: Optional[str]) -> TimestampModel:
+    """Convert X's API date into the ISO form the page's <time datetime> uses"""
+    try:
+        parsed = datetime.strptime(created_at or "", TWITTER_DATE_FORMAT)
+    except ValueError:
+        return TimestampModel()
+    return TimestampModel(
+        datetime=parsed.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        display=f"{parsed:%b} {parsed.day}"
+    )
+
+
+def _video_url(item: Dict[str, Any]) -> Optional[str]:
+    """Highest bitrate MP4 of a video or animated GIF"""
+    variants = [variant for variant in (item.get("video_info") or {}).get("variants") or []
+                if variant.get("content_type") == "video/mp4"]
+    if not variants:
+        return None
+    return max(variants, key=lambda variant: variant.get("bitrate") or 0).get("url")
+
+
+def tweet_from_result(result: Dict[str, Any]) -> Optional[TweetModel]:
+    """Build a TweetModel from one GraphQL tweet result"""
+    result = _tweet_result(result)
+    if result is None:
+        return None
+    legacy = result["legacy"]
+    # A retweet carries the original tweet, which is what the page renders
+    retweeted = _tweet_result((legacy.get("retweeted_status_result") or {}).get("result"))
+    if retweeted is not None:
+        return tweet_from_result(retweeted)
+
+    media = (legacy.get("extended_entities") or legacy.get("entities") or {}).get("media") or []
+    photo_urls = [item["media_url_https"] for item in media if item.get("type") == "photo" and item.get("media_url_https")]
+    video_urls = [url for url in (_video_url(item) for item in media if item.get("type") in ("video", "animated_gif")) if url]
+    content = _text(result, media)
+
+    return TweetModel(
+        user=_user(result),
+        content=content,
+        timestamp=_timestamp(legacy.get("created_at")),
+        metrics=MetricsModel(
+            replies=legacy.get("reply_count", 0),
+            retweets=legacy.get("retweet_count", 0),
+            likes=legacy.get("favorite_count", 0)
+        ),
+        media=MediaModel(
+            hasPhotos=bool(photo_urls),
+            hasVideos=bool(video_urls),
+            mediaCount=len(photo_urls) + len(video_urls),
+            photoUrls=photo_urls,
+            videoUrls=video_urls
+        ),
+        structure=TweetStructureModel(
+            id=str(result["rest_id"]),
+            tagName="ARTICLE",
+            dataTestId="tweet",
+            text=content
+        )
+    )
+
+
+def parse_search_timeline(payload: Dict[str, Any]) -> List[TweetModel]:
+    """
+    Parse the tweets out of one SearchTimeline GraphQL response.
+
+    Promoted tweets, tombstones, user modules and cursors are skipped; retweets resolve
+    to the original tweet. Order follows the timeline.
+
+    Args:
+        payload: The decoded JSON body of the response
+
+    Returns:
+        List[TweetModel]: The tweets in the response
+    """
+    tweets = []
+    for entry in _timeline_entries(payload):
+        if (entry.get("entryId") or "").startswith("promoted-"):
+            continue
+        for item_content in _timeline_items(entry):
+            if item_content.get("itemType", item_content.get("__typename")) != "TimelineTweet":
+                continue
+            if item_content.get("promotedMetadata"):
+                continue
+            tweet = tweet_from_result((item_content.get("tweet_results") or {}).get("result"))
+            if tweet is not None:
+                tweets.append(tweet)
+    return tweets
+
+
+def bottom_cursor(payload: Dict[str, Any]) -> Optional[str]:
+    """The cursor X uses to request the next page of results, if the response has one"""
+    for entry in _timeline_entries(payload):
+        content = entry.get("content") or {}
+        if content.get("cursorType") == "Bottom":
+            return content.get("value")
+    return None
+
+
+class TimelineCapture:
+    """
+    Reads tweets from the SearchTimeline responses a selenium-wire driver captures while scrolling.
+
+    Every response is parsed once; drain() returns only tweets from responses that arrived
+    since the previous call, so it can stand in for DOM extraction after each scroll.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._seen: Set[str] = set()
+        self.responses = 0
+        self.tweets = 0
+
+    @staticmethod
+    def supported(driver) -> bool:
+        """Whether the driver records network traffic (i.e. was started with capture_network)"""
+        return hasattr(driver, "iter_requests")
+
+    def start(self) -> None:
+        """Capture only SearchTimeline calls and forget anything recorded before this search"""
+        self.driver.include_urls = [SEARCH_TIMELINE_PATTERN]
+        del self.driver.requests
+        self._seen.clear()
+
+    def drain(self) -> List[TweetModel]:
+        """Parse every SearchTimeline response completed since the last drain"""
+        from seleniumwire2.utils import decode
+
+        tweets = []
+        for request in self.driver.iter_requests():
+            # Requests still waiting on their response are picked up by a later drain
+            if request.id in self._seen or request.response is None:
+                continue
+            self._seen.add(request.id)
+            response = request.response
+            if response.status_code != 200:
+                print(f"SearchTimeline response {response.status_code} for {request.url}")
+                continue
+            try:
+                body = decode(response.body, response.headers.get("Content-Encoding", "identity"))
+                page = parse_search_timeline(json.loads(body))
+            except ValueError as e:
+                print(f"Error parsing SearchTimeline response: {str(e)}")
+                continue
+            self.responses += 1
+            self.tweets += len(page)
+            tweets.extend(page)
+        return tweets
@@ -1,13 +1,53 @@
 from .x_elements import TweetModel, UserModel, TimestampModel, MetricsModel, MediaModel, TweetStructureModel
 from selenium.webdriver.common.by import By
+from typing import Any, Dict, List, Optional
 import datetime
+import re
+
+# Collects every visible tweet article in a single WebDriver round-trip
+EXTRACT_VISIBLE_TWEETS_JS = """
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+};
+const metric = (root, testId) => {
+    const el = root.querySelector('[data-testid="' + testId + '"]');
+    if (!el) return null;
+    // aria-label carries the exact count ("1,234 Likes. Like"); the visible text is abbreviated ("1.2K")
+    return {label: el.getAttribute('aria-label'), text: el.innerText};
+};
+return Array.from(document.querySelectorAll('[data-testid="tweet"]')).map(article => {
+    const userName = article.querySelector('[data-testid="User-Name"]');
+    const userLink = userName ? userName.querySelector('a[role="link"]') : null;
+    const time = article.querySelector('time');
+    // The permalink wraps the timestamp; other status links may belong to a quoted tweet
+    const permalink = (time && time.closest('a[href*="/status/"]')) || article.querySelector('a[href*="/status/"]');
+    return {
+        id: article.getAttribute('data-tweet-id') || (permalink ? permalink.getAttribute('href') : null),
+        userName: userName ? text(userName, 'span') : null,
+        userHref: userLink ? userLink.getAttribute('href') : null,
+        content: text(article, '[data-testid="tweetText"]'),
+        text: article.innerText,
+        time: time ? {display: time.innerText, datetime: time.getAttribute('datetime')} : null,
+        replies: metric(article, 'reply'),
+        retweets: metric(article, 'retweet'),
+        likes: metric(article, 'like'),
+        photoUrls: Array.from(article.querySelectorAll('img[src*="media"]')).map(img => img.src),
+        videoUrls: Array.from(article.querySelectorAll('video')).map(video => video.src),
+        tagName: article.tagName,
+        dataTestId: article.getAttribute('data-testid')
+    };
+});
+"""
+
+COUNT_SUFFIXES = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
 
 def extract_tweet_data(tweet_element, tweet_id=None, driver=None) -> TweetModel:
     # Extract user info
     user_element = tweet_element.find_element(By.CSS_SELECTOR, '[data-testid="User-Name"]')
     user = UserModel(
         name=user_element.find_element(By.CSS_SELECTOR, 'span').text,
-        handle=f'@{user_element.find_element(By.CSS_SELECTOR, 'a[role="link"]').get_attribute('href').split('/')[-1]}'
+        handle=f"@{user_element.find_element(By.CSS_SELECTOR, 'a[role=link]').get_attribute('href').split('/')[-1]}"
     )
 
     # Extract content
@@ -53,4 +93,76 @@ def extract_tweet_data(tweet_element, tweet_id=None, driver=None) -> TweetModel:
         metrics=metrics,
         media=media,
         structure=structure
-    ) 
\ No newline at end of file
+    ) 
+
+
+def parse_count(value: Optional[str]) -> int:
+    """Parse an engagement count such as '1,234', '1.2K' or '3M' into an integer"""
+    if not value:
+        return 0
+    match = re.search(r'(\d[\d,]*(?:\.\d+)?)\s*([KMB])?', value.replace('\u00a0', ' '), re.IGNORECASE)
+    if not match:
+        return 0
+    number = float(match.group(1).replace(',', ''))
+    suffix = (match.group(2) or '').upper()
+    return int(number * COUNT_SUFFIXES.get(suffix, 1))
+
+
+def _metric_value(metric: Optional[Dict[str, Any]]) -> int:
+    if not metric:
+        return 0
+    return parse_count(metric.get('label')) or parse_count(metric.get('text'))
+
+
+def tweet_from_data(data: Dict[str, Any]) -> TweetModel:
+    """Build a TweetModel from one record returned by EXTRACT_VISIBLE_TWEETS_JS"""
+    tweet_id = data.get('id') or ''
+    if '/status/' in tweet_id:
+        tweet_id = tweet_id.split('/status/')[-1].split('?')[0].split('/')[0]
+    content = data.get('content') or ''
+    if not tweet_id:
+        tweet_id = f"synthetic-id-{hash((content or data.get('text') or '')[:50])}"
+
+    user_href = data.get('userHref') or ''
+    time_data = data.get('time') or {}
+    photo_urls = data.get('photoUrls') or []
+    video_urls = data.get('videoUrls') or []
+
+    return TweetModel(
+        user=UserModel(
+            name=data.get('userName') or '',
+            handle=f"@{user_href.rstrip('/').split('/')[-1]}" if user_href else None
+        ),
+        content=content,
+        timestamp=TimestampModel(display=time_data.get('display'), datetime=time_data.get('datetime')),
+        metrics=MetricsModel(
+            replies=_metric_value(data.get('replies')),
+            retweets=_metric_value(data.get('retweets')),
+            likes=_metric_value(data.get('likes'))
+        ),
+        media=MediaModel(
+            hasPhotos=bool(photo_urls),
+            hasVideos=bool(video_urls),
+            mediaCount=len(photo_urls) + len(video_urls),
+            photoUrls=photo_urls,
+            videoUrls=video_urls
+        ),
+        structure=TweetStructureModel(
+            id=tweet_id,
+            tagName=data.get('tagName') or 'ARTICLE',
+            dataTestId=data.get('dataTestId'),
+            text=content
+        )
+    )
+
+
+def extract_visible_tweets(driver) -> List[TweetModel]:
+    """Extract every tweet currently in the DOM with a single execute_script call"""
+    records = driver.execute_script(EXTRACT_VISIBLE_TWEETS_JS) or []
+    tweets = []
+    for record in records:
+        try:
+            tweets.append(tweet_from_data(record))
+        except Exception as e:
+            print(f"Error parsing tweet record: {str(e)}")
+    return tweets
@@ -0,0 +1,134 @@
+from .x_elements import TweetModel
+from typing import Dict, Iterable, Optional, Set, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+TWEET_STORE_PATH = os.getenv('TWEET_STORE_PATH', os.path.join('.cache', 'tweets.sqlite3'))
+TWEET_STORE_DISABLED = os.getenv('TWEET_STORE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def trend_key(trend: str) -> str:
+    """Normalise a trend so 'Trump Tariffs' and 'trump tariffs ' share their history"""
+    return ' '.join(trend.lower().split())
+
+
+class TweetStore:
+    """
+    Persistent record of every tweet collected, keyed by tweet ID and indexed by trend and timestamp.
+
+    Later searches for the same trend use it to recognise tweets they have already seen: known
+    tweets only get their engagement metrics refreshed, and resumed searches stop scrolling once
+    they reach the newest tweet stored for the trend.
+    """
+
+    def __init__(self, path: str = TWEET_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Batch search workers write from separate processes, so wait on locks and use WAL
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS tweets (
+                id TEXT PRIMARY KEY,
+                user TEXT,
+                content TEXT,
+                timestamp TEXT,
+                likes INTEGER,
+                retweets INTEGER,
+                replies INTEGER,
+                photo_urls TEXT NOT NULL,
+                video_urls TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS trend_tweets (
+                trend TEXT NOT NULL,
+                tweet_id TEXT NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (trend, tweet_id)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS tweets_timestamp ON tweets(timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS trend_tweets_seen_at ON trend_tweets(trend, seen_at)")
+        self._db.commit()
+
+    def known_ids(self, trend: str) -> Set[str]:
+        """IDs of every tweet previously collected for a trend"""
+        with self._lock:
+            rows = self._db.execute("SELECT tweet_id FROM trend_tweets WHERE trend = ?", (trend_key(trend),)).fetchall()
+        return {row[0] for row in rows}
+
+    def since_id(self, trend: str) -> Optional[int]:
+        """The newest tweet ID stored for a trend; tweet IDs grow with posting time"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MAX(CAST(tweet_id AS INTEGER)) FROM trend_tweets WHERE trend = ? AND tweet_id NOT GLOB '*[^0-9]*'",
+                (trend_key(trend),)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def record(self, trend: str, tweets: Iterable[TweetModel]) -> Tuple[int, int]:
+        """
+        Store tweets seen for a trend, in one transaction.
+
+        New tweets are inserted; known tweets only have their metrics refreshed.
+
+        Returns:
+            tuple: (new, updated) - how many tweets were new and how many were already known
+        """
+        now = time.time()
+        key = trend_key(trend)
+        new = updated = 0
+        with self._lock, self._db:
+            for tweet in tweets:
+                tweet_id = tweet.structure.id
+                cursor = self._db.execute(
+                    "UPDATE tweets SET likes = ?, retweets = ?, replies = ?, updated_at = ? WHERE id = ?",
+                    (tweet.metrics.likes, tweet.metrics.retweets, tweet.metrics.replies, now, tweet_id)
+                )
+                if cursor.rowcount:
+                    updated += 1
+                else:
+                    new += 1
+                    self._db.execute(
+                        "INSERT INTO tweets (id, user, content, timestamp, likes, retweets, replies, photo_urls, "
+                        "video_urls, first_seen, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tweet_id, tweet.user.handle, tweet.content, tweet.timestamp.datetime, tweet.metrics.likes,
+                         tweet.metrics.retweets, tweet.metrics.replies, json.dumps(tweet.media.photoUrls),
+                         json.dumps(tweet.media.videoUrls), now, now)
+                    )
+                self._db.execute(
+                    "INSERT OR IGNORE INTO trend_tweets (trend, tweet_id, seen_at) VALUES (?, ?, ?)",
+                    (key, tweet_id, now)
+                )
+        return new, updated
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored tweets and trends"""
+        with self._lock:
+            tweets = self._db.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+            trends = self._db.execute("SELECT COUNT(DISTINCT trend) FROM trend_tweets").fetchone()[0]
+        return {'tweets': tweets, 'trends': trends}
+
+
+_tweet_store: Optional[TweetStore] = None
+_tweet_store_lock = threading.Lock()
+
+
+def get_tweet_store() -> Optional[TweetStore]:
+    """Get the process-wide tweet store, or None when TWEET_STORE_DISABLED is set"""
+    global _tweet_store
+    if TWEET_STORE_DISABLED:
+        return None
+    with _tweet_store_lock:
+        if _tweet_store is None:
+            _tweet_store = TweetStore()
+        return _tweet_store
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+import os
+import re
+import threading
+import time
+
+# Documents kept per run, and how long one is reused before it is scraped again
+URL_INDEX_MAX_DOCUMENTS = int(os.getenv('URL_INDEX_MAX_DOCUMENTS', 500))
+URL_INDEX_TTL = float(os.getenv('URL_INDEX_TTL', 6 * 3600))
+
+# Query parameters that only identify the campaign, click or share that led to a page. Parameters that
+# pick a variant, such as amp or outputType, select a different document and are kept.
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref_src", "ref_url", "cmpid", "ocid", "smid", "sr_share",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "mtm_")
+MOBILE_HOST_PREFIXES = ("m.", "mobile.", "amp.")
+# Google's AMP cache and viewer wrap the publisher URL: host.cdn.ampproject.org/c/s/publisher/path, google.com/amp/s/publisher/path
+AMP_WRAPPER = re.compile(r'^/(?:amp/|c/)(s/)?(.+)$')
+AMP_PATH = re.compile(r'(/amp/?$|\.amp(?=\.html?$)|\.amp$)')
+LINK_TAG = re.compile(rb'<link\b[^>]*>', re.IGNORECASE)
+ATTRIBUTE = re.compile(rb'''([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+# rel=canonical belongs in <head>; reading past this many bytes is no longer cheap
+CANONICAL_SEARCH_BYTES = 64 * 1024
+
+
+def _unwrap_amp(parsed):
+    host = parsed.netloc.lower()
+    if host.endswith(".cdn.ampproject.org") or (host.endswith("google.com") and parsed.path.startswith("/amp/")):
+        match = AMP_WRAPPER.match(parsed.path)
+        if match:
+            scheme = "https" if match.group(1) else "http"
+            return urlparse(f"{scheme}://{match.group(2)}" + (f"?{parsed.query}" if parsed.query else ""))
+    return parsed
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Rewrite a URL into the form every copy of the same page shares.
+
+    Tracking parameters, fragments, default ports and trailing slashes are dropped; AMP cache
+    wrappers, AMP paths and mobile hosts are mapped back to the regular page. The result is
+    still a fetchable URL.
+    """
+    parsed = _unwrap_amp(urlparse(url.strip()))
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return url.strip()
+
+    host = parsed.hostname.lower()
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    if parsed.port and parsed.port != (443 if parsed.scheme == "https" else 80):
+        host = f"{host}:{parsed.port}"
+
+    path = AMP_PATH.sub("", parsed.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunparse((parsed.scheme.lower(), host, path, parsed.params, urlencode(query), ""))
+
+
+def url_key(url: str) -> str:
+    """Dedup key of a URL: its canonical form without scheme or www."""
+    parsed = urlparse(canonicalize_url(url))
+    host = parsed.netloc[4:] if parsed.netloc.startswith("www.") else parsed.netloc
+    return f"{host}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def find_canonical_url(html: bytes, page_url: str) -> Optional[str]:
+    """The page's <link rel="canonical"> target, if its <head> declares a plausible one"""
+    for tag in LINK_TAG.finditer(html[:CANONICAL_SEARCH_BYTES]):
+        attributes = {name.lower(): (double or single) for name, double, single in ATTRIBUTE.findall(tag.group(0))}
+        if b"canonical" not in attributes.get(b"rel", b"").lower().split() or not attributes.get(b"href"):
+            continue
+        canonical = urljoin(page_url, attributes[b"href"].decode("utf-8", "ignore").strip())
+        # Some sites point every page's canonical at their home page, which would merge unrelated stories
+        if urlparse(canonical).path in ("", "/") and urlparse(page_url).path not in ("", "/"):
+            return None
+        return canonical if urlparse(canonical).scheme in ("http", "https") else None
+    return None
+
+
+class UrlIndex:
+    """
+    Per-run index of the documents already fetched, keyed by canonical URL.
+
+    URLs are canonicalized before anything is fetched, so tracking, AMP and mobile variants of a
+    page collapse into one. Once a page is fetched its rel=canonical link joins the index as an
+    alias, catching copies no rewrite rule could, such as shortened links. Counters report how
+    many duplicates were removed at each stage.
+
+    The crew resets the index at every kickoff. Within a run, documents older than ttl are
+    scraped again and the least recently used are dropped beyond max_documents.
+    """
+
+    def __init__(self, max_documents: int = URL_INDEX_MAX_DOCUMENTS, ttl: float = URL_INDEX_TTL):
+        self.max_documents = max_documents
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        # key -> (first URL, content, recorded at)
+        self._documents: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self.stats = {'seen': 0, 'unique': 0, 'duplicates': 0, 'canonical_duplicates': 0, 'repeats': 0,
+                      'expired': 0, 'evictions': 0}
+
+    def _resolve(self, key: str) -> str:
+        return self._aliases.get(key, key)
+
+    def _document(self, key: str) -> Optional[Tuple[str, str, float]]:
+        """Look up a live document, dropping it if it has expired; caller holds the lock"""
+        document = self._documents.get(key)
+        if document is None:
+            return None
+        if time.time() - document[2] >= self.ttl:
+            del self._documents[key]
+            self.stats['expired'] += 1
+            return None
+        self._documents.move_to_end(key)
+        return document
+
+    def _store(self, key: str, url: str, content: str) -> None:
+        """Add a document, evicting the least recently used beyond the bound; caller holds the lock"""
+        self._documents[key] = (url, content, time.time())
+        self._documents.move_to_end(key)
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+            self.stats['evictions'] += 1
+        # Aliases are only a few URLs each, but keep them bounded along with the documents
+        while len(self._aliases) > 4 * self.max_documents:
+            self._aliases.popitem(last=False)
+
+    def reset(self) -> None:
+        """Forget every document and alias, starting a new run"""
+        with self._lock:
+            self._documents.clear()
+            self._aliases.clear()
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def plan(self, urls: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Decide what to do with each of a batch of URLs.
+
+        Returns:
+            list: (canonical URL, key, first URL) per input URL, where first URL is None for the first
+                  copy of a page not yet fetched in this run, and the URL it duplicates otherwise
+        """
+        planned = []
+        first_in_batch: Dict[str, str] = {}
+        with self._lock:
+            for url in urls:
+                self.stats['seen'] += 1
+                canonical = canonicalize_url(url)
+                key = self._resolve(url_key(canonical))
+                document = self._document(key)
+                if document is not None:
+                    self.stats['repeats'] += 1
+                    planned.append((canonical, key, document[0]))
+                elif key in first_in_batch:
+                    self.stats['duplicates'] += 1
+                    planned.append((canonical, key, first_in_batch[key]))
+                else:
+                    first_in_batch[key] = url
+                    planned.append((canonical, key, None))
+        return planned
+
+    def record(self, key: str, url: str, content: str, canonical_url: Optional[str] = None) -> Optional[str]:
+        """
+        Store a fetched document under its key and, if given, its rel=canonical URL.
+
+        Returns:
+            str: URL of an earlier document this one turned out to duplicate, or None if it is new
+        """
+        with self._lock:
+            if canonical_url:
+                canonical_key = self._resolve(url_key(canonical_url))
+                if canonical_key != key:
+                    self._aliases[key] = canonical_key
+                    document = self._document(canonical_key)
+                    if document is not None:
+                        self.stats['canonical_duplicates'] += 1
+                        return document[0]
+                    key = canonical_key
+            self._store(key, url, content)
+            self.stats['unique'] += 1
+        return None
+
+    def content(self, key: str) -> Optional[str]:
+        """Text already extracted for a key in this run"""
+        with self._lock:
+            document = self._document(self._resolve(key))
+        return document[1] if document else None
+
+
+_url_index: Optional[UrlIndex] = None
+_url_index_lock = threading.Lock()
+
+
+def get_url_index() -> UrlIndex:
+    """Get the index for this run, shared by every tool in the process"""
+    global _url_index
+    with _url_index_lock:
+        if _url_index is None:
+            _url_index = UrlIndex()
+        return _url_index
+
+
+def reset_url_index() -> None:
+    """Start a new run: documents scraped before are fetched again"""
+    get_url_index().reset()
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from my_journalistic_crew.utils.image_registry import ImageRegistry, get_image_registry
+from my_journalistic_crew.utils.rate_limiter import RateLimiter, backoff_delay
+import base64
+import os
+import threading
+import time
+import requests
+
+VISION_API_URL = os.getenv('VISION_API_URL', 'https://integrate.api.nvidia.com/v1/chat/completions')
+VISION_MODEL = os.getenv('VISION_MODEL', 'meta/llama-4-maverick-17b-128e-instruct')
+VISION_MAX_CONCURRENCY = int(os.getenv('VISION_MAX_CONCURRENCY', 10))
+# NVIDIA's hosted endpoints allow 40 requests per minute on the free tier
+VISION_REQUESTS_PER_MINUTE = float(os.getenv('VISION_REQUESTS_PER_MINUTE', 40))
+VISION_TIMEOUT = float(os.getenv('VISION_TIMEOUT', 60))
+VISION_RETRIES = int(os.getenv('VISION_RETRIES', 4))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _api_key() -> str:
+    # NVIDIA_NIML_API_KEY (from .env) first, then NVIDIA_API_KEY
+    return (os.getenv("NVIDIA_NIML_API_KEY") or os.getenv("NVIDIA_API_KEY")
+            or "YOUR_API_KEY_REQUIRED_IF_EXECUTING_OUTSIDE_NGC")
+
+
+class VisionError(Exception):
+    """Raised when the vision API rejects a request or keeps failing after every retry"""
+
+
+class VisionClient:
+    """
+    Describes images with a vision model over one pooled HTTP session.
+
+    Requests for a batch run concurrently, at most VISION_MAX_CONCURRENCY at a time and no
+    faster than the rate limiter allows; 429 and 5xx answers are retried with backoff, and a
+    429 slows every worker down. Descriptions are cached in the image registry by picture
+    digest and model, so no picture is ever described twice by the same model.
+    """
+
+    def __init__(self, model: str = VISION_MODEL, api_url: str = VISION_API_URL,
+                 max_concurrency: int = VISION_MAX_CONCURRENCY, per_minute: float = VISION_REQUESTS_PER_MINUTE,
+                 timeout: float = VISION_TIMEOUT, retries: int = VISION_RETRIES,
+                 registry: Optional[ImageRegistry] = None):
+        self.model = model
+        self.api_url = api_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.registry = registry or get_image_registry()
+        # A full batch may start at once; the per-minute rate applies after that
+        self.limiter = RateLimiter(per_minute, burst=max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(max_concurrency, 1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'cached': 0, 'retries': 0, 'failed': 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _request(self, image_data: bytes, mime_type: str) -> str:
+        """Send one image to the model and return its description"""
+        image_b64 = base64.b64encode(image_data).decode()
+
+        headers = {
+            "Authorization": f"Bearer {_api_key()}",
+            "Accept": "application/json"
+        }
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f'What is in this image? <img src="data:{mime_type};base64,{image_b64}" />'
+                }
+            ],
+            "max_tokens": 512,
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "stream": False
+        }
+
+        for attempt in range(self.retries + 1):
+            response = None
+            self.limiter.acquire()
+            self._count('requests')
+            try:
+                response = self.session.post(self.api_url, headers=headers, json=payload, timeout=self.timeout)
+                if response.ok:
+                    result = response.json()
+                    if 'choices' in result and len(result['choices']) > 0:
+                        return result['choices'][0]['message']['content']
+                    raise VisionError("Failed to get a description from the API.")
+                error = VisionError(f"{response.status_code} {response.reason}: {response.text[:200]}")
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = VisionError(str(e))
+            if attempt < self.retries:
+                self._count('retries')
+                delay = backoff_delay(attempt, response)
+                if response is not None and response.status_code == 429:
+                    self.limiter.pause(delay)
+                time.sleep(delay)
+        raise error
+
+    def describe(self, digest: str, image_data: bytes, mime_type: str = "image/jpeg") -> str:
+        """
+        Describe one picture, from the cache when this model has described it before.
+
+        Args:
+            digest: Canonical digest of the picture, shared by its duplicates
+            image_data: The encoded image sent to the model
+            mime_type: Its media type
+
+        Returns:
+            str: The description; raises VisionError when the API fails
+        """
+        cached = self.registry.description(digest, self.model)
+        if cached is not None:
+            self._count('cached')
+            return cached
+        try:
+            description = self._request(image_data, mime_type)
+        except Exception:
+            self._count('failed')
+            raise
+        self.registry.record_description(digest, self.model, description)
+        return description
+
+    def describe_all(self, images: List[Tuple[str, bytes, str]]) -> List[str]:
+        """
+        Describe many pictures concurrently.
+
+        Args:
+            images: (digest, image bytes, media type) tuples
+
+        Returns:
+            list: One description or "Error processing image: ..." message per picture, in input order
+        """
+        def describe_one(image: Tuple[str, bytes, str]) -> str:
+            try:
+                return self.describe(*image)
+            except Exception as e:
+                return f"Error processing image: {str(e)}"
+
+        if not images:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(images)), thread_name_prefix="vision") as executor:
+            return list(executor.map(describe_one, images))
+
+
+_vision_client: Optional[VisionClient] = None
+_vision_client_lock = threading.Lock()
+
+
+def get_vision_client() -> VisionClient:
+    """Get the process-wide vision client"""
+    global _vision_client
+    with _vision_client_lock:
+        if _vision_client is None:
+            _vision_client = VisionClient()
+        return _vision_client
@@ -1,15 +1,18 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from typing import Dict, Optional
+from my_journalistic_crew.utils.driver_resolver import resolve_chromedriver
+from typing import Dict, List, Optional
 import random
+import time
 
 class WebDriverClient:
     """Selenium WebDriver client with tablet emulation and detection avoidance"""
     
-    def __init__(self, headless: bool = True, device_type: str = "desktop"):
+    def __init__(self, headless: bool = True, device_type: str = "desktop", page_load_strategy: str = "normal",
+                 debugging_port: int = 9222, capture_network: bool = False, user_data_dir: Optional[str] = None):
         self.options = Options()
+        self.options.page_load_strategy = page_load_strategy
         
         # Define device configurations
         devices = {
@@ -72,17 +75,35 @@ class WebDriverClient:
         if headless:
             self.options.add_argument("--headless=new")
             self.options.add_argument("--disable-software-rasterizer")
-            self.options.add_argument("--remote-debugging-port=9222")
+            # Port 0 lets Chrome pick a free port so several headless browsers can run side by side
+            self.options.add_argument(f"--remote-debugging-port={debugging_port}")
             self.options.add_argument("--disable-renderer-backgrounding")
         
+        # A dedicated profile keeps cookies and cache apart from other browsers on the host
+        if user_data_dir:
+            self.options.add_argument(f"--user-data-dir={user_data_dir}")
+        
         # Add this line to allow third-party cookies
         self.options.add_argument("--disable-features=SameSiteByDefaultCookies,CookiesWithoutSameSiteMustBeSecure")
         
-        # Initialize driver
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=self.options
-        )
+        # Initialize driver (the chromedriver path is resolved once per host and cached)
+        start = time.time()
+        if capture_network:
+            # selenium-wire proxies the browser so API responses can be read from driver.requests
+            from seleniumwire2 import webdriver as wire_webdriver
+            from seleniumwire2.options import SeleniumWireOptions
+            self.driver = wire_webdriver.Chrome(
+                service=Service(resolve_chromedriver()),
+                options=self.options,
+                seleniumwire_options=SeleniumWireOptions(request_storage="memory", disable_encoding=True)
+            )
+        else:
+            self.driver = webdriver.Chrome(
+                service=Service(resolve_chromedriver()),
+                options=self.options
+            )
+        self.startup_seconds = time.time() - start
+        print(f"Chrome started in {self.startup_seconds:.2f}s")
         
         # Modify navigator properties
         self.driver.execute_cdp_cmd(
@@ -110,6 +131,11 @@ class WebDriverClient:
                 'domain': domain
             })
     
+    def block_resources(self, url_patterns: List[str]) -> None:
+        """Stop the browser from downloading matching URLs (e.g. '*.png', '*.woff2')"""
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": url_patterns})
+    
     def get_driver(self):
         """Get the current driver instance"""
         return self.driver
@@ -0,0 +1,107 @@
+from my_journalistic_crew.models.outputs import FinalArticle
+from my_journalistic_crew.utils.embeddings import ArticleEmbeddings, ChunkEmbedding
+from my_journalistic_crew.utils.neo4j_client import (
+    SCHEMA_QUERIES, UPSERT_ARTICLES_QUERY, InMemoryArticleStore, Neo4jArticleStore, article_row
+)
+
+
+def make_article(slug, title="Title"):
+    return FinalArticle(title=title, slug=slug, summary="Summary", content="Content", category="News",
+                        subcategory="World", keywords=["a", "b"], thumbnailUrl="https://example.com/t.webp")
+
+
+def test_row_holds_every_stored_property_and_chunks():
+    embeddings = ArticleEmbeddings(embedding=[0.1, 0.2], title_embedding=[0.3], summary_embedding=[0.4],
+                                   chunks=[ChunkEmbedding(index=0, text="Content", embedding=[0.5])])
+    row = article_row(make_article("one"), embeddings)
+    assert row["slug"] == "one"
+    assert row["properties"]["embedding"] == [0.1, 0.2]
+    assert row["properties"]["titleEmbedding"] == [0.3]
+    assert row["properties"]["keywords"] == ["a", "b"]
+    assert "slug" not in row["properties"]
+    assert row["chunks"] == [{"index": 0, "text": "Content", "embedding": [0.5]}]
+
+
+def test_row_without_embeddings_has_no_chunks():
+    row = article_row(make_article("one"))
+    assert row["properties"]["embedding"] is None and row["chunks"] == []
+
+
+def test_in_memory_store_batches_and_upserts_by_slug():
+    store = InMemoryArticleStore(batch_size=40)
+    stored = store.upsert_articles([article_row(make_article(f"slug-{i}")) for i in range(100)])
+    assert len(stored) == 100 and store.transactions == 3
+
+    published = store.articles["slug-7"]["publishedAt"]
+    store.upsert_articles([article_row(make_article("slug-7", title="Corrected"))])
+    assert len(store.articles) == 100
+    assert store.articles["slug-7"]["title"] == "Corrected"
+    assert store.articles["slug-7"]["publishedAt"] == published
+    assert "updatedAt" in store.articles["slug-7"]
+
+
+def test_duplicate_slugs_in_one_call_keep_the_last_version():
+    store = InMemoryArticleStore()
+    stored = store.upsert_articles([article_row(make_article("same", title=title)) for title in ("First", "Second")])
+    assert [article["title"] for article in stored] == ["Second"]
+
+
+class FakeRecord:
+    def __init__(self, row):
+        self.row = row
+
+    def data(self):
+        return {"title": self.row["properties"]["title"], "slug": self.row["slug"], "publishedAt": "now"}
+
+
+class FakeTransaction:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, rows):
+        self.log.append(("tx.run", query))
+        return [FakeRecord(row) for row in rows]
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query):
+        self.log.append(("run", query))
+        return self
+
+    def consume(self):
+        pass
+
+    def execute_write(self, work, rows):
+        self.log.append(("execute_write", len(rows)))
+        return work(FakeTransaction(self.log), rows)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.log = []
+
+    def session(self, database=None):
+        return FakeSession(self.log)
+
+
+def test_neo4j_store_sends_one_unwind_transaction_per_batch():
+    driver = FakeDriver()
+    store = Neo4jArticleStore(driver=driver, batch_size=50)
+    stored = store.upsert_articles([article_row(make_article(f"slug-{i}")) for i in range(120)])
+
+    assert len(stored) == 120
+    assert [entry[1] for entry in driver.log if entry[0] == "execute_write"] == [50, 50, 20]
+    assert all(entry[1] == UPSERT_ARTICLES_QUERY for entry in driver.log if entry[0] == "tx.run")
+    assert sum(1 for entry in driver.log if entry[0] == "run") == len(SCHEMA_QUERIES)
+
+    store.upsert_articles([article_row(make_article("again"))])
+    assert sum(1 for entry in driver.log if entry[0] == "run") == len(SCHEMA_QUERIES)
@@ -0,0 +1,110 @@
+import pytest
+import requests
+from my_journalistic_crew.utils.blob_uploader import BlobUploader, file_digest
+from my_journalistic_crew.utils.image_registry import ImageRegistry
+from my_journalistic_crew.utils.local_blob_server import start_local_blob_server
+
+PART_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = start_local_blob_server(str(tmp_path / "store"), token="local")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ImageRegistry(str(tmp_path / "images.sqlite3"))
+
+
+def make_uploader(server, registry, **kwargs):
+    options = {'token': "local", 'api_url': server.url, 'multipart_threshold': 2 * PART_SIZE,
+               'part_size': PART_SIZE, 'registry': registry}
+    options.update(kwargs)
+    return BlobUploader(**options)
+
+
+def write_file(tmp_path, name, size, seed=0):
+    path = tmp_path / name
+    path.write_bytes(bytes((i * 31 + seed) % 251 for i in range(size)))
+    return str(path)
+
+
+def test_small_and_multipart_uploads_round_trip(server, registry, tmp_path):
+    small = write_file(tmp_path, "small.webp", 1000)
+    large = write_file(tmp_path, "large.webp", 5 * PART_SIZE + 123, seed=7)
+    results = make_uploader(server, registry).upload_files([small, large])
+
+    assert (results.success_count, results.failure_count) == (2, 0)
+    for path, upload in zip([small, large], results.uploads):
+        assert upload.message == f"File uploaded successfully to: {upload.blob_url}"
+        with open(path, 'rb') as f:
+            assert requests.get(upload.blob_url).content == f.read()
+    assert server.requests['put'] == 1
+    assert server.requests['upload'] == 6
+
+
+def test_identical_bytes_are_not_uploaded_twice(server, registry, tmp_path):
+    first = write_file(tmp_path, "a.webp", 1000)
+    copy = write_file(tmp_path, "b.webp", 1000)
+    uploader = make_uploader(server, registry)
+    url = uploader.upload_files([first]).uploads[0].blob_url
+
+    upload = uploader.upload_files([copy]).uploads[0]
+    assert upload.success and upload.blob_url == url
+    assert upload.message == f"File already uploaded to: {url}"
+    assert server.requests['put'] == 1
+
+
+def test_missing_file_and_token_are_reported(server, registry, tmp_path):
+    results = make_uploader(server, registry).upload_files([str(tmp_path / "missing.webp")])
+    assert results.failure_count == 1
+    assert results.uploads[0].message.endswith("missing.webp does not exist")
+
+    existing = write_file(tmp_path, "a.webp", 10)
+    upload = make_uploader(server, registry, token="").upload_files([existing]).uploads[0]
+    assert upload.message == "Error: VERCEL_BLOB_TOKEN environment variable is not set"
+
+
+def test_rejected_requests_are_not_retried(server, registry, tmp_path):
+    path = write_file(tmp_path, "a.webp", 10)
+    uploader = make_uploader(server, registry, token="wrong")
+    upload = uploader.upload_files([path]).uploads[0]
+    assert not upload.success and "forbidden" in upload.message
+    assert uploader.stats['retries'] == 0
+
+
+def test_transient_failures_are_retried(server, registry, tmp_path, monkeypatch):
+    monkeypatch.setattr("my_journalistic_crew.utils.blob_uploader.RETRY_BACKOFF", 0.001)
+    server.failure_rate = 0.3
+    paths = [write_file(tmp_path, f"{i}.webp", 3 * PART_SIZE, seed=i) for i in range(4)]
+    uploader = make_uploader(server, registry, retries=10)
+    results = uploader.upload_files(paths)
+    assert results.success_count == 4
+    assert uploader.stats['retries'] == server.requests['failed'] > 0
+
+
+def test_interrupted_multipart_upload_resumes(server, registry, tmp_path):
+    path = write_file(tmp_path, "large.webp", 4 * PART_SIZE)
+    uploader = make_uploader(server, registry, part_workers=1, retries=0)
+    original = uploader._read_part
+
+    def fail_third_part(file_path, offset):
+        if offset == 2 * PART_SIZE:
+            raise requests.exceptions.ConnectionError("connection dropped")
+        return original(file_path, offset)
+
+    uploader._read_part = fail_third_part
+    assert not uploader.upload_files([path]).uploads[0].success
+    assert server.requests['upload'] == 3
+
+    uploader = make_uploader(server, registry)
+    upload = uploader.upload_files([path]).uploads[0]
+    assert upload.success
+    assert server.requests['create'] == 1 and server.requests['upload'] == 4
+    assert uploader.stats['resumed_parts'] == 3
+    with open(path, 'rb') as f:
+        assert requests.get(upload.blob_url).content == f.read()
+    assert registry.pending_upload(file_digest(path)) is None
@@ -0,0 +1,31 @@
+import gzip
+from my_journalistic_crew.utils.content_sniffer import sniff_binary
+
+HTML = b"<!doctype html><html><head><title>Budget</title></head><body><p>Parliament passed the budget.</p></body></html>"
+
+
+def test_binary_content_types_are_skipped():
+    assert sniff_binary("application/pdf", HTML) == "application/pdf"
+    assert sniff_binary("image/jpeg; charset=binary", b"") == "image/jpeg"
+    assert sniff_binary("application/vnd.ms-excel", b"") == "application/vnd.ms-excel"
+    assert sniff_binary("application/vnd.openxmlformats-officedocument.wordprocessingml.document", b"") is not None
+    assert sniff_binary("application/x-gzip", b"") == "application/x-gzip"
+
+
+def test_text_subtypes_of_the_x_and_vnd_trees_are_text():
+    for content_type in ("application/x-javascript", "application/x-www-form-urlencoded", "application/vnd.api+json",
+                         "application/vnd.nasa.feed+xml; charset=utf-8", "application/problem+json"):
+        assert sniff_binary(content_type, HTML) is None, content_type
+
+
+def test_unlabelled_bodies_are_sniffed():
+    assert sniff_binary("", b"%PDF-1.7\n") == "PDF document"
+    assert sniff_binary("text/html", b"\x89PNG\r\n\x1a\n\x00\x00") == "PNG image"
+    assert sniff_binary("", b"\x00\x00\x00\x18ftypmp42") == "MP4/QuickTime video"
+    assert sniff_binary("", HTML) is None
+    assert sniff_binary("", "Bungeni lapitisha bajeti — 2024".encode("utf-8")[:-1]) is None
+    assert sniff_binary("", b"\xff\x01\x02\x80" * 64) == "binary data"
+
+
+def test_compressed_text_is_left_for_the_caller_to_inflate():
+    assert sniff_binary("text/html", gzip.compress(HTML)) is None
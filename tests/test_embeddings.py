@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from my_journalistic_crew.models.outputs import FinalArticle
+from my_journalistic_crew.utils.embeddings import EmbeddingCache, EmbeddingService, chunk_text
+
+
+class FakeEmbeddingsAPI:
+    """Returns a vector derived from each text, in reverse order like an unordered API response"""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, input, model, encoding_format, extra_body):
+        self.calls.append((list(input), extra_body["input_type"]))
+        data = [SimpleNamespace(index=index, embedding=[float(len(text)), float(index)])
+                for index, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def make_service(tmp_path, batch_size=4):
+    api = FakeEmbeddingsAPI()
+    service = EmbeddingService(client=SimpleNamespace(embeddings=api), batch_size=batch_size, per_minute=0,
+                               cache=EmbeddingCache(str(tmp_path / "embeddings.sqlite3")))
+    return service, api
+
+
+def make_article(content):
+    return FinalArticle(title="A title", slug="slug", summary="A summary", content=content, category="News",
+                        subcategory="World", keywords=[], thumbnailUrl="")
+
+
+def test_chunks_overlap_and_cover_the_text():
+    words = [f"w{i}" for i in range(100)]
+    chunks = chunk_text(" ".join(words), size=40, overlap=10)
+    assert [chunk.split()[0] for chunk in chunks] == ["w0", "w30", "w60"]
+    assert chunks[0].split()[-10:] == chunks[1].split()[:10]
+    assert chunks[-1].split()[-1] == "w99"
+
+
+def test_short_and_empty_text():
+    assert chunk_text("one two\nthree", size=40, overlap=10) == ["one two\nthree"]
+    assert chunk_text("   ") == []
+
+
+def test_batches_keep_order_and_skip_repeats(tmp_path):
+    service, api = make_service(tmp_path)
+    texts = ["a", "bb", "a", "ccc", "dddd", "eeeee", "ffffff"]
+    vectors = service.embed(texts)
+    assert [vector[0] for vector in vectors] == [1, 2, 1, 3, 4, 5, 6]
+    assert sorted(len(call[0]) for call in api.calls) == [2, 4]
+
+
+def test_cache_is_keyed_by_input_type_and_survives_restarts(tmp_path):
+    service, api = make_service(tmp_path)
+    service.embed(["same text"])
+    service.embed(["same text"], input_type="query")
+    assert len(api.calls) == 2
+
+    service, api = make_service(tmp_path)
+    assert service.embed(["same text"]) == [[9.0, 0.0]]
+    assert api.calls == [] and service.stats["cached"] == 1
+
+
+def test_article_embeddings_include_title_summary_and_chunks(tmp_path):
+    service, api = make_service(tmp_path, batch_size=32)
+    article = make_article(" ".join(f"w{i}" for i in range(600)))
+    embeddings = service.embed_articles([article])[0]
+    assert [chunk.index for chunk in embeddings.chunks] == [0, 1, 2]
+    assert embeddings.title_embedding[0] == len("A title")
+    assert embeddings.summary_embedding[0] == len("A summary")
+    assert [input_type for _, input_type in api.calls] == ["query", "passage"]
+
+    service.embed_articles([article])
+    assert len(api.calls) == 2
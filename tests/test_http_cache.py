@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from my_journalistic_crew.utils.fetcher import ConcurrentFetcher
+from my_journalistic_crew.utils.http_cache import MAX_HEURISTIC_FRESHNESS, HttpCache
+
+LAST_MODIFIED = formatdate(time.time() - 3600, usegmt=True)
+
+
+class FakeSite(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        if self.path.startswith("/fresh"):
+            headers = {"Cache-Control": "max-age=60"}
+        elif self.path == "/etag":
+            headers = {"Cache-Control": "no-cache", "ETag": '"v1"'}
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self.send(304, b"", headers)
+        elif self.path == "/dated":
+            headers = {"Last-Modified": LAST_MODIFIED, "Cache-Control": "max-age=0"}
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self.send(304, b"", headers)
+        else:
+            headers = {"Cache-Control": "no-store"}
+        self.send(200, f"<html>{self.path}</html>".encode().ljust(1000, b" "), headers)
+
+    def send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSite)
+    server.lock = threading.Lock()
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def make_fetcher(tmp_path, **kwargs):
+    return ConcurrentFetcher(max_workers=4, cache=HttpCache(cache_dir=str(tmp_path / "http"), **kwargs))
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_fresh_responses_are_served_without_a_request(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    first = fetcher.fetch(url(server, "/fresh"))
+    second = fetcher.fetch(url(server, "/fresh"))
+
+    assert not first.from_cache and second.from_cache and second.content == first.content
+    assert len(server.requests) == 1
+    assert fetcher.cache.stats()["hits"] == 1 and fetcher.cache.stats()["misses"] == 1
+
+    fetcher.fetch(url(server, "/private"))
+    assert fetcher.cache.lookup(url(server, "/private")) is None
+
+
+def test_stale_responses_are_revalidated_with_etag_and_last_modified(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    for path in ("/etag", "/dated"):
+        first = fetcher.fetch(url(server, path))
+        second = fetcher.fetch(url(server, path))
+        assert second.from_cache and second.status_code == 200 and second.content == first.content
+
+    assert server.requests[1] == ("/etag", '"v1"', None)
+    assert server.requests[3] == ("/dated", None, LAST_MODIFIED)
+    assert fetcher.cache.stats()["revalidated"] == 2
+
+
+def test_least_recently_used_responses_are_evicted_past_the_size_bound(server, tmp_path):
+    fetcher = make_fetcher(tmp_path, max_bytes=2500)
+    fetcher.fetch(url(server, "/fresh/a"))
+    fetcher.fetch(url(server, "/fresh/b"))
+    fetcher.fetch(url(server, "/fresh/a"))
+    fetcher.fetch(url(server, "/fresh/c"))
+
+    assert fetcher.cache.lookup(url(server, "/fresh/b")) is None
+    assert fetcher.cache.lookup(url(server, "/fresh/a")) is not None
+    assert fetcher.cache.stats()["evictions"] == 1 and fetcher.cache.stats()["bytes"] <= 2500
+    blobs = [name for _, _, names in os.walk(tmp_path / "http" / "blobs") for name in names]
+    assert len(blobs) == 2
+
+
+def test_freshness_heuristics(tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path / "http"))
+    now = time.time()
+    date = formatdate(now, usegmt=True)
+    assert cache._freshness_deadline({"cache-control": "max-age=30, must-revalidate"}, now) == now + 30
+    assert cache._freshness_deadline({"cache-control": "no-store"}, now) is None
+    assert cache._freshness_deadline({"date": date, "expires": formatdate(now + 120, usegmt=True)}, now) == \
+        pytest.approx(now + 120, abs=1)
+    # A tenth of the time since the last change, capped at a day
+    assert cache._freshness_deadline({"date": date, "last-modified": formatdate(now - 1000, usegmt=True)}, now) == \
+        pytest.approx(now + 100, abs=1)
+    assert cache._freshness_deadline({"date": date, "last-modified": formatdate(now - 365 * 86400, usegmt=True)}, now) == \
+        pytest.approx(now + MAX_HEURISTIC_FRESHNESS, abs=1)
@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from my_journalistic_crew.utils.fetcher import ConcurrentFetcher
+from my_journalistic_crew.utils.http_cache import HttpCache
+from my_journalistic_crew.utils.news_feeds import GoogleNewsAggregator, NewsFeed, parse_when, valid_when
+
+NOW = datetime.now(timezone.utc)
+
+
+def item(title, link, hours_ago, source="Daily Nation"):
+    return (f"<item><title>{title} - {source}</title><link>{link}</link>"
+            f"<pubDate>{format_datetime(NOW - timedelta(hours=hours_ago))}</pubDate>"
+            f"<source url=\"https://example.com\">{source}</source></item>")
+
+
+def feed_body(path, query):
+    name = path.rsplit("/", 1)[-1] if "search" not in path else query["q"][0]
+    items = [item(f"{name} story {i}", f"https://news.example.com/{name}/{i}", hours_ago=1 + i * 10) for i in range(3)]
+    # Every feed carries the same breaking story, once under a different link
+    items.append(item("Breaking: budget passed", f"https://news.example.com/breaking/{name}", hours_ago=0.5))
+    return f"<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>{name}</title>{''.join(items)}</channel></rss>"
+
+
+class FakeGoogleNews(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        etag = f'"{url.path}"'
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        content = feed_body(url.path, parse_qs(url.query)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FeedServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections when every feed is requested at once
+    request_queue_size = 64
+
+
+@pytest.fixture
+def server():
+    server = FeedServer(("127.0.0.1", 0), FakeGoogleNews)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.delay = 0
+    server.in_flight = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def make_aggregator(server, tmp_path):
+    fetcher = ConcurrentFetcher(max_workers=20, per_host=20, cache=HttpCache(cache_dir=str(tmp_path / "http")))
+    return GoogleNewsAggregator(fetcher=fetcher, base_url=f"http://127.0.0.1:{server.server_address[1]}/rss")
+
+
+def test_feed_urls():
+    assert NewsFeed(kind="topic", value="business", country="KE").url("https://g/rss") == \
+        "https://g/rss/headlines/section/topic/BUSINESS?hl=en&gl=KE&ceid=KE%3Aen"
+    assert NewsFeed(kind="topic", value="CAAqJggK").url("https://g/rss").startswith("https://g/rss/topics/CAAqJggK?")
+    assert NewsFeed(kind="query", value="boeing OR airbus", when="12h").url("https://g/rss").startswith(
+        "https://g/rss/search?q=boeing+OR+airbus+when%3A12h&")
+
+
+def test_parse_when():
+    assert parse_when("2h") == 7200 and parse_when("1w") == 604800 and parse_when(None) is None
+    with pytest.raises(ValueError):
+        parse_when("soon")
+    assert valid_when("3d") == "3d" and valid_when("3x") is None and valid_when("") is None
+
+
+def test_feeds_are_merged_deduplicated_and_sorted(server, tmp_path):
+    feeds = [NewsFeed(kind="topic", value=f"topic{i}") for i in range(3)] + [NewsFeed(kind="query", value="kenya")]
+    entries, errors = make_aggregator(server, tmp_path).collect(feeds)
+
+    assert errors == {}
+    assert [entry.title for entry in entries].count("Breaking: budget passed - Daily Nation") == 1
+    assert entries[0].title.startswith("Breaking") and len(entries[0].feeds) == 4
+    assert len(entries) == 1 + 3 * 4
+    assert all(a.published_at >= b.published_at for a, b in zip(entries, entries[1:]))
+
+
+def test_when_filter_and_limit(server, tmp_path):
+    aggregator = make_aggregator(server, tmp_path)
+    entries, _ = aggregator.collect([NewsFeed(kind="topic", value="topic0")], when="15h")
+    assert [entry.link.rsplit("/", 1)[-1] for entry in entries] == ["topic0", "0", "1"]
+    assert aggregator.stats["filtered"] == 1
+
+    entries, _ = aggregator.collect([NewsFeed(kind="topic", value="topic0")], limit=2)
+    assert len(entries) == 2
+
+
+def test_unchanged_feeds_are_revalidated_and_not_parsed_again(server, tmp_path):
+    aggregator = make_aggregator(server, tmp_path)
+    feeds = [NewsFeed(kind="topic", value=f"topic{i}") for i in range(3)]
+    first, _ = aggregator.collect(feeds)
+    second, _ = aggregator.collect(feeds)
+
+    assert [entry.link for entry in first] == [entry.link for entry in second]
+    assert aggregator.stats["from_cache"] == 3 and aggregator.stats["parsed"] == 3
+    assert aggregator.fetcher.cache.stats()["revalidated"] == 3
+
+
+def test_feeds_are_polled_concurrently(server, tmp_path):
+    server.delay = 0.5
+    feeds = [NewsFeed(kind="topic", value=f"topic{i}") for i in range(20)]
+    entries, errors = make_aggregator(server, tmp_path).collect(feeds)
+    assert errors == {} and len(entries) == 1 + 3 * 20
+    # Every feed was being served at once, however slow the machine
+    assert server.peak >= 20
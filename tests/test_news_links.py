@@ -0,0 +1,113 @@
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import pytest
+from my_journalistic_crew.utils.news_links import NewsLinkCache, NewsLinkResolver, decode_legacy_id, google_news_id
+
+
+def legacy_id(url):
+    encoded = url.encode()
+    return base64.urlsafe_b64encode(b"\x08\x13\x22" + bytes([len(encoded)]) + encoded + b"\xd2\x01\x00").decode().rstrip("=")
+
+
+class FakeGoogleNews(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(("GET", self.path))
+        article_id = self.path.rsplit("/", 1)[-1]
+        if self.path.startswith("/publisher/"):
+            self.send(200, b"<html>story</html>")
+        elif article_id.startswith("signed"):
+            self.send(200, f'<c-wiz><div data-n-a-sg="sig-{article_id}" data-n-a-ts="1700000000"></div></c-wiz>'.encode())
+        elif article_id.startswith("moved"):
+            self.send(302, headers={"Location": f"http://localhost:{self.server.server_address[1]}/publisher/{article_id}"})
+        else:
+            self.send(404)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        rpcs = json.loads(form["f.req"][0])[0]
+        with self.server.lock:
+            self.server.requests.append(("POST", len(rpcs)))
+        envelopes = []
+        for rpc_id, payload, _, number in rpcs:
+            request = json.loads(payload)
+            assert rpc_id == "Fbv4je" and request[4] == f"sig-{request[2]}"
+            envelopes.append(["wrb.fr", rpc_id, json.dumps(["garturlres", f"https://publisher.example/{request[2]}", 1]),
+                              None, None, None, number])
+        line = json.dumps(envelopes)
+        self.send(200, f")]}}'\n\n{len(line)}\n{line}\n".encode())
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGoogleNews)
+    server.lock = threading.Lock()
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def make_resolver(server, tmp_path, **kwargs):
+    return NewsLinkResolver(base_url=f"http://127.0.0.1:{server.server_address[1]}",
+                            cache=NewsLinkCache(path=str(tmp_path / "news_links.sqlite3")), **kwargs)
+
+
+def test_article_ids():
+    assert google_news_id("https://news.google.com/rss/articles/CBMiabc?oc=5") == "CBMiabc"
+    assert google_news_id("https://news.google.com/articles/CBMiabc") == "CBMiabc"
+    assert google_news_id("https://example.com/rss/articles/CBMiabc") is None
+
+
+def test_legacy_ids_decode_without_requests():
+    assert decode_legacy_id(legacy_id("https://nation.africa/kenya/news/budget")) == "https://nation.africa/kenya/news/budget"
+    assert decode_legacy_id(base64.urlsafe_b64encode(b"\x08\x13\x22AU_yqLopaque").decode()) is None
+
+
+def test_signed_ids_are_decoded_in_batches_and_cached(server, tmp_path):
+    urls = [f"https://news.google.com/rss/articles/signed{i}?oc=5" for i in range(5)]
+    legacy = "https://news.google.com/rss/articles/" + legacy_id("https://nation.africa/story")
+    resolver = make_resolver(server, tmp_path, batch_size=2)
+    resolved = resolver.resolve_many(urls + [legacy, "https://example.com/already"])
+
+    assert [resolved[url] for url in urls] == [f"https://publisher.example/signed{i}" for i in range(5)]
+    assert resolved[legacy] == "https://nation.africa/story"
+    assert resolved["https://example.com/already"] == "https://example.com/already"
+    assert sorted(count for method, count in server.requests if method == "POST") == [1, 2, 2]
+    assert resolver.stats["decoded"] == 1 and resolver.stats["resolved"] == 5
+
+    requests_made = len(server.requests)
+    again = make_resolver(server, tmp_path)
+    assert again.resolve_many(urls) == {url: resolved[url] for url in urls}
+    assert len(server.requests) == requests_made and again.stats["cached"] == 5
+
+
+def test_redirects_are_followed_and_failures_left_alone(server, tmp_path):
+    moved = "https://news.google.com/rss/articles/moved1"
+    missing = "https://news.google.com/rss/articles/missing1"
+    resolver = make_resolver(server, tmp_path)
+    resolved = resolver.resolve_many([moved, missing])
+    assert resolved[moved].endswith("/publisher/moved1")
+    assert resolved[missing] == missing
+    assert resolver.stats["redirected"] == 1 and resolver.stats["failed"] == 1
+
+
+def test_articles_resolving_to_the_same_url_are_merged(server, tmp_path):
+    legacy = "https://news.google.com/rss/articles/" + legacy_id("https://nation.africa/story")
+    articles = [{"title": "A", "link": legacy}, {"title": "B", "link": legacy + "?oc=5"}, {"title": "C", "link": "https://x.com/c"}]
+    resolved = make_resolver(server, tmp_path).resolve_articles(articles)
+    assert resolved == [{"title": "A", "link": "https://nation.africa/story"}, {"title": "C", "link": "https://x.com/c"}]
@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from my_journalistic_crew.tools import scrape_website
+from my_journalistic_crew.tools.scrape_website import ScrapeWebsite
+from my_journalistic_crew.utils.fetcher import FetchResult
+from my_journalistic_crew.utils.url_index import UrlIndex
+
+ARTICLE = "<p>" + "Parliament passed the budget after a long debate. " * 20 + "</p>"
+PAGES = {
+    "https://nation.africa/story": f"<html><head></head><body><article>{ARTICLE}</article></body></html>",
+    "https://nation.africa/alias": f'<html><head><link rel="canonical" href="https://nation.africa/story"></head><body><article>{ARTICLE}</article></body></html>',
+    "https://app.example.com/live": '<html><body><div id="root"></div></body></html>',
+}
+RENDERED = f"<html><body><article>{ARTICLE}</article></body></html>"
+
+
+class FakeFetcher:
+    cache = None
+
+    def __init__(self):
+        self.fetched = []
+
+    def fetch_all(self, urls, accept=None, max_bytes=None):
+        self.fetched.extend(urls)
+        return [FetchResult(url=url, status_code=200, headers={"content-type": "text/html; charset=utf-8"},
+                            content=PAGES[url].encode()) for url in urls]
+
+
+class FakeRenderPool:
+    def __init__(self):
+        self.rendered = []
+        self.fail = False
+
+    def render_all(self, urls):
+        self.rendered.extend(urls)
+        if self.fail:
+            return [FetchResult(url=url, error="render timed out") for url in urls]
+        return [FetchResult(url=url, status_code=200, content=RENDERED.encode()) for url in urls]
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    fetcher, render_pool, index = FakeFetcher(), FakeRenderPool(), UrlIndex()
+    monkeypatch.setattr(scrape_website, "get_fetcher", lambda: fetcher)
+    monkeypatch.setattr(scrape_website, "get_render_pool", lambda: render_pool)
+    monkeypatch.setattr(scrape_website, "get_url_index", lambda: index)
+    monkeypatch.setattr(scrape_website, "SCRAPE_RENDER_JS", True)
+    return ScrapeWebsite(), fetcher, render_pool, index
+
+
+def test_duplicates_are_fetched_once_and_javascript_pages_rendered(tool):
+    scraper, fetcher, render_pool, index = tool
+    urls = ["https://nation.africa/story?utm_source=x", "https://m.nation.africa/story/amp",
+            "https://nation.africa/alias", "https://app.example.com/live#top"]
+    results = scraper._run(urls)
+
+    assert [result["url"] for result in results] == urls
+    assert all(result["content"] for result in results)
+    assert "Parliament passed the budget" in results[0]["content"]
+    assert results[1]["duplicate_of"] == urls[0]
+    assert results[2]["duplicate_of"] == "https://nation.africa/story"
+    assert "Parliament passed the budget" in results[3]["content"]
+    assert fetcher.fetched == ["https://nation.africa/story", "https://nation.africa/alias", "https://app.example.com/live"]
+    assert render_pool.rendered == ["https://app.example.com/live"]
+    assert index.stats["duplicates"] == 1 and index.stats["canonical_duplicates"] == 1
+
+
+def test_pages_scraped_earlier_in_the_run_are_not_fetched_again(tool):
+    scraper, fetcher, _, index = tool
+    first = scraper._run(["https://nation.africa/story"])
+    again = scraper._run(["http://www.nation.africa/story/?fbclid=1"])
+
+    assert again[0]["url"] == "http://www.nation.africa/story/?fbclid=1"
+    assert again[0]["content"] == first[0]["content"]
+    assert fetcher.fetched == ["https://nation.africa/story"]
+
+    index.reset()
+    scraper._run(["https://nation.africa/story"])
+    assert fetcher.fetched == ["https://nation.africa/story"] * 2
+
+
+
+def test_pages_without_text_are_not_indexed(tool):
+    scraper, fetcher, render_pool, index = tool
+    render_pool.fail = True
+    first = scraper._run(["https://app.example.com/live"])
+    assert first[0]["content"].startswith("This page requires JavaScript rendering")
+
+    # The failed render is retried on the next call instead of served from the index
+    render_pool.fail = False
+    again = scraper._run(["https://app.example.com/live"])
+    assert "Parliament passed the budget" in again[0]["content"]
+    assert fetcher.fetched == ["https://app.example.com/live"] * 2 and index.stats["unique"] == 1
@@ -0,0 +1,99 @@
+import threading
+import time
+from my_journalistic_crew.utils import search_cache
+from my_journalistic_crew.utils.search_cache import SearchCache, search_cache_key
+
+
+def make_cache(tmp_path, **kwargs):
+    return SearchCache(path=str(tmp_path / "search.sqlite3"), **kwargs)
+
+
+def expire(cache, key, fresh=True):
+    """Move an entry's fresh (or stale) deadline into the past"""
+    column = "fresh_until" if fresh else "stale_until"
+    with cache._lock, cache._db:
+        cache._db.execute(f"UPDATE searches SET {column} = ? WHERE key = ?", (time.time() - 1, key))
+
+
+def test_key_ignores_case_and_spacing_but_not_parameters():
+    params = {"gl": "ke", "tbs": "qdr:d"}
+    assert search_cache_key("serper", "Kenya  Budget\t2026", params) == search_cache_key("serper", " kenya budget 2026", params)
+    assert search_cache_key("serper", "kenya budget", params) != search_cache_key("serper", "kenya budget", {"gl": "ug", "tbs": "qdr:d"})
+    assert search_cache_key("serper", "kenya budget", params) != search_cache_key("google_cse", "kenya budget", params)
+
+
+def test_fresh_hits_skip_the_fetch_and_count_credits(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"organic": [], "credits": 2}
+
+    key = search_cache_key("serper", "q", {})
+    for _ in range(3):
+        assert cache.get_or_fetch(key, "search", fetch, credits=lambda value: value["credits"]) == {"organic": [], "credits": 2}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["credits_saved"] == 4 and stats["hit_rate"] == 0.667
+
+
+def test_failures_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path)
+    key = search_cache_key("serper", "q", {})
+    assert cache.get_or_fetch(key, "search", lambda: None) is None
+    assert cache.get_or_fetch(key, "search", lambda: ["ok"]) == ["ok"]
+
+
+def test_stale_results_are_served_while_refreshing(tmp_path):
+    cache = make_cache(tmp_path)
+    key = search_cache_key("serper", "q", {})
+    cache.store(key, "news", ["old"])
+    expire(cache, key)
+
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return ["new"]
+
+    assert cache.get_or_fetch(key, "news", fetch) == ["old"]
+    assert refreshed.wait(5)
+    for _ in range(50):
+        if cache.stats()["refreshes"]:
+            break
+        time.sleep(0.05)
+    assert cache.get_or_fetch(key, "news", fetch) == ["new"]
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_entries_past_the_stale_window_are_fetched_again(tmp_path):
+    cache = make_cache(tmp_path)
+    key = search_cache_key("serper", "q", {})
+    cache.store(key, "news", ["old"])
+    expire(cache, key, fresh=False)
+    assert cache.get_or_fetch(key, "news", lambda: ["new"]) == ["new"]
+
+
+def test_news_expires_sooner_than_scholar(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("news", "news", [])
+    cache.store("scholar", "scholar", [])
+    rows = dict(cache._db.execute("SELECT key, fresh_until - stored_at FROM searches").fetchall())
+    assert rows["news"] == search_cache.SEARCH_TTLS["news"]
+    assert rows["scholar"] > rows["news"]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.store("a", "search", ["a"])
+    time.sleep(0.01)
+    cache.store("b", "search", ["b"])
+    time.sleep(0.01)
+    assert cache.lookup("a") is not None
+    time.sleep(0.01)
+    cache.store("c", "search", ["c"])
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None and cache.lookup("c") is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
@@ -0,0 +1,114 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from my_journalistic_crew.models.outputs import GoogleImageResults, SerperGoogleNewsResults, SerperWebSearchResults
+from my_journalistic_crew.utils.search_cache import SearchCache
+from my_journalistic_crew.utils.serper_client import SerperClient, SerperError, SerperQuery
+
+
+def answer(endpoint, query):
+    parameters = {"q": query["q"], "type": query["type"]}
+    if endpoint == "news":
+        return {"searchParameters": parameters,
+                "news": [{"title": query["q"], "link": "https://example.com/n", "position": 1}]}
+    if endpoint == "images":
+        return {"searchParameters": parameters, "images": [{"imageUrl": "https://example.com/i.jpg"}]}
+    return {"searchParameters": parameters, "credits": 1,
+            "organic": [{"title": query["q"], "link": "https://example.com", "snippet": "", "position": 1}]}
+
+
+class FakeSerper(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        endpoint = self.path.strip("/")
+        server = self.server
+        with server.lock:
+            server.requests.append((endpoint, len(body)))
+            throttle = server.throttle > 0
+            server.throttle -= 1
+        if throttle:
+            status, payload = 429, {"message": "Too many requests"}
+        elif endpoint in server.broken:
+            status, payload = 400, {"message": "Bad request"}
+        else:
+            status, payload = 200, [answer(endpoint, query) for query in body]
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSerper)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.throttle = 0
+    server.broken = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def make_client(server, **kwargs):
+    return SerperClient(api_key="key", api_url=f"http://127.0.0.1:{server.server_address[1]}", **kwargs)
+
+
+def test_mixed_queries_are_grouped_by_endpoint_and_mapped_back(server):
+    queries = ([SerperQuery(query=f"web {i}") for i in range(5)]
+               + [SerperQuery(query=f"news {i}", search_type="news") for i in range(3)]
+               + [SerperQuery(query="image", search_type="images"), SerperQuery(query="patent", search_type="patent")])
+    queries = queries[::2] + queries[1::2]
+    results = make_client(server, batch_size=2).search_many(queries)
+
+    for query, (result, error) in zip(queries, results):
+        assert error is None
+        assert result.searchParameters.q == query.query
+    assert isinstance(results[queries.index(SerperQuery(query="news 0", search_type="news"))][0], SerperGoogleNewsResults)
+    assert isinstance(results[queries.index(SerperQuery(query="image", search_type="images"))][0], GoogleImageResults)
+    assert isinstance(results[0][0], SerperWebSearchResults)
+    assert sorted(server.requests) == [("images", 1), ("news", 1), ("news", 2), ("patents", 1),
+                                       ("search", 1), ("search", 2), ("search", 2)]
+
+
+def test_failed_endpoint_only_fails_its_queries(server):
+    server.broken.add("news")
+    results = make_client(server).search_many([SerperQuery(query="web"), SerperQuery(query="news", search_type="news")])
+    assert results[0][1] is None
+    assert results[1][0] is None and results[1][1].startswith("400")
+    assert len(server.requests) == 2
+
+
+def test_throttled_requests_are_retried(server, monkeypatch):
+    monkeypatch.setattr("my_journalistic_crew.utils.serper_client.backoff_delay", lambda attempt, response: 0)
+    server.throttle = 2
+    client = make_client(server)
+    assert client.search(SerperQuery(query="web")).searchParameters.q == "web"
+    assert client.stats["retries"] == 2
+
+
+def test_single_search_raises_on_failure(server):
+    server.broken.add("search")
+    with pytest.raises(SerperError):
+        make_client(server, retries=0).search(SerperQuery(query="web"))
+
+
+def test_cached_queries_are_not_sent_again(server, tmp_path):
+    client = make_client(server, cache=SearchCache(path=str(tmp_path / "search.sqlite3")))
+    client.search_many([SerperQuery(query="Kenya budget"), SerperQuery(query="news", search_type="news")])
+    results = client.search_many([SerperQuery(query="kenya  budget"), SerperQuery(query="other")])
+
+    assert results[0][0].searchParameters.q == "Kenya budget" and results[1][1] is None
+    assert sorted(server.requests) == [("news", 1), ("search", 1), ("search", 1)]
+    assert client.cache.stats()["credits_saved"] == 1
+
+
+def test_missing_api_key():
+    with pytest.raises(ValueError):
+        SerperClient(api_key="").search_many([SerperQuery(query="web")])
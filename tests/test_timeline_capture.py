@@ -0,0 +1,80 @@
+import json
+import os
+from my_journalistic_crew.utils.timeline_capture import bottom_cursor, parse_search_timeline
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "x")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+def test_first_page_skips_promoted_tombstones_and_user_modules():
+    tweets = parse_search_timeline(load_fixture("search_timeline_page1.json"))
+    assert [tweet.structure.id for tweet in tweets] == ["1790000000000000001", "1790000000000000003"]
+
+
+def test_exact_metrics_and_user():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page1.json"))[0]
+    assert (tweet.metrics.likes, tweet.metrics.retweets, tweet.metrics.replies) == (1234, 340, 12)
+    assert tweet.user.name == "Reuters"
+    assert tweet.user.handle == "@Reuters"
+
+
+def test_text_is_unescaped_without_media_link():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page1.json"))[0]
+    assert tweet.content == "Markets rally as central bank signals a pause & bonds gain"
+    assert tweet.structure.text == tweet.content
+
+
+def test_timestamp_matches_page_format():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page1.json"))[0]
+    assert tweet.timestamp.datetime == "2024-05-13T09:15:00.000Z"
+    assert tweet.timestamp.display == "May 13"
+
+
+def test_photos():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page1.json"))[0]
+    assert tweet.media.hasPhotos and not tweet.media.hasVideos
+    assert tweet.media.photoUrls == ["https://pbs.twimg.com/media/GNabc1.jpg"]
+    assert tweet.media.mediaCount == 1
+
+
+def test_visibility_wrapper_and_new_user_layout():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page1.json"))[1]
+    assert tweet.user.name == "BBC Breaking"
+    assert tweet.user.handle == "@BBCBreaking"
+    assert tweet.metrics.likes == 410
+
+
+def test_long_text_and_best_video_variant():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page2.json"))[0]
+    assert tweet.content.startswith("The rover has reached the rim of the crater")
+    assert tweet.metrics.likes == 3400000
+    assert tweet.media.videoUrls == ["https://video.twimg.com/ext_tw_video/901/pu/vid/1280x720/high.mp4"]
+    assert not tweet.media.hasPhotos
+
+
+def test_retweet_resolves_to_original():
+    tweet = parse_search_timeline(load_fixture("search_timeline_page2.json"))[1]
+    assert tweet.structure.id == "1790000000000000002"
+    assert tweet.user.handle == "@AP"
+    assert tweet.metrics.likes == 9870
+
+
+def test_conversation_module_tweets():
+    tweets = parse_search_timeline(load_fixture("search_timeline_page2.json"))
+    assert [tweet.structure.id for tweet in tweets] == [
+        "1790000000000000005", "1790000000000000002", "1790000000000000030"
+    ]
+
+
+def test_bottom_cursor_from_add_and_replace_entries():
+    assert bottom_cursor(load_fixture("search_timeline_page1.json")) == "DAADDAABCgABGN0page2"
+    assert bottom_cursor(load_fixture("search_timeline_page2.json")) == "DAADDAABCgABGN0page3"
+
+
+def test_unexpected_payloads_parse_to_nothing():
+    assert parse_search_timeline({}) == []
+    assert parse_search_timeline({"errors": [{"message": "Rate limit exceeded"}]}) == []
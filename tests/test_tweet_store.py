@@ -0,0 +1,43 @@
+from my_journalistic_crew.utils.tweet_store import TweetStore
+from my_journalistic_crew.utils.x_elements import MetricsModel, TimestampModel, TweetModel, TweetStructureModel, UserModel
+
+
+def tweet(tweet_id, likes=10):
+    return TweetModel(content=f"Tweet {tweet_id}", structure=TweetStructureModel(id=tweet_id, tagName="article"),
+                      user=UserModel(name="Daily Nation", handle="@dailynation"),
+                      timestamp=TimestampModel(datetime="2025-04-10T08:00:00.000Z"),
+                      metrics=MetricsModel(likes=likes, retweets=2, replies=1))
+
+
+def test_tweets_are_stored_per_trend(tmp_path):
+    store = TweetStore(path=str(tmp_path / "tweets.sqlite3"))
+    assert store.since_id("Trump Tariffs") is None and store.known_ids("Trump Tariffs") == set()
+
+    assert store.record("Trump Tariffs", [tweet("1001"), tweet("1003"), tweet("1002")]) == (3, 0)
+    assert store.known_ids(" trump  tariffs") == {"1001", "1002", "1003"}
+    assert store.since_id("trump tariffs") == 1003
+    # IDs that are not numeric never move the resume point
+    store.record("Trump Tariffs", [tweet("draft-9999")])
+    assert store.since_id("Trump Tariffs") == 1003
+    assert store.known_ids("#TradeWar") == set()
+
+
+def test_a_second_run_resumes_from_the_newest_stored_tweet(tmp_path):
+    path = str(tmp_path / "tweets.sqlite3")
+    TweetStore(path=path).record("Trump Tariffs", [tweet("1001"), tweet("1002")])
+
+    # A new process opens the same file
+    store = TweetStore(path=path)
+    since_id, known = store.since_id("Trump Tariffs"), store.known_ids("Trump Tariffs")
+    assert since_id == 1002
+
+    seen = [tweet("1004"), tweet("1003"), tweet("1002", likes=50), tweet("1001")]
+    newer = [t for t in seen if int(t.structure.id) > since_id and t.structure.id not in known]
+    assert [t.structure.id for t in newer] == ["1004", "1003"]
+
+    # Known tweets only have their metrics refreshed; just the newer ones are added
+    assert store.record("Trump Tariffs", seen) == (2, 2)
+    assert store.since_id("Trump Tariffs") == 1004
+    assert store.stats() == {'tweets': 4, 'trends': 1}
+    likes = store._db.execute("SELECT likes FROM tweets WHERE id = '1002'").fetchone()[0]
+    assert likes == 50
@@ -0,0 +1,67 @@
+import time
+from my_journalistic_crew.utils.url_index import UrlIndex, canonicalize_url, find_canonical_url, url_key
+
+STORY = "https://www.nation.africa/kenya/news/budget-passed"
+
+
+def test_tracking_parameters_fragments_and_slashes_are_dropped():
+    assert canonicalize_url(STORY + "/?utm_source=twitter&utm_medium=social&fbclid=abc#comments") == STORY
+    assert canonicalize_url("https://Example.com:443/a/?page=2&gclid=x&id=7") == "https://example.com/a?id=7&page=2"
+    assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+    # Parameters choosing a variant or format name a different document
+    assert canonicalize_url("https://example.com/a?outputType=amp&amp=1&oc=5") == "https://example.com/a?amp=1&oc=5&outputType=amp"
+
+
+def test_amp_and_mobile_variants_map_to_the_regular_page():
+    assert canonicalize_url("https://m.nation.africa/kenya/news/budget-passed") == "https://nation.africa/kenya/news/budget-passed"
+    assert canonicalize_url(STORY + "/amp") == STORY
+    assert canonicalize_url("https://www.bbc.co.uk/news/world-123.amp") == "https://www.bbc.co.uk/news/world-123"
+    assert canonicalize_url("https://www.nation-africa.cdn.ampproject.org/c/s/www.nation.africa/kenya/news/budget-passed/amp") == STORY
+    assert canonicalize_url("https://www.google.com/amp/s/www.nation.africa/kenya/news/budget-passed") == STORY
+    # Short hosts such as m.me are not mobile variants of anything
+    assert canonicalize_url("https://m.me/page") == "https://m.me/page"
+
+
+def test_keys_ignore_scheme_and_www():
+    assert url_key("http://nation.africa/kenya/news/budget-passed?utm_campaign=x") == url_key(STORY)
+    assert url_key(STORY) != url_key("https://www.nation.africa/kenya/news/other")
+
+
+def test_rel_canonical_is_read_from_the_head():
+    html = b'<html><head><link href="/kenya/news/budget-passed" rel="canonical"><title>x</title></head></html>'
+    assert find_canonical_url(html, "https://t.co/abc") == "https://t.co/kenya/news/budget-passed"
+    assert find_canonical_url(b"<link rel='stylesheet' href='/s.css'>", STORY) is None
+    assert find_canonical_url(b'<link rel="canonical" href="https://www.nation.africa/">', STORY) is None
+
+
+def test_index_removes_duplicates_in_a_batch_and_across_calls():
+    index = UrlIndex()
+    planned = index.plan([STORY + "?utm_source=x", "https://m.nation.africa/kenya/news/budget-passed", "https://example.com/b"])
+    assert [first for _, _, first in planned] == [None, STORY + "?utm_source=x", None]
+    assert planned[0][0] == STORY
+
+    assert index.record(planned[0][1], STORY, "text") is None
+    assert index.record(planned[2][1], "https://example.com/b", "other", canonical_url=STORY) == STORY
+
+    again = index.plan(["http://nation.africa/kenya/news/budget-passed/", "https://example.com/b?fbclid=1"])
+    assert [first for _, _, first in again] == [STORY, STORY]
+    assert index.content(again[1][1]) == "text"
+    assert index.stats == {'seen': 5, 'unique': 1, 'duplicates': 1, 'canonical_duplicates': 1, 'repeats': 2,
+                           'expired': 0, 'evictions': 0}
+
+
+def test_index_is_bounded_expires_and_resets(monkeypatch):
+    index = UrlIndex(max_documents=2, ttl=60)
+    for name in ("a", "b", "c"):
+        index.record(url_key(f"https://example.com/{name}"), f"https://example.com/{name}", name)
+    assert index.content(url_key("https://example.com/a")) is None
+    assert index.content(url_key("https://example.com/c")) == "c"
+    assert index.stats["evictions"] == 1
+
+    now = time.time()
+    monkeypatch.setattr("my_journalistic_crew.utils.url_index.time.time", lambda: now + 61)
+    assert [first for _, _, first in index.plan(["https://example.com/c"])] == [None]
+    assert index.stats["expired"] == 1
+
+    index.reset()
+    assert index.content(url_key("https://example.com/b")) is None and index.stats["seen"] == 0